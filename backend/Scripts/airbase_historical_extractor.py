@@ -1,9 +1,31 @@
-import airbase
+import argparse
 
-client = airbase.AirbaseClient()
+''' This program downloads the EEA historical (Airbase) parquet files for a country. '''
 
-country = 'SI'
-pollutants = ['O3', 'C6H6', 'CO', 'NO2', 'NOx', 'PM10', 'PM2.5', 'SO2']
+COUNTRY = 'SI'
+POLLUTANTS = ['O3', 'C6H6', 'CO', 'NO2', 'NOx', 'PM10', 'PM2.5', 'SO2']
+OUTPUT_DIR = "./data/EEA_historical_data/raw"
 
-request = airbase.AirbaseRequest(airbase.Dataset.Historical, country, poll=pollutants)
-request.download("./data/EEA_historical_data/raw")
+
+def download_historical(country=COUNTRY, pollutants=POLLUTANTS, output_dir=OUTPUT_DIR):
+    """Download the historical dataset for the given country and pollutants into output_dir"""
+    import airbase
+
+    client = airbase.AirbaseClient()
+    request = airbase.AirbaseRequest(airbase.Dataset.Historical, country, poll=pollutants)
+    request.download(output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download EEA historical air quality data (Airbase)')
+    parser.add_argument('-c', '--country', default=COUNTRY, help=f'Country code (default: {COUNTRY})')
+    parser.add_argument('-p', '--pollutants', nargs='+', default=POLLUTANTS,
+                        help='Pollutants to download (default: all of ' + ' '.join(POLLUTANTS) + ')')
+    parser.add_argument('-o', '--output', default=OUTPUT_DIR, help=f'Output directory (default: {OUTPUT_DIR})')
+    args = parser.parse_args()
+
+    download_historical(args.country, args.pollutants, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Skupna vstopna točka za skripte v backend/Scripts.
+Vsak podukaz je povezan z modulom, ki se uvozi šele, ko se podukaz zažene,
+zato "airq --help" ne plača uvoza pandas, numpy ali pdfplumber. Argumenti za
+podukazom se posredujejo nespremenjeni funkciji main() izbranega modula.
+
+Primeri:
+    python Scripts/airq.py --help
+    python Scripts/airq.py extract pm10 -d data/ARSO_PDF -p "PM10_*.pdf"
+    python Scripts/airq.py convert data/EEA_historical_data/raw data/EEA_historical_data
+    python Scripts/airq.py build-daily
+"""
+
+import sys
+import argparse
+import importlib
+
+# Podukaz: (modul, opis)
+COMMANDS = {
+    "extract": (None, "Ekstrakcija meritev ARSO iz PDF poročil (pm10, pm25, ozone)"),
+    "convert": ("parquet_to_json", "Pretvorba datotek parquet EEA v JSON"),
+    "download": ("airbase_historical_extractor", "Prenos zgodovinskih podatkov EEA (Airbase)"),
+    "waqi": ("waqi_zbiralnik", "Zbiranje trenutnih meritev WAQI"),
+    "eea-ozone": ("eea_ozon_preseganja", "Preseganja ozona po postajah EEA"),
+    "build-daily": ("dnevni_izvoz", "Izvoz dnevnih CSV datotek"),
+    "validate": ("validacija", "Preverjanje podatkov"),
+    "reconcile": ("uskladitev", "Uskladitev podatkov ARSO in EEA"),
+    "snapshot": ("posnetek", "Binarni posnetek enotnih podatkov"),
+    "trends": ("trendi", "Trendi (sezonski Mann-Kendall, Senov naklon)"),
+    "dense": ("prevzorcenje", "Goste dnevne serije z zapolnjenimi vrzelmi"),
+    "lttb": ("lttb", "Zmanjšane serije za grafe"),
+    "climatology": ("klimatologija", "Klimatologija po dnevih v letu in odstopanja"),
+    "stations": ("postaje", "Indeks postaj za iskanje najbližjih"),
+    "health": ("zdravje", "Dnevi po zdravstvenih kategorijah"),
+    "pipeline": ("cevovod", "Zagon cevovoda z odvisnostmi"),
+}
+
+EXTRACTORS = {
+    "pm10": "arso_pm10_ekstraktor",
+    "pm25": "arso_pm25_ekstraktor",
+    "ozone": "arso_ozon_ekstraktor",
+}
+
+
+def build_parser():
+    width = max(len(name) for name in COMMANDS)
+    listing = "\n".join(f"  {name:<{width}}  {description}" for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="airq",
+        description="Skupna vstopna točka za pridobivanje in obdelavo podatkov o kakovosti zraka",
+        epilog=f"podukazi:\n{listing}\n\nPomoč za podukaz: airq <podukaz> --help",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="podukaz", help="Podukaz (glej seznam spodaj)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Argumenti podukaza")
+    return parser
+
+
+def resolve(parser, command, args):
+    """Vrne (ime modula, ime programa, preostali argumenti) za podukaz"""
+    if command != "extract":
+        return COMMANDS[command][0], f"airq {command}", args
+    if not args or args[0] not in EXTRACTORS:
+        parser.error(f"extract potrebuje vrsto podatkov: {', '.join(EXTRACTORS)}")
+    return EXTRACTORS[args[0]], f"airq extract {args[0]}", args[1:]
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    module_name, prog, rest = resolve(parser, args.command, args.args)
+
+    # Težke odvisnosti se naložijo šele tukaj, ob uvozu izbranega modula
+    module = importlib.import_module(module_name)
+    sys.argv = [prog, *rest]
+    return module.main()
+
+
+if __name__ == "__main__":
+    main()
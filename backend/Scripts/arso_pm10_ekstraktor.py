@@ -4,18 +4,15 @@ Skripta za ekstrakcijo podatkov PM10 iz PDF datotek v formatu ARSO.
 Lahko obdela eno ali več PDF datotek istega formata.
 """
 
-import json
 import re
 import sys
 import argparse
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
-try:
-    import pdfplumber
-except ImportError:
-    print("Napaka: pdfplumber ni nameščen. Namesti z: pip install pdfplumber")
-    exit(1)
+from pdf_strani import extract_pages
+from serializacija import MODES, read_json, set_default_mode, write_json
 
 
 def parse_date(date_str):
@@ -48,7 +45,7 @@ def parse_value(value_str):
         return None
 
 
-def extract_pm10_data(pdf_path, locations=None):
+def extract_pm10_data(pdf_path, locations=None, workers=1):
     """Ekstrahira podatke PM10 iz PDF datoteke"""
     
     if locations is None:
@@ -70,19 +67,21 @@ def extract_pm10_data(pdf_path, locations=None):
             "Koper"
         ]
     
-    all_data = []
+    all_data = extract_pages(pdf_path, partial(extract_page, locations), workers)
+
     location_data = {loc: [] for loc in locations}
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            # Vedno uporabi ekstrakcijo iz besedila, ker so tabele v PDF-ju slabo strukturirane
-            text = page.extract_text()
-            if text:
-                extract_from_text(text, locations, all_data, location_data, page_num)
-    
+    for measurement in all_data:
+        if measurement["location"] in location_data:
+            location_data[measurement["location"]].append(measurement)
+
     return all_data, location_data
 
 
+def extract_page(locations, text, page_num, all_data):
+    """Ekstrahira meritve ene strani za pdf_strani.extract_pages"""
+    extract_from_text(text, locations, all_data, {}, page_num)
+
+
 def extract_from_text(text, locations, all_data, location_data, page_num=0):
     """Ekstrahira podatke iz besedila PDF-ja"""
     lines = text.split('\n')
@@ -177,14 +176,13 @@ def save_json_files(all_data, location_data, output_dir, source_file, year=None)
     
     # Shrani vse podatke v eno datoteko
     all_data_file = output_path / f"PM10_{year}_all_{source_name}.json"
-    with open(all_data_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            "source": str(source_file),
-            "pollutant": "PM10",
-            "year": year,
-            "total_measurements": len(all_data),
-            "data": all_data
-        }, f, ensure_ascii=False, indent=2)
+    write_json(all_data_file, {
+        "source": str(source_file),
+        "pollutant": "PM10",
+        "year": year,
+        "total_measurements": len(all_data),
+        "data": all_data
+    })
     
     print(f"Shranjeno: {all_data_file} ({len(all_data)} meritev)")
     
@@ -201,9 +199,7 @@ def save_json_files(all_data, location_data, output_dir, source_file, year=None)
             # Preveri, ali datoteka že obstaja (za združevanje podatkov iz več PDF-jev)
             existing_data = []
             if location_file.exists():
-                with open(location_file, 'r', encoding='utf-8') as f:
-                    existing_json = json.load(f)
-                    existing_data = existing_json.get("data", [])
+                existing_data = read_json(location_file).get("data", [])
             
             # Združi podatke
             combined_data = existing_data + data
@@ -216,19 +212,18 @@ def save_json_files(all_data, location_data, output_dir, source_file, year=None)
                     seen.add(key)
                     unique_data.append(item)
             
-            with open(location_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "location": location,
-                    "pollutant": "PM10",
-                    "year": year,
-                    "total_measurements": len(unique_data),
-                    "data": sorted(unique_data, key=lambda x: x["date"])
-                }, f, ensure_ascii=False, indent=2)
+            write_json(location_file, {
+                "location": location,
+                "pollutant": "PM10",
+                "year": year,
+                "total_measurements": len(unique_data),
+                "data": sorted(unique_data, key=lambda x: x["date"])
+            })
             
             print(f"Shranjeno: {location_file} ({len(unique_data)} meritev)")
 
 
-def process_pdf_file(pdf_path, output_base_dir):
+def process_pdf_file(pdf_path, output_base_dir, workers=1):
     """Obdela eno PDF datoteko"""
     pdf_path = Path(pdf_path)
     
@@ -240,7 +235,7 @@ def process_pdf_file(pdf_path, output_base_dir):
     print(f"Ekstrahiranje podatkov iz {pdf_path.name}...")
     print(f"{'='*60}")
     
-    all_data, location_data = extract_pm10_data(pdf_path)
+    all_data, location_data = extract_pm10_data(pdf_path, workers=workers)
     
     if len(all_data) == 0:
         print(f"Opozorilo: Ni bilo najdenih podatkov v {pdf_path.name}!")
@@ -301,8 +296,21 @@ def main():
         default="data/ARSO",
         help="Izhodna mapa za JSON datoteke (privzeto: data/ARSO)"
     )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=1,
+        help="Število procesov za vzporedno obdelavo strani ene PDF datoteke (0 = vsa jedra, privzeto: 1)"
+    )
+    parser.add_argument(
+        "--json-format",
+        choices=MODES,
+        default="compat",
+        help="Oblika izhodnih JSON datotek: compat (enako kot doslej), pretty ali compact (privzeto: compat)"
+    )
     
     args = parser.parse_args()
+    set_default_mode(args.json_format)
     
     # Določi PDF datoteke za obdelavo
     if args.pdf_files:
@@ -327,7 +335,7 @@ def main():
     
     for pdf_file in pdf_files:
         try:
-            if process_pdf_file(pdf_file, args.output):
+            if process_pdf_file(pdf_file, args.output, args.workers):
                 successful += 1
             else:
                 failed += 1
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Primerjava branja datotek EEA: json.load celotne datoteke proti pretočnemu
+branju po kosih (eea_branje.py). Izpiše čas in največjo porabo pomnilnika.
+"""
+
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from eea_branje import DEFAULT_COLUMNS, COLUMN_TYPES, iter_chunks, _to_column
+
+
+def load_with_json(path):
+    """Referenčna pot: json.load in pretvorba v enake stolpce"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = json.load(f)
+    data = content.get("data", []) if isinstance(content, dict) else content
+    return {column: _to_column([record.get(column) for record in data], COLUMN_TYPES[column])
+            for column in DEFAULT_COLUMNS}
+
+
+def load_streaming(path, chunk_size):
+    """Pretočna pot: kosi se sproti seštevajo, tako da se cela datoteka nikoli ne hrani"""
+    rows = 0
+    total = 0.0
+    for chunk in iter_chunks(path, chunk_size):
+        rows += len(chunk["Value"])
+        total += np.nansum(chunk["Value"])
+    return rows, total
+
+
+def measure(func):
+    """Vrne (čas v s, največja poraba pomnilnika v MiB)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primerjava json.load in pretočnega branja datotek EEA")
+    parser.add_argument("files", nargs="*", help="Datoteke EEA (privzeto: data/EEA_podatki/po_postajah/*.json)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=10000, help="Velikost kosa (privzeto: 10000)")
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or sorted(Path("data/EEA_podatki/po_postajah").glob("*.json"))
+    for path in files:
+        size = path.stat().st_size / 2 ** 20
+        json_time, json_peak = measure(lambda: load_with_json(path))
+        stream_time, stream_peak = measure(lambda: load_streaming(path, args.chunk_size))
+        print(f"{path.name} ({size:.1f} MiB)")
+        print(f"  json.load:  {json_time * 1000:7.1f} ms, največ {json_peak:6.1f} MiB")
+        print(f"  pretočno:   {stream_time * 1000:7.1f} ms, največ {stream_peak:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Primerjava časa hladnega nalaganja: razčlenjevanje CSV (kot loadAllRows v
+csv.ts: split po vrsticah in vejicah, objekt za vsako vrstico) proti
+preslikavi binarnega posnetka v pomnilnik.
+"""
+
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from enotni_podatki import SOURCE_FILES, load_unified_rows
+from posnetek import read_snapshot, write_snapshot
+
+
+def load_csv_like_backend(data_dir):
+    """Razčleni CSV datoteke enako kot csv.ts (vrstica za vrstico, slovar za vsako vrstico)"""
+    rows = []
+    for source, file_name in SOURCE_FILES.items():
+        path = Path(data_dir) / file_name
+        if not path.exists():
+            continue
+        lines = path.read_text(encoding="utf-8").splitlines()
+        for line in lines[1:]:
+            parts = line.split(",")
+            if source == "arso":
+                rows.append({"date": parts[0], "value": float(parts[1]), "city": parts[2],
+                             "year": int(parts[3]), "pollutant": parts[4], "month": int(parts[5]),
+                             "source": source})
+            elif source == "eea":
+                rows.append({"date": parts[0], "value": float(parts[4]), "city": parts[2],
+                             "year": int(parts[0][:4]), "pollutant": parts[3], "month": int(parts[0][5:7]),
+                             "source": source, "station_id": parts[1]})
+            else:
+                rows.append({"date": parts[2], "value": float(parts[3]), "city": parts[0],
+                             "year": int(parts[2][:4]), "pollutant": parts[1], "month": int(parts[2][5:7]),
+                             "source": source})
+    return rows
+
+
+def best_of(func, repeat):
+    """Najboljši čas izvajanja funkcije v sekundah"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primerjava nalaganja CSV in binarnega posnetka")
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Število ponovitev (privzeto: 5)")
+    args = parser.parse_args()
+
+    rows, _ = load_unified_rows(args.data)
+    csv_size = sum((Path(args.data) / f).stat().st_size for f in SOURCE_FILES.values()
+                   if (Path(args.data) / f).exists())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "snapshot.aqs"
+        snapshot_size = write_snapshot(rows, snapshot_path)
+
+        def load_snapshot():
+            _, columns = read_snapshot(snapshot_path)
+            # Dotakni se vseh stolpcev, da se strani res preberejo
+            return [column.sum() for column in columns.values()]
+
+        csv_time = best_of(lambda: load_csv_like_backend(args.data), args.repeat)
+        snapshot_time = best_of(load_snapshot, args.repeat)
+
+    print(f"Vrstice:  {len(rows)}")
+    print(f"CSV:      {csv_time * 1000:8.1f} ms  ({csv_size / 1024:.0f} KiB)")
+    print(f"Posnetek: {snapshot_time * 1000:8.1f} ms  ({snapshot_size / 1024:.0f} KiB)")
+    print(f"Pohitritev: {csv_time / snapshot_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Primerjava zapisovanja JSON prek serializacija.py na pravih izhodih
+(data/ARSO in data/EEA_historical_data): čas, prepustnost in velikost
+datotek za vsak način in kodirnik ter hitrost branja.
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+
+import serializacija
+from serializacija import dumps, loads
+
+# Skupina: (vzorec, ali je izvirnik zapisan z json.dump; EEA zapiše pandas to_json)
+GROUPS = {
+    "ARSO": ("ARSO/**/*.json", True),
+    "EEA_historical_data": ("EEA_historical_data/*.json", False),
+}
+
+
+def best_time(func, repeat):
+    """Najkrajši čas izvedbe v sekundah"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def variants():
+    """Pari (način, kodirnik), ki so na voljo"""
+    backends = ["json"] + [name for name in ("orjson", "msgspec") if getattr(serializacija, name) is not None]
+    result = [("compat", "json")]
+    for backend in backends:
+        result += [("pretty", backend), ("compact", backend)]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primerjava načinov in kodirnikov JSON na podatkih ARSO in EEA")
+    parser.add_argument("-d", "--data", default="data", help="Mapa s podatki (privzeto: data)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Število ponovitev (privzeto: 3)")
+    args = parser.parse_args()
+
+    for group, (pattern, json_dump_original) in GROUPS.items():
+        files = sorted(Path(args.data).glob(pattern))
+        if not files:
+            print(f"{group}: ni datotek")
+            continue
+        raw = [f.read_bytes() for f in files]
+        objects = [json.loads(content) for content in raw]
+        original = sum(len(content) for content in raw)
+        print(f"\n{group}: {len(files)} datotek, {original / 2 ** 20:.1f} MiB na disku")
+
+        print(f"  {'način':<8} {'kodirnik':<8} {'čas':>9} {'MiB/s':>8} {'velikost':>10} {'glede na disk':>14}")
+        for mode, backend in variants():
+            size = sum(len(dumps(obj, mode, backend)) for obj in objects)
+            seconds = best_time(lambda: [dumps(obj, mode, backend) for obj in objects], args.repeat)
+            print(f"  {mode:<8} {backend:<8} {seconds * 1000:7.1f} ms {size / 2 ** 20 / seconds:8.1f} "
+                  f"{size / 2 ** 20:8.2f} MiB {size / original * 100:12.1f} %")
+
+        if json_dump_original:
+            identical = sum(dumps(obj, "compat") == content for obj, content in zip(objects, raw))
+            print(f"  compat bajtno enak izvirniku: {identical}/{len(files)} datotek")
+
+        json_read = best_time(lambda: [json.loads(content) for content in raw], args.repeat)
+        fast_read = best_time(lambda: [loads(content) for content in raw], args.repeat)
+        print(f"  branje: json {json_read * 1000:.1f} ms, {serializacija.BACKEND} {fast_read * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Meritev časa zagona ukazne vrstice airq: vsak ukaz se večkrat zažene kot nov
+proces in izpiše se najkrajši in srednji čas glede na mejo (privzeto 100 ms).
+Za primerjavo izmeri še prazen zagon interpreterja in uvoz težkih knjižnic,
+ki jih airq naloži šele ob zagonu podukaza.
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+AIRQ = str(Path(__file__).resolve().parent / "airq.py")
+
+COMMANDS = {
+    "airq --help": [AIRQ, "--help"],
+    "airq extract pm10 --help": [AIRQ, "extract", "pm10", "--help"],
+    "airq convert --help": [AIRQ, "convert", "--help"],
+    "airq download --help": [AIRQ, "download", "--help"],
+    "airq build-daily --help": [AIRQ, "build-daily", "--help"],
+    "airq pipeline --list": [AIRQ, "pipeline", "--list"],
+}
+
+# Primerjava: cena, ki so jo skripte prej plačale ob vsakem zagonu
+REFERENCE = {
+    "python -c pass": ["-c", "pass"],
+    "import pandas": ["-c", "import pandas"],
+    "import pdfplumber": ["-c", "import pdfplumber"],
+}
+
+
+def measure(args, repeat, cwd):
+    """Časi zagona procesa v sekundah; None, če ukaz ne uspe"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, *args], cwd=cwd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meritev časa zagona ukazov airq")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Število zagonov na ukaz (privzeto: 10)")
+    parser.add_argument("-l", "--limit", type=float, default=100, help="Meja v milisekundah (privzeto: 100)")
+    parser.add_argument("-d", "--directory", default=str(Path(AIRQ).parent.parent),
+                        help="Delovna mapa za zagon (privzeto: backend)")
+    args = parser.parse_args()
+
+    print(f"{'ukaz':<28} {'najmanj':>9} {'mediana':>9}  meja {args.limit:.0f} ms")
+    over = 0
+    for name, command in {**COMMANDS, **REFERENCE}.items():
+        times = measure(command, args.repeat, args.directory)
+        if times is None:
+            print(f"{name:<28} {'ni uspel':>9}")
+            continue
+        best, median = min(times) * 1000, statistics.median(times) * 1000
+        status = ""
+        if name in COMMANDS:
+            status = "OK" if median < args.limit else "PREPOČASI"
+            over += median >= args.limit
+        print(f"{name:<28} {best:6.1f} ms {median:6.1f} ms  {status}")
+
+    if over:
+        print(f"\nUkazov nad mejo: {over}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
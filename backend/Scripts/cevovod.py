@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Zaganjalnik celotne verige skript v backend/Scripts.
+Vsaka stopnja ima ukaz, vhode in izhode (vzorci poti glede na mapo backend).
+Odvisnosti med stopnjami se izpeljejo iz tega, katere izhode ena stopnja
+bere kot vhode druge. Stopnja se izvede le, če so se vsebine njenih vhodov,
+skripte, lokalnih modulov, ki jih skripta uvozi, ali ukaza spremenile (zgoščene vrednosti SHA-256) ali če njeni
+izhodi manjkajo oziroma so bili spremenjeni. Neodvisne stopnje (npr. PDF
+ekstrakcija ARSO in pretvorba EEA) tečejo vzporedno, izhodi se shranijo v
+predpomnilnik, na koncu se izpišejo časi po stopnjah.
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+from serializacija import read_json, write_json
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPTS_DIR.parent
+STATE_DIR = "data/.cevovod"
+PDF_DIR = "data/ARSO_PDF"
+
+ARSO_PM10_JSON = "data/ARSO/PM10/**/*.json"
+ARSO_PM25_JSON = "data/ARSO/PM25/**/*.json"
+DAILY_CSV = [
+    "data/ARSO_Daily.csv",
+    "data/EEA_Daily.csv",
+    "data/ARSO_daily_forecasts_2026.csv",
+    "data/EEA_daily_forecasts_2026.csv",
+]
+# Stopnje, ki berejo dnevne podatke, berejo tudi poročilo preverjanja, zato se
+# izvedejo šele po uspešni stopnji "validate" in se ob njeni napaki preskočijo
+VALIDATION_REPORT = "data/validation_report.json"
+
+
+def build_stages(pdf_dir=PDF_DIR, workers=1):
+    """Opis stopenj verige; vrstni red ni pomemben, odvisnosti se izpeljejo iz vhodov in izhodov"""
+    return [
+        {
+            "name": "eea_download",
+            "script": "airbase_historical_extractor.py",
+            "args": [],
+            # Prenos iz omrežja se izvede le, če je stopnja izrecno izbrana
+            "manual": True,
+            "inputs": [],
+            "outputs": ["data/EEA_historical_data/raw/*.parquet"],
+        },
+        {
+            "name": "eea_convert",
+            "script": "parquet_to_json.py",
+            "args": ["data/EEA_historical_data/raw", "data/EEA_historical_data"],
+            "inputs": ["data/EEA_historical_data/raw/*.parquet"],
+            "outputs": ["data/EEA_historical_data/*.json"],
+        },
+        {
+            "name": "eea_ozone",
+            "script": "eea_ozon_preseganja.py",
+            "args": [],
+            "inputs": ["data/EEA_podatki/po_postajah/*.json", "data/EEA_postaje.csv"],
+            "outputs": ["data/EEA_podatki/Ozon/**/*.json"],
+        },
+        {
+            "name": "arso_pm10",
+            "script": "arso_pm10_ekstraktor.py",
+            "args": ["-d", f"{pdf_dir}/PM10", "-o", "data/ARSO/PM10", "-j", str(workers)],
+            "inputs": [f"{pdf_dir}/PM10/*.pdf"],
+            "outputs": [ARSO_PM10_JSON],
+        },
+        {
+            "name": "arso_pm25",
+            "script": "arso_pm25_ekstraktor.py",
+            "args": ["-d", f"{pdf_dir}/PM25", "-o", "data/ARSO/PM25", "-j", str(workers)],
+            "inputs": [f"{pdf_dir}/PM25/*.pdf"],
+            "outputs": [ARSO_PM25_JSON],
+        },
+        {
+            "name": "arso_ozone",
+            "script": "arso_ozon_ekstraktor.py",
+            "args": ["-d", f"{pdf_dir}/Ozon", "-o", "data/ARSO/Ozon", "-j", str(workers)],
+            "inputs": [f"{pdf_dir}/Ozon/*.pdf"],
+            "outputs": ["data/ARSO/Ozon/**/*.json"],
+        },
+        {
+            "name": "daily_csv",
+            "script": "dnevni_izvoz.py",
+            "args": [],
+            "inputs": [ARSO_PM10_JSON, ARSO_PM25_JSON] + DAILY_CSV[1:],
+            "outputs": [
+                "data/ARSO_Daily.csv",
+                "data/ARSO_Daily/*",
+                "data/EEA_Daily/*",
+                "data/ARSO_daily_forecasts_2026/*",
+                "data/EEA_daily_forecasts_2026/*",
+            ],
+        },
+        {
+            "name": "validate",
+            "script": "validacija.py",
+            "args": [],
+            "inputs": [ARSO_PM10_JSON, ARSO_PM25_JSON, "data/EEA_historical_data/*.json",
+                       "data/EEA_podatki/po_postajah/*.json", "data/validation_baseline.json"],
+            "outputs": [VALIDATION_REPORT],
+        },
+        {
+            "name": "reconcile",
+            "script": "uskladitev.py",
+            "args": [],
+            "inputs": DAILY_CSV[:2] + [VALIDATION_REPORT],
+            "outputs": ["data/Daily_reconciled.csv", "data/station_mapping.csv",
+                        "data/reconciliation_differences.csv", "data/reconciliation_report.json"],
+        },
+        {
+            "name": "snapshot",
+            "script": "posnetek.py",
+            "args": [],
+            "inputs": DAILY_CSV + [VALIDATION_REPORT],
+            "outputs": ["data/Unified_snapshot.aqs"],
+        },
+        {
+            "name": "trends",
+            "script": "trendi.py",
+            "args": [],
+            "inputs": DAILY_CSV[:2] + [VALIDATION_REPORT],
+            "outputs": ["data/trends.json"],
+        },
+        {
+            "name": "dense",
+            "script": "prevzorcenje.py",
+            "args": [],
+            "inputs": DAILY_CSV[:2] + [VALIDATION_REPORT],
+            "outputs": ["data/Daily_dense.npz"],
+        },
+        {
+            "name": "lttb",
+            "script": "lttb.py",
+            "args": [],
+            "inputs": DAILY_CSV + [VALIDATION_REPORT],
+            "outputs": ["data/LTTB/*.json"],
+        },
+        {
+            "name": "climatology",
+            "script": "klimatologija.py",
+            "args": [],
+            "inputs": DAILY_CSV + [VALIDATION_REPORT],
+            "outputs": ["data/Climatology/*.npz"],
+        },
+        {
+            "name": "stations",
+            "script": "postaje.py",
+            "args": [],
+            # data/EEA_postaje.csv še nima koordinat vseh postaj EEA in postaje.py se v tem primeru
+            # ustavi z napako, zato se indeks gradi le, če je stopnja izrecno izbrana
+            "manual": True,
+            "inputs": ["data/WAQI_arhiv/**/*.parquet", "data/EEA_historical_data/*.json",
+                       "data/EEA_podatki/po_postajah/*.json", "data/EEA_postaje.csv", "data/station_mapping.csv"],
+            "outputs": ["data/station_index.npz"],
+        },
+        {
+            "name": "health",
+            "script": "zdravje.py",
+            "args": [],
+            "inputs": DAILY_CSV[:2] + ["../frontend/src/MapView/airQualityScale.json", VALIDATION_REPORT],
+            "outputs": ["data/health_categories.json"],
+        },
+    ]
+
+
+def _patterns_overlap(a, b):
+    return a == b or fnmatch(a, b) or fnmatch(b, a)
+
+
+def build_graph(stages):
+    """Odvisnosti: stopnja je odvisna od vseh stopenj, katerih izhode bere"""
+    graph = {}
+    for stage in stages:
+        graph[stage["name"]] = {
+            other["name"] for other in stages
+            if other is not stage and any(
+                _patterns_overlap(inp, out) for inp in stage["inputs"] for out in other["outputs"]
+            )
+        }
+    return graph
+
+
+def upstream(graph, targets, manual=()):
+    """Izbrane stopnje in vse stopnje, od katerih so odvisne (ročne stopnje le, če so izbrane)"""
+    selected = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(dep for dep in graph[name] if dep not in manual or dep in targets)
+    return selected
+
+
+def expand(patterns, root=None):
+    """Obstoječe datoteke, ki ustrezajo vzorcem, urejene po poti"""
+    root = BACKEND_DIR if root is None else root
+    files = set()
+    for pattern in patterns:
+        files.update(path for path in root.glob(pattern) if path.is_file())
+    return sorted(files)
+
+
+class FileHasher:
+    """Zgoščene vrednosti datotek; ponovno se izračunajo le ob spremembi velikosti ali časa"""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def file(self, path):
+        stat = path.stat()
+        key = str(path.relative_to(BACKEND_DIR))
+        entry = self.known.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.known[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def files(self, paths, extra=""):
+        """Skupna zgoščena vrednost seznama datotek (poti in vsebine)"""
+        digest = hashlib.sha256(extra.encode("utf-8"))
+        for path in paths:
+            digest.update(str(path.relative_to(BACKEND_DIR)).encode("utf-8") + b"\0")
+            digest.update(self.file(path).encode("ascii"))
+        return digest.hexdigest()
+
+
+def command_for(stage):
+    return [sys.executable, str(SCRIPTS_DIR / stage["script"])] + stage["args"]
+
+
+def local_modules(script):
+    """Moduli iz mape Scripts, ki jih skripta uvozi neposredno ali posredno (tudi znotraj funkcij)"""
+    found = set()
+    pending = [Path(script)]
+    while pending:
+        path = pending.pop()
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = SCRIPTS_DIR / f"{name.split('.')[0]}.py"
+                if module.is_file() and module not in found and module != Path(script):
+                    found.add(module)
+                    pending.append(module)
+    return sorted(found)
+
+
+def inputs_hash(stage, hasher):
+    """Zgoščena vrednost vhodov, skripte, njenih lokalnih modulov in ukaza"""
+    script = SCRIPTS_DIR / stage["script"]
+    paths = [script] + local_modules(script) + expand(stage["inputs"])
+    return hasher.files(paths, extra=json.dumps(stage["args"]))
+
+
+def save_to_cache(stage, key, cache_dir):
+    """Kopira izhode stopnje v predpomnilnik pod ključem vhodov"""
+    target = Path(cache_dir) / stage["name"] / key
+    if target.exists():
+        shutil.rmtree(target)
+    for path in expand(stage["outputs"]):
+        destination = target / path.relative_to(BACKEND_DIR)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, destination)
+    target.mkdir(parents=True, exist_ok=True)
+
+
+def restore_from_cache(stage, key, cache_dir):
+    """Obnovi izhode iz predpomnilnika; vrne False, če zapisa ni"""
+    source = Path(cache_dir) / stage["name"] / key
+    if not source.is_dir():
+        return False
+    files = [path for path in source.rglob("*") if path.is_file()]
+    if not files:
+        return False
+    for path in files:
+        destination = BACKEND_DIR / path.relative_to(source)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, destination)
+    return True
+
+
+def run_stage(stage, log_dir):
+    """Izvede ukaz stopnje v mapi backend; izpis shrani v dnevnik. Vrne (koda, čas v s)"""
+    log_file = Path(log_dir) / f"{stage['name']}.log"
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    with open(log_file, "w", encoding="utf-8") as log:
+        result = subprocess.run(command_for(stage), cwd=BACKEND_DIR, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start
+
+
+def load_state(path):
+    if Path(path).exists():
+        return read_json(path)
+    return {"stages": {}, "files": {}}
+
+
+def save_state(path, state):
+    write_json(path, state)
+
+
+def stale_reason(stage, previous, key, hasher):
+    """Razlog za ponovno izvedbo ali None, če je stopnja ažurna"""
+    if previous is None:
+        return "prvi zagon"
+    if previous.get("inputs") != key:
+        return "spremenjeni vhodi"
+    outputs = expand(stage["outputs"])
+    if not outputs:
+        return "manjkajoči izhodi"
+    if previous.get("outputs") != hasher.files(outputs):
+        return "spremenjeni izhodi"
+    return None
+
+
+def run_pipeline(stages, targets=None, jobs=None, force=False, dry_run=False, use_cache=True,
+                 state_dir=STATE_DIR):
+    """Izvede zastarele stopnje v vrstnem redu odvisnosti; neodvisne stopnje vzporedno.
+    Vrne seznam rezultatov {name, status, seconds, reason}."""
+    by_name = {stage["name"]: stage for stage in stages}
+    graph = build_graph(stages)
+    manual = {stage["name"] for stage in stages if stage.get("manual")}
+    selected = upstream(graph, targets or set(by_name) - manual, manual)
+
+    state_dir = BACKEND_DIR / state_dir
+    state_file = state_dir / "state.json"
+    state = load_state(state_file)
+    hasher = FileHasher(state.get("files"))
+
+    sorter = TopologicalSorter({name: graph[name] & selected for name in selected})
+    sorter.prepare()
+    results = {}
+    failed = set()
+    running = {}
+
+    def finish(name, status, seconds=0.0, reason=None):
+        results[name] = {"name": name, "status": status, "seconds": seconds, "reason": reason}
+        sorter.done(name)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                stage = by_name[name]
+                if graph[name] & failed:
+                    failed.add(name)
+                    finish(name, "preskočeno", reason="neuspešna odvisnost")
+                    continue
+                if stage["inputs"] and not expand(stage["inputs"]):
+                    finish(name, "brez vhodov")
+                    continue
+
+                key = inputs_hash(stage, hasher)
+                previous = state["stages"].get(name)
+                reason = "vsiljeno" if force else stale_reason(stage, previous, key, hasher)
+                if reason is None:
+                    finish(name, "ažurno")
+                elif dry_run:
+                    finish(name, "zastarelo", reason=reason)
+                elif use_cache and not force and restore_from_cache(stage, key, state_dir / "cache"):
+                    state["stages"][name] = {**(previous or {}), "inputs": key,
+                                             "outputs": hasher.files(expand(stage["outputs"]))}
+                    finish(name, "iz predpomnilnika", reason=reason)
+                else:
+                    print(f"Zaganjam {name} ({reason}): {' '.join(stage['args']) or stage['script']}")
+                    running[pool.submit(run_stage, stage, state_dir / "logs")] = (name, key, reason)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, key, reason = running.pop(future)
+                stage = by_name[name]
+                code, seconds = future.result()
+                if code != 0:
+                    failed.add(name)
+                    print(f"Napaka: {name} je končal s kodo {code} (dnevnik: {state_dir / 'logs' / (name + '.log')})")
+                    finish(name, "napaka", seconds, reason)
+                    continue
+
+                outputs = expand(stage["outputs"])
+                state["stages"][name] = {
+                    "inputs": key,
+                    "outputs": hasher.files(outputs),
+                    "seconds": round(seconds, 3),
+                    "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                }
+                if use_cache:
+                    save_to_cache(stage, key, state_dir / "cache")
+                save_state(state_file, {**state, "files": hasher.known})
+                finish(name, "izvedeno", seconds, reason)
+
+    if not dry_run:
+        save_state(state_file, {**state, "files": hasher.known})
+    order = [name for name in TopologicalSorter(graph).static_order() if name in results]
+    return [results[name] for name in order]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Izvede zastarele stopnje verige skript (ARSO PDF, EEA, dnevni CSV, izpeljani podatki)"
+    )
+    parser.add_argument("targets", nargs="*", help="Stopnje za osvežitev skupaj z odvisnostmi (privzeto: vse)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="Največ vzporednih stopenj (privzeto: 0 = vsa jedra)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Število procesov za strani PDF v ekstraktorjih ARSO (privzeto: 1)")
+    parser.add_argument("--pdf-dir", default=PDF_DIR,
+                        help=f"Mapa s PDF poročili ARSO v podmapah PM10, PM25 in Ozon (privzeto: {PDF_DIR})")
+    parser.add_argument("-f", "--force", action="store_true", help="Izvedi izbrane stopnje ne glede na stanje")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Samo izpiši, katere stopnje so zastarele")
+    parser.add_argument("--no-cache", action="store_true", help="Ne uporabljaj predpomnilnika izhodov")
+    parser.add_argument("--list", action="store_true", help="Izpiši stopnje in njihove odvisnosti")
+
+    args = parser.parse_args()
+    stages = build_stages(args.pdf_dir, args.workers)
+
+    if args.list:
+        graph = build_graph(stages)
+        for name in TopologicalSorter(graph).static_order():
+            print(f"{name}: {', '.join(sorted(graph[name])) or '-'}")
+        return
+
+    unknown = set(args.targets) - {stage["name"] for stage in stages}
+    if unknown:
+        print(f"Napaka: Neznane stopnje: {', '.join(sorted(unknown))}")
+        sys.exit(2)
+
+    start = time.perf_counter()
+    results = run_pipeline(stages, args.targets, args.jobs or None, args.force, args.dry_run, not args.no_cache)
+    total = time.perf_counter() - start
+
+    print(f"\n{'Stopnja':<14} {'Stanje':<18} {'Čas':>8}  Razlog")
+    for result in results:
+        print(f"{result['name']:<14} {result['status']:<18} {result['seconds']:>7.2f}s  {result['reason'] or ''}")
+    print(f"Skupaj: {total:.2f} s")
+
+    if any(result["status"] == "napaka" for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Skripta za izvoz dnevnih podatkov v CSV datoteke, razdeljene po letih.
+Zgradi ARSO_Daily.csv iz JSON datotek po lokacijah in vsak dnevni CSV zapiše
+tudi kot particije <ime>/<leto>.csv. Ob particijah vodi manifest (zgoščene
+vrednosti in število vrstic) in dnevnik sprememb, tako da porabniki ponovno
+preberejo samo particije, ki so se spremenile.
+"""
+
+import csv
+import io
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from serializacija import dumps, read_json, write_bytes
+
+ARSO_DAILY_COLUMNS = ["date", "value", "city", "year", "pollutant", "month"]
+ARSO_POLLUTANTS = ["PM10", "PM25"]
+
+# Obstoječe dnevne CSV datoteke, ki se prav tako razdelijo po letih
+DAILY_CSV_FILES = ["EEA_Daily.csv", "ARSO_daily_forecasts_2026.csv", "EEA_daily_forecasts_2026.csv"]
+
+
+def location_file_order(location_file):
+    """Vrstni red datotek po lokacijah, kot v obstoječem ARSO_Daily.csv: poročilo (mapa leta),
+    nato lokacija brez razlikovanja velikih in malih črk (Ljubljana Bežigrad pred Ljubljana BF)"""
+    return location_file.parent.parent.name, location_file.stem.casefold()
+
+
+def build_arso_daily_rows(arso_dir):
+    """Zbere dnevne meritve iz ARSO/<onesnaževalo>/*/po_lokacijah_*/*.json v vrstice ARSO_Daily.csv"""
+    rows = []
+    for pollutant in ARSO_POLLUTANTS:
+        location_files = Path(arso_dir, pollutant).glob("*/po_lokacijah_*/*.json")
+        for location_file in sorted(location_files, key=location_file_order):
+            content = read_json(location_file)
+            for measurement in content.get("data", []):
+                date = measurement["date"]
+                rows.append([
+                    date,
+                    float(measurement["value"]),
+                    measurement["location"],
+                    int(date[:4]),
+                    pollutant,
+                    int(date[5:7]),
+                ])
+    return rows
+
+
+def read_csv_file(path):
+    """Prebere CSV datoteko; vrne glavo in vrstice"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        return columns, [row for row in reader if row]
+
+
+def rows_to_csv_bytes(columns, rows):
+    """Pretvori vrstice v CSV (UTF-8, konec vrstice LF)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_if_changed(path, content):
+    """Zapiše datoteko prek začasne datoteke, le če se vsebina razlikuje; vrne True ob spremembi"""
+    path = Path(path)
+    if path.exists() and path.read_bytes() == content:
+        return False
+    write_bytes(path, content)
+    return True
+
+
+def export_partitions(columns, rows, output_dir, dataset):
+    """Zapiše vrstice kot particije <leto>.csv, posodobi manifest in dnevnik sprememb.
+    Vrne slovar s seznami dodanih, spremenjenih in odstranjenih particij."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_dir / "manifest.json"
+
+    previous = {}
+    if manifest_file.exists():
+        previous = read_json(manifest_file).get("partitions", {})
+
+    date_index = columns.index("date")
+    by_year = {}
+    for row in rows:
+        by_year.setdefault(str(row[date_index])[:4], []).append(row)
+
+    partitions = {}
+    changes = {"added": [], "changed": [], "removed": []}
+    for year, year_rows in sorted(by_year.items()):
+        content = rows_to_csv_bytes(columns, year_rows)
+        digest = hashlib.sha256(content).hexdigest()
+        file_name = f"{year}.csv"
+        partitions[year] = {"file": file_name, "sha256": digest, "rows": len(year_rows)}
+
+        # Spremembo določi vsebina particije na disku, ne le manifest
+        existed = (output_dir / file_name).exists()
+        if write_if_changed(output_dir / file_name, content):
+            changes["changed" if existed else "added"].append(year)
+
+    for year, entry in previous.items():
+        if year not in partitions:
+            changes["removed"].append(year)
+            (output_dir / entry["file"]).unlink(missing_ok=True)
+
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    manifest = {
+        "dataset": dataset,
+        "columns": columns,
+        "total_rows": len(rows),
+        "partitions": partitions,
+    }
+    write_if_changed(manifest_file, dumps(manifest))
+
+    # Zagon brez sprememb ne doda vnosa, da porabniki ne berejo particij po nepotrebnem
+    if any(changes.values()):
+        with open(output_dir / "changelog.jsonl", 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"run_at": run_at, **changes}) + "\n")
+
+    return changes
+
+
+def export_dataset(columns, rows, data_dir, dataset, write_monolith=True):
+    """Zapiše celoten CSV (le ob spremembi) in njegove particije po letih"""
+    if write_monolith and write_if_changed(Path(data_dir) / f"{dataset}.csv", rows_to_csv_bytes(columns, rows)):
+        print(f"Shranjeno: {Path(data_dir) / f'{dataset}.csv'} ({len(rows)} vrstic)")
+
+    changes = export_partitions(columns, rows, Path(data_dir) / dataset, dataset)
+    changed = changes["added"] + changes["changed"]
+    print(f"{dataset}: spremenjene particije: {', '.join(changed) if changed else '-'}"
+          + (f", odstranjene: {', '.join(changes['removed'])}" if changes["removed"] else ""))
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Izvozi dnevne podatke v CSV particije po letih z manifestom in dnevnikom sprememb"
+    )
+    parser.add_argument(
+        "-d", "--data",
+        default="data",
+        help="Mapa s podatki (privzeto: data)"
+    )
+    parser.add_argument(
+        "--skip-arso",
+        action="store_true",
+        help="Ne gradi ARSO_Daily.csv iz JSON datotek, samo razdeli obstoječe CSV datoteke"
+    )
+
+    args = parser.parse_args()
+    data_dir = Path(args.data)
+
+    if not args.skip_arso:
+        rows = build_arso_daily_rows(data_dir / "ARSO")
+        if rows:
+            export_dataset(ARSO_DAILY_COLUMNS, rows, data_dir, "ARSO_Daily")
+        else:
+            print(f"Opozorilo: Ni najdenih podatkov ARSO v {(data_dir / 'ARSO').absolute()}!")
+
+    for file_name in DAILY_CSV_FILES:
+        csv_file = data_dir / file_name
+        if not csv_file.exists():
+            continue
+        columns, rows = read_csv_file(csv_file)
+        export_dataset(columns, rows, data_dir, csv_file.stem, write_monolith=False)
+
+
+if __name__ == "__main__":
+    main()
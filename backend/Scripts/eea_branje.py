@@ -0,0 +1,198 @@
+"""
+Pretočno branje velikih JSON datotek EEA s konstantno porabo pomnilnika.
+Zapise iz seznama "data" ({"station", "total_measurements", "data": [...]})
+ali iz seznama na najvišji ravni bere enega za drugim in jih zlaga v
+tipizirane stolpce po kosih fiksne velikosti. Datoteke NDJSON (.ndjson,
+.jsonl; en zapis na vrstico) se berejo po hitrejši poti vrstico za vrstico.
+"""
+
+import re
+import json
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Tipi stolpcev zapisov EEA; ostali stolpci ostanejo objektni
+COLUMN_TYPES = {
+    "Samplingpoint": object,
+    "Pollutant": "float64",
+    "PollutantName": object,
+    "Start": "datetime64[s]",
+    "End": "datetime64[s]",
+    "Value": "float64",
+    "Unit": object,
+    "AggType": object,
+    "Validity": "float64",
+    "Verification": "float64",
+}
+DEFAULT_COLUMNS = list(COLUMN_TYPES)
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+READ_SIZE = 1 << 16
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _StreamingDecoder:
+    """Inkrementalni razčlenjevalnik zaporedja JSON vrednosti iz datoteke"""
+
+    def __init__(self, f, read_size=READ_SIZE):
+        self.f = f
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Prebrani del bufferja zavrži, da pomnilnik ostane omejen
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Vrne naslednji znak, ki ni presledek (ali '' na koncu datoteke)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Pričakovan '{char}', najden '{self.peek()}'")
+        self.pos += 1
+
+    def value(self):
+        """Razčleni eno vrednost; ob nepopolnem bufferju prebere več besedila"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Število na koncu bufferja je lahko odrezano, zato preberi še naprej
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self):
+        """Vrne elemente seznama, ki se začne na trenutnem mestu"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            # Hitra pot: vse celotne elemente do zadnjega "}," v bufferju razčleni z enim klicem.
+            # Nepopoln del elementa nikoli ni veljaven JSON, zato uspešen klic vrne točno te elemente.
+            cut = self.buffer.rfind("},", self.pos)
+            if cut > self.pos:
+                try:
+                    items = _loads("[" + self.buffer[self.pos:cut + 1] + "]")
+                except ValueError:
+                    items = None
+                if items is not None:
+                    self.pos = cut + 2
+                    yield from items
+                    if self.peek() == "":
+                        raise ValueError("Nepričakovan konec datoteke")
+                    continue
+
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Pričakovan ',' ali ']', najden '{separator}'")
+
+
+def _iter_json_records(f, key="data"):
+    """Zapisi iz seznama na najvišji ravni ali iz seznama pod ključem key"""
+    stream = _StreamingDecoder(f)
+    if stream.peek() == "[":
+        yield from stream.array_items()
+        return
+
+    stream.expect("{")
+    while stream.peek() not in ("}", ""):
+        name = stream.value()
+        stream.expect(":")
+        if name == key:
+            yield from stream.array_items()
+        else:
+            stream.value()
+        if stream.peek() == ",":
+            stream.pos += 1
+
+
+def _iter_ndjson_records(f):
+    for line in f:
+        if line.strip():
+            yield _loads(line)
+
+
+def iter_records(path):
+    """Zapisi EEA iz datoteke JSON ali NDJSON, eden za drugim"""
+    path = Path(path)
+    if path.suffix in NDJSON_SUFFIXES:
+        with open(path, "rb") as f:
+            yield from _iter_ndjson_records(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _iter_json_records(f)
+
+
+def _to_column(values, dtype):
+    if dtype == "float64":
+        return np.array([np.nan if v is None else v for v in values], dtype="float64")
+    if dtype == "datetime64[s]":
+        return np.array([v if v else "NaT" for v in values], dtype="datetime64[s]")
+    return np.array(values, dtype=object)
+
+
+def iter_chunks(path, chunk_size=10000, columns=None):
+    """Bere zapise v kosih po chunk_size; vsak kos je slovar stolpec -> numpy tabela"""
+    columns = DEFAULT_COLUMNS if columns is None else columns
+    buffers = {column: [] for column in columns}
+    count = 0
+
+    for record in iter_records(path):
+        for column, values in buffers.items():
+            values.append(record.get(column))
+        count += 1
+        if count == chunk_size:
+            yield {column: _to_column(values, COLUMN_TYPES.get(column, object)) for column, values in buffers.items()}
+            buffers = {column: [] for column in columns}
+            count = 0
+
+    if count:
+        yield {column: _to_column(values, COLUMN_TYPES.get(column, object)) for column, values in buffers.items()}
+
+
+def read_columns(path, chunk_size=10000, columns=None, where=None):
+    """Prebere celotno datoteko v stolpce; where(kos) lahko vrne masko za filtriranje po kosih"""
+    chunks = []
+    for chunk in iter_chunks(path, chunk_size, columns):
+        if where is not None:
+            mask = where(chunk)
+            chunk = {column: values[mask] for column, values in chunk.items()}
+        chunks.append(chunk)
+
+    columns = DEFAULT_COLUMNS if columns is None else columns
+    if not chunks:
+        return {column: _to_column([], COLUMN_TYPES.get(column, object)) for column in columns}
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in columns}
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Skripta za izračun preseganj ozona iz urnih podatkov EEA.
+Iz urnih koncentracij O3 izračuna 8-urna drseča povprečja, dnevne maksimume
+in mesečna števila preseganj za vse postaje hkrati, brez zank po urah.
+Meseci s premalo veljavnimi urami ali dnevi se izpustijo (kot celice '-' v
+poročilih ARSO), postaje pa se preimenujejo v lokacije ARSO iz
+data/EEA_postaje.csv. Izhod ima enako obliko kot JSON datoteke iz
+arso_ozon_ekstraktor.py.
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from eea_branje import read_columns
+from postaje import EEA_METADATA, eea_code, read_eea_metadata
+from serializacija import write_json
+
+DETAILS_180 = "Concentration > 180 μg/m³"
+DETAILS_120_8H = "Concentration > 120 μg/m³ for at least 8 hours"
+
+# Pravila za veljavnost povprečij (Direktiva 2008/50/ES, Priloga VII)
+MIN_HOURS_PER_8H = 6
+MIN_8H_MEANS_PER_DAY = 18
+# Najmanjši delež veljavnih podatkov v mesecu (Priloga I: poleti 90 %, pozimi 75 %)
+MIN_CAPTURE_SUMMER = 0.90
+MIN_CAPTURE_WINTER = 0.75
+SUMMER_MONTHS = range(4, 10)
+
+
+def load_hourly_o3(input_dir):
+    """Prebere urne podatke O3 iz datotek po postajah in vrne tabelo (ure x postaje)"""
+    frames = []
+    for json_file in sorted(Path(input_dir).glob("*.json")):
+        # Datoteke beri pretočno in obdrži le veljavne urne zapise O3
+        columns = read_columns(
+            json_file,
+            columns=["PollutantName", "AggType", "Validity", "Start", "Value"],
+            where=lambda chunk: (chunk["PollutantName"] == "O3") & (chunk["AggType"] == "hour")
+            & (chunk["Validity"] >= 1),
+        )
+        if len(columns["Value"]) == 0:
+            continue
+
+        frames.append(pd.DataFrame({
+            "station": json_file.stem,
+            "start": columns["Start"],
+            "value": columns["Value"],
+        }))
+
+    if not frames:
+        return pd.DataFrame()
+
+    hourly = pd.concat(frames, ignore_index=True).pivot_table(
+        index="start", columns="station", values="value", aggfunc="mean"
+    )
+    # Zapolni manjkajoče ure, da drseče okno vedno zajame natanko 8 zaporednih ur.
+    # Konec je polnoč po dnevu zadnje ure (tudi ko je zadnja ura ob polnoči, ki je ceil ne premakne).
+    full_index = pd.date_range(hourly.index.min().floor("D"),
+                               hourly.index.max().floor("D") + pd.Timedelta(days=1),
+                               freq="h", inclusive="left")
+    return hourly.reindex(full_index)
+
+
+def rolling_8h_means(hourly):
+    """8-urna drseča povprečja; vsako povprečje pripada uri, v kateri se okno konča"""
+    return hourly.rolling(8, min_periods=MIN_HOURS_PER_8H).mean()
+
+
+def daily_max_8h(hourly):
+    """Največje dnevno 8-urno drseče povprečje za vsako postajo"""
+    means = rolling_8h_means(hourly)
+    daily_max = means.resample("D").max()
+    valid_counts = means.resample("D").count()
+    return daily_max.where(valid_counts >= MIN_8H_MEANS_PER_DAY)
+
+
+def required_capture(months):
+    """Najmanjši delež veljavnih podatkov za vsak mesec (poletje april-september)"""
+    return pd.Series(months.month.isin(SUMMER_MONTHS), index=months).map(
+        {True: MIN_CAPTURE_SUMMER, False: MIN_CAPTURE_WINTER})
+
+
+def enough_data(valid_counts, per_day):
+    """Ali ima postaja v mesecu dovolj veljavnih ur (per_day=24) ali dni (per_day=1)"""
+    months = valid_counts.index
+    possible = pd.Series(months.days_in_month * per_day, index=months)
+    capture = valid_counts.div(possible, axis=0)
+    return capture.ge(required_capture(months), axis=0)
+
+
+def monthly_exceedances(hourly):
+    """Mesečno število ur nad 180 μg/m³ in dni z 8-urnim maksimumom nad 120 μg/m³.
+    Meseci brez dovolj veljavnih podatkov so NaN, da vrzel ni prikazana kot 0 preseganj."""
+    daily_max = daily_max_8h(hourly)
+    hours_over_180 = (hourly > 180).resample("MS").sum()
+    days_over_120 = (daily_max > 120).resample("MS").sum()
+    return {
+        DETAILS_180: hours_over_180.where(enough_data(hourly.resample("MS").count(), 24)),
+        DETAILS_120_8H: days_over_120.where(enough_data(daily_max.resample("MS").count(), 1)),
+    }
+
+
+def station_locations(stations, metadata):
+    """Imena lokacij ARSO za postaje EEA (npr. SPO-SI0032R -> Krvavec); neznane ostanejo z oznako"""
+    locations = {}
+    if Path(metadata).exists():
+        meta = read_eea_metadata(metadata).dropna(subset=["location"])
+        locations = dict(zip(meta["station"], meta["location"]))
+    return {station: locations.get(eea_code(station), station) for station in stations}
+
+
+def to_measurements(exceedances):
+    """Pretvori mesečna preseganja v meritve v obliki arso_ozon_ekstraktor.py, po letih"""
+    by_year = {}
+    for details, counts in exceedances.items():
+        long = counts.stack().dropna().reset_index()
+        long.columns = ["month_start", "location", "value"]
+        for row in long.itertuples(index=False):
+            by_year.setdefault(row.month_start.year, []).append({
+                "month": row.month_start.month - 1,
+                "location": row.location,
+                "value": float(row.value),
+                "unit": "μg/m³",
+                "detail": details,
+            })
+    return by_year
+
+
+def save_json_files(all_data, output_dir, source, year):
+    """Shrani podatke v JSON datoteke (skupna datoteka in po lokacijah)"""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    all_data_file = output_path / f"Ozone_{year}_all_EEA.json"
+    write_json(all_data_file, {
+        "source": str(source),
+        "pollutant": "Ozone",
+        "year": year,
+        "total_measurements": len(all_data),
+        "data": all_data
+    })
+
+    print(f"Shranjeno: {all_data_file} ({len(all_data)} meritev)")
+
+    location_dir = output_path / f"po_lokacijah_{year}"
+    location_dir.mkdir(exist_ok=True)
+
+    location_data = {}
+    for measurement in all_data:
+        location_data.setdefault(measurement["location"], []).append(measurement)
+
+    for location, data in location_data.items():
+        safe_name = location.replace(" ", "_").replace("/", "_")
+        location_file = location_dir / f"{safe_name}.json"
+        write_json(location_file, {
+            "location": location,
+            "pollutant": "Ozone",
+            "year": year,
+            "total_measurements": len(data),
+            "data": sorted(data, key=lambda x: x["month"])
+        })
+
+        print(f"Shranjeno: {location_file} ({len(data)} meritev)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Izračuna mesečna preseganja ozona iz urnih podatkov EEA"
+    )
+    parser.add_argument(
+        "-i", "--input",
+        default="data/EEA_podatki/po_postajah",
+        help="Mapa z urnimi podatki EEA po postajah (privzeto: data/EEA_podatki/po_postajah)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="data/EEA_podatki/Ozon",
+        help="Izhodna mapa za JSON datoteke (privzeto: data/EEA_podatki/Ozon)"
+    )
+    parser.add_argument(
+        "-m", "--metadata",
+        default=f"data/{EEA_METADATA}",
+        help=f"Metapodatki postaj EEA z imeni lokacij ARSO (privzeto: data/{EEA_METADATA})"
+    )
+
+    args = parser.parse_args()
+
+    hourly = load_hourly_o3(args.input)
+    if hourly.empty:
+        print(f"Napaka: Ni najdenih urnih podatkov O3 v {Path(args.input).absolute()}!")
+        return
+
+    locations = station_locations(hourly.columns, args.metadata)
+    unmapped = [station for station, location in locations.items() if station == location]
+    if unmapped:
+        print(f"Opozorilo: postaje brez lokacije ARSO v {args.metadata}: {', '.join(unmapped)}")
+    hourly = hourly.rename(columns=locations)
+
+    print(f"Postaje: {len(hourly.columns)}, ure: {len(hourly)}")
+
+    by_year = to_measurements(monthly_exceedances(hourly))
+    for year, all_data in sorted(by_year.items()):
+        save_json_files(all_data, Path(args.output) / f"Ozone_{year}", args.input, year)
+
+
+if __name__ == "__main__":
+    main()
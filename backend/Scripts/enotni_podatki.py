@@ -0,0 +1,126 @@
+"""
+Nalaganje združenih dnevnih podatkov (ARSO, EEA in napovedi) v eno tabelo.
+Imena mest in onesnaževal normalizira enako kot backend/src/routes/csv.ts,
+tako da ima tabela enake vrstice kot UnifiedRow v backendu.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SOURCES = ["arso", "eea", "arso_forecast", "eea_forecast"]
+
+SOURCE_FILES = {
+    "arso": "ARSO_Daily.csv",
+    "eea": "EEA_Daily.csv",
+    "arso_forecast": "ARSO_daily_forecasts_2026.csv",
+    "eea_forecast": "EEA_daily_forecasts_2026.csv",
+}
+
+CITY_MAP = {
+    "Ljubljana Bežigrad": "Ljubljana",
+    "Ljubljana BF": "Ljubljana",
+    "Ljubljana Biotehniška fakulteta": "Ljubljana",
+    "Maribor center": "Maribor",
+    "Maribor Vrbanski plato": "Maribor",
+}
+
+UNIFIED_COLUMNS = ["date", "value", "city", "year", "pollutant", "month", "source", "station_id"]
+
+# Usklajeni podatki (uskladitev.py --mode mean): dan, povprečen iz več virov, ima
+# za vir seznam prispevajočih virov, združenih s "+" (npr. "arso+eea")
+SOURCE_SEPARATOR = "+"
+
+
+def norm_pollutant(raw):
+    """Normalizira oznako onesnaževala (enako kot normPollutant v csv.ts)"""
+    x0 = (raw or "").strip()
+    x = "".join(x0.upper().replace("₃", "3").replace("₂", "2").split())
+
+    if x in ("PM25", "PM2_5", "PM2,5", "PM2.5"):
+        return "PM2.5"
+    if x in ("PM10", "NO2", "CO2"):
+        return x
+    if x in ("O3", "OZONE"):
+        return "O3"
+    return x0
+
+
+def norm_city(raw):
+    """Normalizira ime mesta (enako kot normCity v csv.ts)"""
+    s = (raw or "").strip()
+    return CITY_MAP.get(s, s)
+
+
+def _normalize(series, func):
+    """Uporabi normalizacijo le na različnih vrednostih stolpca"""
+    series = series.fillna("").astype(str)
+    mapping = {value: func(value) for value in series.unique()}
+    return series.map(mapping)
+
+
+def _read_source(path, source):
+    """Prebere en CSV vir in ga pretvori v stolpce UnifiedRow"""
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+
+    if source == "arso":
+        # ARSO_Daily.csv: date,value,city,year,pollutant,month
+        df = pd.DataFrame({
+            "date": raw["date"].str.strip(),
+            "value": pd.to_numeric(raw["value"], errors="coerce"),
+            "city": _normalize(raw["city"], norm_city),
+            "year": pd.to_numeric(raw["year"], errors="coerce"),
+            "pollutant": _normalize(raw["pollutant"], norm_pollutant),
+            "month": pd.to_numeric(raw["month"], errors="coerce"),
+            "station_id": None,
+        })
+    elif source == "eea":
+        # EEA_Daily.csv: date,station_id,city,pollutant,value
+        df = pd.DataFrame({
+            "date": raw["date"].str.strip(),
+            "value": pd.to_numeric(raw["value"], errors="coerce"),
+            "city": _normalize(raw["city"], norm_city),
+            "pollutant": _normalize(raw["pollutant"], norm_pollutant),
+            "station_id": raw["station_id"].str.strip(),
+        })
+    else:
+        # napovedi: city,pollutant,date,forecast_value
+        df = pd.DataFrame({
+            "date": raw["date"].str.strip(),
+            "value": pd.to_numeric(raw["forecast_value"], errors="coerce"),
+            "city": _normalize(raw["city"], norm_city),
+            "pollutant": _normalize(raw["pollutant"], norm_pollutant),
+            "station_id": None,
+        })
+
+    if "year" not in df:
+        df["year"] = pd.to_numeric(df["date"].str.slice(0, 4), errors="coerce")
+        df["month"] = pd.to_numeric(df["date"].str.slice(5, 7), errors="coerce")
+
+    df["source"] = source
+    valid = (
+        (df["date"] != "") & (df["city"] != "") & (df["pollutant"] != "")
+        & np.isfinite(df["value"]) & np.isfinite(df["year"]) & np.isfinite(df["month"])
+    )
+    df = df[valid]
+    df = df.astype({"year": "int64", "month": "int64"})
+    return df[UNIFIED_COLUMNS]
+
+
+def load_unified_rows(data_dir="data", sources=None):
+    """Prebere dnevne CSV datoteke in vrne združeno tabelo s stolpci UnifiedRow.
+    Manjkajoče datoteke preskoči; vrne (tabela, opozorila)."""
+    sources = SOURCES if sources is None else sources
+    frames = []
+    warnings = []
+    for source in sources:
+        path = Path(data_dir) / SOURCE_FILES[source]
+        if not path.exists():
+            warnings.append(f"{SOURCE_FILES[source]} ni najden v {Path(data_dir)}")
+            continue
+        frames.append(_read_source(path, source))
+
+    if not frames:
+        return pd.DataFrame(columns=UNIFIED_COLUMNS), warnings
+    return pd.concat(frames, ignore_index=True), warnings
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Skripta za klimatologijo dnevnih koncentracij po dnevih v letu.
+Iz zgodovine ARSO in EEA za vsako serijo mesto x onesnaževalo x vir izračuna
+pasove percentilov (10/50/90), povprečje in standardni odklon za vsak dan v
+letu, pri čemer okno ±N dni teče krožno prek konca leta. Nato izračuna
+z-vrednosti odstopanj za vse dnevne meritve in za napovedi 2026. Za vsako
+onesnaževalo zapiše eno datoteko .npz, iz katere je odstopanje za izbran dan
+en dostop v tabelo.
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from enotni_podatki import load_unified_rows
+from prevzorcenje import EPOCH, to_dense
+
+DAYS_IN_YEAR = 366
+WINDOW_DAYS = 15
+MIN_SAMPLES = 10
+PERCENTILES = [10, 50, 90]
+FORECAST_BASE = {"arso_forecast": "arso", "eea_forecast": "eea"}
+
+
+def day_of_year(calendar):
+    """Indeks dneva v letu 0..365; v nenavadnih letih se dnevi od 1. marca zamaknejo za 1,
+    tako da ima vsak datum v vseh letih isti indeks (29. februar = 59)"""
+    years = calendar.astype("datetime64[Y]")
+    doy = (calendar - years).astype(np.int64)
+    year = years.astype(np.int64) + 1970
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return doy + ((~leap) & (doy >= 59))
+
+
+def by_year_and_day(matrix, calendar):
+    """Preoblikuje matriko (serije x dnevi) v tenzor (serije x leta x 366) z NaN za manjkajoče"""
+    years = calendar.astype("datetime64[Y]").astype(np.int64)
+    year_index = years - years.min()
+    tensor = np.full((matrix.shape[0], year_index.max() + 1, DAYS_IN_YEAR), np.nan)
+    tensor[:, year_index, day_of_year(calendar)] = matrix
+    return tensor
+
+
+def climatology(matrix, calendar, window=WINDOW_DAYS, min_samples=MIN_SAMPLES):
+    """Percentili, povprečje in odklon po dnevih v letu s krožnim oknom ±window dni.
+    Vrne slovar tabel oblike (serije x 366)."""
+    tensor = by_year_and_day(matrix, calendar)
+    # Vzorci za vsak dan: vsa leta in vsi zamiki znotraj okna (krožno prek 31. 12.)
+    samples = np.concatenate([np.roll(tensor, shift, axis=2) for shift in range(-window, window + 1)], axis=1)
+    count = np.isfinite(samples).sum(axis=1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        bands = np.nanpercentile(samples, PERCENTILES, axis=1)
+        result = {f"p{p}": band for p, band in zip(PERCENTILES, bands)}
+        result["mean"] = np.nanmean(samples, axis=1)
+        result["std"] = np.nanstd(samples, axis=1, ddof=1)
+
+    enough = count >= min_samples
+    for name, values in result.items():
+        result[name] = np.where(enough, values, np.nan)
+    result["count"] = count
+    return result
+
+
+def anomalies(matrix, calendar, clim, rows=None):
+    """z-vrednosti (x - povprečje dneva) / odklon dneva; rows izbere vrstico klimatologije za vsako serijo"""
+    rows = np.arange(matrix.shape[0]) if rows is None else rows
+    doy = day_of_year(calendar)
+    valid = rows >= 0
+    mean = np.where(valid[:, None], clim["mean"][np.maximum(rows, 0)][:, doy], np.nan)
+    std = np.where(valid[:, None], clim["std"][np.maximum(rows, 0)][:, doy], np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, (matrix - mean) / std, np.nan)
+
+
+def match_forecasts(forecast_series, clim_series):
+    """Za vsako serijo napovedi vrne vrstico klimatologije istega mesta in onesnaževala;
+    najprej istega vira (arso_forecast -> arso), sicer katerega koli, -1 če je ni"""
+    lookup = {(row.city, row.pollutant, row.source): i for i, row in enumerate(clim_series.itertuples())}
+    fallback = {}
+    for (city, pollutant, _), i in lookup.items():
+        fallback.setdefault((city, pollutant), i)
+    return np.array([
+        lookup.get((row.city, row.pollutant, FORECAST_BASE.get(row.source)),
+                   fallback.get((row.city, row.pollutant), -1))
+        for row in forecast_series.itertuples()
+    ], dtype=np.int64)
+
+
+def _keys(prefix, series):
+    return {f"{prefix}_{column}": np.array(series[column].astype(str), dtype=str) for column in series.columns}
+
+
+def save_pollutant(path, series, calendar, clim, anomaly, forecast=None):
+    """Shrani klimatologijo in odstopanja enega onesnaževala (float32)"""
+    arrays = {
+        **_keys("series", series),
+        **{name: values.astype(np.float32) for name, values in clim.items() if name != "count"},
+        "count": clim["count"].astype(np.int16),
+        "anomaly": anomaly.astype(np.float32),
+        "anomaly_start": np.int32((calendar[0] - EPOCH).astype(np.int64)),
+    }
+    if forecast is not None:
+        forecast_series, forecast_calendar, forecast_anomaly, forecast_rows = forecast
+        arrays.update({
+            **_keys("forecast", forecast_series),
+            "forecast_anomaly": forecast_anomaly.astype(np.float32),
+            "forecast_start": np.int32((forecast_calendar[0] - EPOCH).astype(np.int64)),
+            "forecast_climatology_row": forecast_rows,
+        })
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    return path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Izračuna klimatologijo po dnevih v letu in z-vrednosti odstopanj za meritve in napovedi"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument("-o", "--output", default="data/Climatology",
+                        help="Izhodna mapa (privzeto: data/Climatology)")
+    parser.add_argument("-w", "--window", type=int, default=WINDOW_DAYS,
+                        help="Polovična širina krožnega okna v dneh (privzeto: 15)")
+    parser.add_argument("--min-samples", type=int, default=MIN_SAMPLES,
+                        help="Najmanjše število vzorcev za dan v letu (privzeto: 10)")
+
+    args = parser.parse_args()
+
+    history, history_warnings = load_unified_rows(args.data, sources=["arso", "eea"])
+    forecasts, forecast_warnings = load_unified_rows(args.data, sources=list(FORECAST_BASE))
+    for warning in history_warnings + forecast_warnings:
+        print(f"Opozorilo: {warning}")
+    if history.empty:
+        print("Napaka: Ni dnevnih podatkov za klimatologijo!")
+        return
+
+    for pollutant, rows in history.groupby("pollutant"):
+        series, calendar, matrix = to_dense(rows)
+        clim = climatology(matrix, calendar, args.window, args.min_samples)
+        anomaly = anomalies(matrix, calendar, clim)
+
+        forecast = None
+        pollutant_forecasts = forecasts[forecasts["pollutant"] == pollutant]
+        if not pollutant_forecasts.empty:
+            forecast_series, forecast_calendar, forecast_matrix = to_dense(pollutant_forecasts)
+            forecast_rows = match_forecasts(forecast_series, series)
+            forecast = (forecast_series, forecast_calendar,
+                        anomalies(forecast_matrix, forecast_calendar, clim, forecast_rows), forecast_rows)
+
+        path = Path(args.output) / f"climatology_{pollutant}.npz"
+        size = save_pollutant(path, series, calendar, clim, anomaly, forecast)
+        matched = int((forecast[3] >= 0).sum()) if forecast else 0
+        print(f"Shranjeno: {path} ({len(series)} serij, napovedi z ujemanjem: {matched}, {size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Skripta za predizračun zmanjšanih serij za grafe (Largest-Triangle-Three-Buckets).
+Vsako dnevno serijo mesto x onesnaževalo x vir zmanjša na nekaj fiksnih
+ločljivosti (npr. 200, 1000 in 5000 točk), tako da odjemalec prenese le
+ločljivost, ki ustreza širini grafa. Algoritem teče hkrati za vse serije:
+zanka gre samo po vedrih, znotraj vedra so vse serije ena operacija NumPy.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from enotni_podatki import SOURCES, load_unified_rows
+from prevzorcenje import to_dense
+from serializacija import write_json
+
+RESOLUTIONS = [200, 1000, 5000]
+
+
+def compact_rows(matrix):
+    """Izmerjene točke vsake vrstice premakne na začetek.
+    Vrne (indeksi dni, vrednosti, števila točk); zapolnitev desno ponovi zadnjo točko."""
+    valid = np.isfinite(matrix)
+    counts = valid.sum(axis=1)
+    order = np.argsort(~valid, axis=1, kind="stable")
+    positions = np.arange(matrix.shape[1])
+    last = np.maximum(counts - 1, 0)[:, None]
+    order = np.take_along_axis(order, np.minimum(positions, last), axis=1)
+    return order, np.take_along_axis(matrix, order, axis=1), counts
+
+
+def lttb_indices(x, y, counts, threshold):
+    """Indeksi izbranih točk (serije x threshold) za poravnane tabele x in y.
+
+    Vrstica i ima counts[i] veljavnih točk na začetku; vrstice z največ threshold
+    točkami obdržijo vse točke. Neuporabljena mesta so -1."""
+    if threshold < 3:
+        # LTTB vedno obdrži prvo in zadnjo točko ter vsaj eno vedro med njima
+        raise ValueError(f"LTTB potrebuje vsaj 3 točke na serijo, podano: {threshold}")
+    series, length = x.shape
+    rows = np.arange(series)
+    selected = np.full((series, threshold), -1, dtype=np.int64)
+
+    short = counts <= threshold
+    keep = np.arange(threshold)[None, :] < counts[:, None]
+    selected[short] = np.where(keep[short], np.arange(threshold), -1)
+
+    active = ~short
+    if not active.any():
+        return selected
+    rows = rows[active]
+    x, y, n = x[active], y[active], counts[active]
+
+    # Kumulativne vsote za povprečja naslednjega vedra
+    zeros = np.zeros((len(rows), 1))
+    cum_x = np.hstack([zeros, np.cumsum(x, axis=1)])
+    cum_y = np.hstack([zeros, np.cumsum(y, axis=1)])
+
+    every = (n - 2) / (threshold - 2)
+    width = int(np.ceil(every.max())) + 1
+    offsets = np.arange(width)
+    local = np.arange(len(rows))
+
+    chosen = np.zeros((len(rows), threshold), dtype=np.int64)
+    chosen[:, -1] = n - 1
+    a = np.zeros(len(rows), dtype=np.int64)
+    for bucket in range(threshold - 2):
+        start = np.floor(bucket * every).astype(np.int64) + 1
+        end = np.floor((bucket + 1) * every).astype(np.int64) + 1
+        next_end = np.minimum(np.floor((bucket + 2) * every).astype(np.int64) + 1, n)
+        span = next_end - end
+        avg_x = (cum_x[local, next_end] - cum_x[local, end]) / span
+        avg_y = (cum_y[local, next_end] - cum_y[local, end]) / span
+
+        candidates = start[:, None] + offsets
+        inside = candidates < end[:, None]
+        candidates = np.minimum(candidates, length - 1)
+        ax, ay = x[local, a][:, None], y[local, a][:, None]
+        area = np.abs(
+            (ax - avg_x[:, None]) * (y[local[:, None], candidates] - ay)
+            - (ax - x[local[:, None], candidates]) * (avg_y[:, None] - ay)
+        )
+        area[~inside] = -1
+        a = candidates[local, np.argmax(area, axis=1)]
+        chosen[:, bucket + 1] = a
+
+    selected[rows] = chosen
+    return selected
+
+
+def downsample(calendar, matrix, threshold):
+    """Zmanjša vse vrstice goste matrike na največ threshold točk; vrne seznam (dnevi, vrednosti)"""
+    order, values, counts = compact_rows(matrix)
+    days = order.astype(float)
+    indices = lttb_indices(days, values, counts, threshold)
+
+    result = []
+    for row, row_indices in enumerate(indices):
+        row_indices = row_indices[row_indices >= 0]
+        result.append((calendar[order[row, row_indices]], values[row, row_indices]))
+    return result
+
+
+def save_resolution(path, series, sampled, threshold):
+    """Shrani eno ločljivost: za vsako serijo začetni datum, zamike v dneh in vrednosti"""
+    payload = []
+    for keys, (days, values) in zip(series.to_dict("records"), sampled):
+        if len(days) == 0:
+            continue
+        payload.append({
+            **keys,
+            "start": str(days[0]),
+            "t": (days - days[0]).astype(np.int64).tolist(),
+            "v": np.round(values, 2).tolist(),
+        })
+
+    return write_json(path, {"points": threshold, "series": payload}, mode="compact")
+
+
+def resolution(value):
+    """Tip argumenta --resolutions: celo število, vsaj 3"""
+    threshold = int(value)
+    if threshold < 3:
+        raise argparse.ArgumentTypeError(f"ločljivost mora biti vsaj 3 točke, podano: {value}")
+    return threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Predizračuna z LTTB zmanjšane dnevne serije za grafe pri več ločljivostih"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument("-o", "--output", default="data/LTTB", help="Izhodna mapa (privzeto: data/LTTB)")
+    parser.add_argument("-s", "--sources", nargs="+", choices=SOURCES, default=SOURCES,
+                        help="Viri podatkov (privzeto: vsi)")
+    parser.add_argument("-r", "--resolutions", nargs="+", type=resolution, default=RESOLUTIONS,
+                        help="Število točk na serijo (privzeto: 200 1000 5000)")
+
+    args = parser.parse_args()
+
+    rows, warnings = load_unified_rows(args.data, sources=args.sources)
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if rows.empty:
+        print("Napaka: Ni dnevnih podatkov!")
+        return
+
+    series, calendar, matrix = to_dense(rows)
+    print(f"Serije: {len(series)}, izmerjenih točk: {int(np.isfinite(matrix).sum())}")
+    for threshold in args.resolutions:
+        sampled = downsample(calendar, matrix, threshold)
+        path = Path(args.output) / f"lttb_{threshold}.json"
+        size = save_resolution(path, series, sampled, threshold)
+        print(f"Shranjeno: {path} ({sum(len(days) for days, _ in sampled)} točk, {size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,50 @@
-import pandas as pd
 import os
 import argparse
 from pathlib import Path
 
+from serializacija import MODES, dumps, write_bytes
+
 ''' This program converts all parquet files in a specified directory to JSON format. '''
 
-# Parse command line arguments
-parser = argparse.ArgumentParser(description='Convert parquet files to JSON')
-parser.add_argument('parquet_dir', help='Directory containing parquet files')
-parser.add_argument('output_dir', help='Directory to save JSON files')
-args = parser.parse_args()
-
-parquet_dir = args.parquet_dir
-output_dir = args.output_dir
-
-# Create output directory if it doesn't exist
-os.makedirs(output_dir, exist_ok=True)
-
-# Process all parquet files in the specified directory (not subdirectories)
-for parquet_file in Path(parquet_dir).glob("*.parquet"):
-    # Read parquet file
-    df = pd.read_parquet(parquet_file)
-    
-    # Create output filename
-    json_filename = parquet_file.stem + ".json"
-    json_path = os.path.join(output_dir, json_filename)
-    
-    # Write to JSON with ISO timestamps for any datetime columns
-    df.to_json(json_path, orient='records', indent=2, date_format='iso')
-    print(f"Converted: {parquet_file.name} → {json_filename}")  
\ No newline at end of file
+
+def parquet_to_json_bytes(df, json_format='compat'):
+    """Encode a DataFrame as a JSON list of records with ISO timestamps for any datetime columns"""
+    if json_format == 'compat':
+        return df.to_json(orient='records', indent=2, date_format='iso').encode('utf-8')
+    # Same ISO format as pandas (millisecond precision), then the fast encoder
+    for column in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+        df[column] = df[column].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3]
+    return dumps(df.astype(object).where(df.notna(), None).to_dict(orient='records'), json_format)
+
+
+def convert_directory(parquet_dir, output_dir, json_format='compat'):
+    """Convert every parquet file in parquet_dir (not subdirectories) to JSON in output_dir.
+    Returns the number of converted files."""
+    import pandas as pd
+
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    converted = 0
+    for parquet_file in Path(parquet_dir).glob("*.parquet"):
+        df = pd.read_parquet(parquet_file)
+        json_filename = parquet_file.stem + ".json"
+        write_bytes(os.path.join(output_dir, json_filename), parquet_to_json_bytes(df, json_format))
+        print(f"Converted: {parquet_file.name} → {json_filename}")
+        converted += 1
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert parquet files to JSON')
+    parser.add_argument('parquet_dir', help='Directory containing parquet files')
+    parser.add_argument('output_dir', help='Directory to save JSON files')
+    parser.add_argument('--json-format', choices=MODES, default='compat',
+                        help='compat (same bytes as pandas to_json), pretty or compact (default: compat)')
+    args = parser.parse_args()
+
+    convert_directory(args.parquet_dir, args.output_dir, args.json_format)
+
+
+if __name__ == "__main__":
+    main()
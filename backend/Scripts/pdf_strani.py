@@ -0,0 +1,73 @@
+"""
+Skupna obdelava strani PDF za ekstraktorje ARSO (PM10, PM2.5, ozon).
+Strani ene PDF datoteke se razdelijo na zaporedne razpone, vsak razpon pa
+obdela svoj proces z lastno instanco pdfplumber. Meritve se združijo v
+vrstnem redu strani, zato je rezultat enak kot pri zaporedni obdelavi.
+"""
+
+import os
+
+
+def _pdfplumber():
+    """Uvozi pdfplumber šele ob prvem odpiranju PDF, da je uvoz modula in --help hiter"""
+    try:
+        import pdfplumber
+    except ImportError:
+        print("Napaka: pdfplumber ni nameščen. Namesti z: pip install pdfplumber")
+        exit(1)
+    return pdfplumber
+
+
+def split_page_ranges(num_pages, workers):
+    """Razdeli strani na zaporedne razpone (začetek, konec) za posamezne procese"""
+    workers = max(1, min(workers, num_pages))
+    step, extra = divmod(num_pages, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        end = start + step + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_page_range(pdf_path, start, end, extract_page):
+    """Ekstrahira podatke iz strani [start, end) z lastno instanco pdfplumber.
+    extract_page(text, page_num, all_data) doda meritve ene strani v all_data."""
+    all_data = []
+
+    with _pdfplumber().open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages[start:end], start=start):
+            # Vedno uporabi ekstrakcijo iz besedila, ker so tabele v PDF-ju slabo strukturirane
+            text = page.extract_text()
+            if text:
+                extract_page(text, page_num, all_data)
+
+    return all_data
+
+
+def extract_pages(pdf_path, extract_page, workers=1):
+    """Ekstrahira podatke iz vseh strani; pri workers > 1 vsak proces obdela svoj razpon strani.
+    extract_page mora biti funkcija na ravni modula (ali functools.partial), da se prenese v proces."""
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        return extract_page_range(pdf_path, 0, None, extract_page)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _pdfplumber().open(pdf_path) as pdf:
+        num_pages = len(pdf.pages)
+
+    ranges = split_page_ranges(num_pages, workers)
+    all_data = []
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(extract_page_range, str(pdf_path), start, end, extract_page)
+            for start, end in ranges
+        ]
+        # Rezultate združi v vrstnem redu strani
+        for future in futures:
+            all_data.extend(future.result())
+    return all_data
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Skripta za binarni posnetek združenih dnevnih podatkov (UnifiedRow).
+Posnetek je stolpčna datoteka s fiksno širino stolpcev, slovarji nizov za
+mesta, onesnaževala, vire in postaje ter različico sheme, tako da ga backend
+ob zagonu preslika v pomnilnik namesto razčlenjevanja CSV datotek.
+
+Oblika datoteke:
+    8 bajtov   magično zaporedje b"AQSNAP\\0\\0"
+    uint32     različica sheme
+    uint32     dolžina glave v bajtih
+    glava      JSON (UTF-8): število vrstic, slovarji, stolpci z zamiki
+    stolpci    zaporedni bloki little-endian tipov, poravnani na 8 bajtov
+"""
+
+import os
+import json
+import struct
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enotni_podatki import SOURCES, load_unified_rows
+
+MAGIC = b"AQSNAP\0\0"
+SCHEMA_VERSION = 1
+ALIGNMENT = 8
+EPOCH = np.datetime64("1970-01-01", "D")
+
+# Stolpci posnetka; year in month se izpeljeta iz datuma ob branju
+COLUMNS = [
+    ("date", "<i4"),        # dnevi od 1970-01-01
+    ("value", "<f8"),
+    ("city", "<u2"),        # indeks v slovarju city
+    ("pollutant", "<u1"),   # indeks v slovarju pollutant
+    ("source", "<u1"),      # indeks v slovarju source
+    ("station_id", "<i2"),  # indeks v slovarju station_id, -1 = brez postaje
+]
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _encode(values, dictionary=None):
+    """Zakodira nize v indekse slovarja; vrne (kode, slovar)"""
+    if dictionary is None:
+        dictionary = sorted(v for v in pd.unique(values) if isinstance(v, str))
+    codes = pd.Categorical(values, categories=dictionary).codes
+    return codes, dictionary
+
+
+def build_columns(rows):
+    """Pretvori tabelo UnifiedRow v tipizirane stolpce in slovarje nizov"""
+    city, city_dict = _encode(rows["city"])
+    pollutant, pollutant_dict = _encode(rows["pollutant"])
+    source, source_dict = _encode(rows["source"], SOURCES)
+    station, station_dict = _encode(rows["station_id"])
+    dates = pd.to_datetime(rows["date"]).to_numpy().astype("datetime64[D]")
+
+    columns = {
+        "date": (dates - EPOCH).astype("<i4"),
+        "value": rows["value"].to_numpy(dtype="<f8"),
+        "city": city.astype("<u2"),
+        "pollutant": pollutant.astype("<u1"),
+        "source": source.astype("<u1"),
+        "station_id": station.astype("<i2"),
+    }
+    dictionaries = {
+        "city": city_dict,
+        "pollutant": pollutant_dict,
+        "source": list(source_dict),
+        "station_id": station_dict,
+    }
+    return columns, dictionaries
+
+
+def write_snapshot(rows, path):
+    """Zapiše posnetek prek začasne datoteke in vrne velikost v bajtih"""
+    columns, dictionaries = build_columns(rows)
+    num_rows = len(rows)
+
+    # Zamiki stolpcev so relativni na začetek podatkovnega dela za glavo
+    layout = []
+    offset = 0
+    for name, dtype in COLUMNS:
+        offset = _align(offset)
+        layout.append({"name": name, "dtype": dtype, "offset": offset})
+        offset += num_rows * np.dtype(dtype).itemsize
+
+    header = json.dumps({
+        "schema_version": SCHEMA_VERSION,
+        "rows": num_rows,
+        "date_epoch": "1970-01-01",
+        "dictionaries": dictionaries,
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", SCHEMA_VERSION, len(header)))
+        f.write(header)
+        for column in layout:
+            f.write(b"\0" * (data_start + column["offset"] - f.tell()))
+            f.write(columns[column["name"]].tobytes())
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def read_snapshot(path):
+    """Preslika posnetek v pomnilnik; vrne (glava, slovar stolpcev numpy) brez kopiranja podatkov"""
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} ni posnetek AQSNAP")
+    version, header_length = struct.unpack("<II", bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Nepodprta različica sheme posnetka: {version} (pričakovana {SCHEMA_VERSION})")
+
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[header_start:header_start + header_length]).decode("utf-8"))
+    data_start = _align(header_start + header_length)
+
+    columns = {}
+    for column in header["columns"]:
+        start = data_start + column["offset"]
+        dtype = np.dtype(column["dtype"])
+        columns[column["name"]] = buffer[start:start + header["rows"] * dtype.itemsize].view(dtype)
+    return header, columns
+
+
+def snapshot_to_frame(header, columns):
+    """Pretvori posnetek nazaj v tabelo UnifiedRow (za preverjanje in analize)"""
+    dictionaries = header["dictionaries"]
+    dates = EPOCH + columns["date"].astype("timedelta64[D]")
+    stations = np.asarray(dictionaries["station_id"] + [None], dtype=object)
+    return pd.DataFrame({
+        "date": np.datetime_as_string(dates, unit="D"),
+        "value": np.asarray(columns["value"]),
+        "city": np.asarray(dictionaries["city"], dtype=object)[columns["city"]],
+        "year": dates.astype("datetime64[Y]").astype(int) + 1970,
+        "pollutant": np.asarray(dictionaries["pollutant"], dtype=object)[columns["pollutant"]],
+        "month": dates.astype("datetime64[M]").astype(int) % 12 + 1,
+        "source": np.asarray(dictionaries["source"], dtype=object)[columns["source"]],
+        # object kot v load_unified_rows, da postaje brez oznake ostanejo None in ne NaN
+        "station_id": pd.Series(stations[columns["station_id"]], dtype=object),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Zapiše binarni stolpčni posnetek združenih dnevnih podatkov"
+    )
+    parser.add_argument(
+        "-d", "--data",
+        default="data",
+        help="Mapa s CSV podatki (privzeto: data)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="data/Unified_snapshot.aqs",
+        help="Izhodna datoteka posnetka (privzeto: data/Unified_snapshot.aqs)"
+    )
+
+    args = parser.parse_args()
+
+    rows, warnings = load_unified_rows(args.data)
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if rows.empty:
+        print("Napaka: Ni podatkov za posnetek!")
+        return
+
+    size = write_snapshot(rows, args.output)
+    print(f"Shranjeno: {args.output} ({len(rows)} vrstic, {size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
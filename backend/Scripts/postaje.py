@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Register merilnih postaj s prostorskim indeksom.
+Postaje ARSO (seznami iz ekstraktorjev), WAQI (koordinate iz arhiva posnetkov)
+in EEA (oznake Samplingpoint, koordinate iz data/EEA_postaje.csv) združi v eno
+tabelo s koordinatami. Če postaja EEA iz podatkov nima koordinat, se gradnja
+ustavi z napako, da indeks ne ostane tiho samo z postajami ARSO. Nad koordinatami zgradi KD-drevo v
+enotskih vektorjih na krogli: tetiva med točkama je monotona v razdalji po
+krogli (haversine), zato drevo vrača natančne razdalje v km. Poizvedbi
+nearest(lat, lon, k) in within(lat, lon, km) sprejmeta sezname točk.
+Indeks se shrani v .npz in se ob nalaganju ne gradi znova.
+"""
+
+import re
+import sys
+import heapq
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enotni_podatki import norm_city
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 8
+
+# Približne koordinate postaj ARSO iz seznamov v ekstraktorjih (WGS84)
+ARSO_STATIONS = {
+    "Ljubljana Bežigrad": (46.0655, 14.5124),
+    # V poročilih PM10 se ista postaja imenuje "Ljubljana BF"
+    "Ljubljana Biotehniška fakulteta": (46.0495, 14.4695),
+    "Maribor center": (46.5590, 15.6455),
+    "Maribor Vrbanski plato": (46.5679, 15.6253),
+    "Celje": (46.2362, 15.2653),
+    "Kranj": (46.2452, 14.3560),
+    "Novo mesto": (45.8022, 15.1716),
+    "Murska Sobota": (46.6523, 16.1913),
+    "Nova Gorica": (45.9560, 13.6508),
+    "Koper": (45.5431, 13.7314),
+    "Trbovlje": (46.1553, 15.0519),
+    "Zagorje": (46.1311, 14.9961),
+    "Hrastnik": (46.1425, 15.0819),
+    "Velenje": (46.3594, 15.1106),
+    "Iskrba": (45.5647, 14.8631),
+    "Žerjav": (46.4756, 14.8690),
+    "Otlica": (45.9339, 13.9108),
+    "Krvavec": (46.2972, 14.5386),
+}
+
+REGISTRY_COLUMNS = ["id", "name", "source", "city", "lat", "lon"]
+EEA_METADATA = "EEA_postaje.csv"
+_EEA_STATION = re.compile(r"(SI\d{4}[A-Z])")
+
+
+def to_unit_vectors(lat, lon):
+    """Geografske koordinate v stopinjah v enotske vektorje (n x 3)"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.asarray(chord) / 2, 1.0))
+
+
+def km_to_chord(km):
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype=float) / (2 * EARTH_RADIUS_KM), np.pi / 2))
+
+
+def arso_stations():
+    return pd.DataFrame([
+        {"id": f"arso:{name}", "name": name, "source": "arso", "city": norm_city(name), "lat": lat, "lon": lon}
+        for name, (lat, lon) in ARSO_STATIONS.items()
+    ], columns=REGISTRY_COLUMNS)
+
+
+def waqi_stations(archive_dir):
+    """Postaje iz arhiva posnetkov WAQI (zadnje znane koordinate za vsak uid)"""
+    files = sorted(Path(archive_dir).glob("date=*/hour=*.parquet"))
+    if not files:
+        return pd.DataFrame(columns=REGISTRY_COLUMNS)
+    snapshots = pd.concat(
+        [pd.read_parquet(f, columns=["fetched_at", "uid", "station", "lat", "lon"]) for f in files],
+        ignore_index=True,
+    )
+    latest = snapshots.sort_values("fetched_at").drop_duplicates("uid", keep="last")
+    # Imena WAQI so oblike "Postaja, Mesto, Slovenia"
+    city = latest["station"].str.replace(r",\s*Slovenia$", "", regex=True).str.split(",").str[-1].str.strip()
+    return pd.DataFrame({
+        "id": "waqi:" + latest["uid"].astype(str),
+        "name": latest["station"],
+        "source": "waqi",
+        "city": city.map(norm_city),
+        "lat": latest["lat"].astype(float),
+        "lon": latest["lon"].astype(float),
+    })[REGISTRY_COLUMNS]
+
+
+def eea_code(name):
+    """Oznaka postaje EEA iz imena datoteke ali Samplingpoint (SPO-SI0002A_00005_101 -> SI0002A); None, če je ni"""
+    match = _EEA_STATION.search(name)
+    return match.group(1) if match else None
+
+
+def eea_station_codes(eea_dirs):
+    """Oznake postaj EEA iz imen datotek v mapah"""
+    codes = {eea_code(json_file.stem) for eea_dir in eea_dirs for json_file in Path(eea_dir).glob("*.json")}
+    return sorted(codes - {None})
+
+
+def read_eea_metadata(path):
+    """Metapodatki postaj EEA (station,name,lat,lon,location); location je ime lokacije ARSO"""
+    meta = pd.read_csv(path, dtype={"station": str, "name": str, "location": str})
+    if "location" not in meta.columns:
+        meta["location"] = np.nan
+    return meta[["station", "name", "lat", "lon", "location"]]
+
+
+def eea_stations(eea_dirs, metadata=None, mapping=None):
+    """Postaje EEA iz imen datotek; koordinate, imena in lokacije ARSO iz CSV metadata,
+    mesto iz station_mapping.csv ali iz lokacije ARSO"""
+    codes = eea_station_codes(eea_dirs)
+    if not codes:
+        return pd.DataFrame(columns=REGISTRY_COLUMNS)
+
+    stations = pd.DataFrame({"station": codes})
+    if metadata and Path(metadata).exists():
+        stations = stations.merge(read_eea_metadata(metadata), on="station", how="left")
+    else:
+        stations = stations.assign(name=stations["station"], lat=np.nan, lon=np.nan, location=np.nan)
+
+    cities = {}
+    if mapping and Path(mapping).exists():
+        table = pd.read_csv(mapping, dtype=str)
+        table = table[table["source"] == "eea"]
+        cities = dict(zip(table["station"], table["city"]))
+
+    return pd.DataFrame({
+        "id": "eea:" + stations["station"],
+        "name": stations["name"].fillna(stations["station"]),
+        "source": "eea",
+        "city": stations["station"].map(cities).fillna(stations["location"].map(norm_city, na_action="ignore")),
+        "lat": stations["lat"],
+        "lon": stations["lon"],
+    })[REGISTRY_COLUMNS]
+
+
+def unlocated(registry, source="eea"):
+    """Oznake postaj vira brez koordinat"""
+    rows = registry[(registry["source"] == source) & registry[["lat", "lon"]].isna().any(axis=1)]
+    return [station_id.split(":", 1)[1] for station_id in rows["id"]]
+
+
+class KDTree:
+    """KD-drevo nad točkami v R^3 z listi do LEAF_SIZE točk.
+
+    Vozlišča so shranjena v tabelah (začetek in konec v permutaciji točk,
+    levi in desni otrok, omejujoči kvader), tako da se drevo lahko shrani v
+    .npz in naloži brez ponovne gradnje."""
+
+    def __init__(self, points, leaf_size=LEAF_SIZE, nodes=None):
+        self.points = np.asarray(points, dtype=float)
+        if nodes is not None:
+            self.order, self.start, self.end, self.left, self.right, self.lo, self.hi = nodes
+            return
+
+        order = np.arange(len(self.points))
+        start, end, left, right, lo, hi = [], [], [], [], [], []
+        stack = [(0, len(order), -1, False)]
+        while stack:
+            s, e, parent, is_right = stack.pop()
+            node = len(start)
+            block = self.points[order[s:e]]
+            start.append(s)
+            end.append(e)
+            left.append(-1)
+            right.append(-1)
+            lo.append(block.min(axis=0) if e > s else np.zeros(3))
+            hi.append(block.max(axis=0) if e > s else np.zeros(3))
+            if parent >= 0:
+                (right if is_right else left)[parent] = node
+
+            if e - s > leaf_size:
+                dim = int(np.argmax(hi[-1] - lo[-1]))
+                mid = (e - s) // 2
+                order[s:e] = order[s:e][np.argpartition(block[:, dim], mid)]
+                stack.append((s + mid, e, node, True))
+                stack.append((s, s + mid, node, False))
+
+        self.order = order
+        self.start, self.end = np.array(start), np.array(end)
+        self.left, self.right = np.array(left), np.array(right)
+        self.lo, self.hi = np.array(lo), np.array(hi)
+
+    def _box_distance2(self, node, q):
+        d = np.maximum(self.lo[node] - q, 0) + np.maximum(q - self.hi[node], 0)
+        return float(d @ d)
+
+    def _leaf(self, node):
+        idx = self.order[self.start[node]:self.end[node]]
+        return idx, self.points[idx]
+
+    def query(self, q, k):
+        """k najbližjih točk točke q; vrne (razdalje, indeksi) urejeno po razdalji"""
+        if k <= 0 or len(self.points) == 0:
+            return np.array([]), np.array([], dtype=np.int64)
+        best = []  # kopica (-razdalja², indeks)
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if len(best) == k and self._box_distance2(node, q) > -best[0][0]:
+                continue
+            if self.left[node] < 0:
+                idx, pts = self._leaf(node)
+                for i, d2 in zip(idx, ((pts - q) ** 2).sum(axis=1)):
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, i))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, i))
+                continue
+            near, far = self.left[node], self.right[node]
+            if self._box_distance2(far, q) < self._box_distance2(near, q):
+                near, far = far, near
+            stack.append(far)
+            stack.append(near)
+
+        best.sort(reverse=True)
+        return np.sqrt([-d2 for d2, _ in best]), np.array([i for _, i in best], dtype=np.int64)
+
+    def query_radius(self, q, r):
+        """Indeksi vseh točk znotraj razdalje r od q, urejeni po razdalji; vrne (razdalje, indeksi)"""
+        r2 = r * r
+        found_idx, found_d2 = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance2(node, q) > r2:
+                continue
+            if self.left[node] < 0:
+                idx, pts = self._leaf(node)
+                d2 = ((pts - q) ** 2).sum(axis=1)
+                found_idx.append(idx[d2 <= r2])
+                found_d2.append(d2[d2 <= r2])
+                continue
+            stack.append(self.right[node])
+            stack.append(self.left[node])
+
+        if not found_idx:
+            return np.array([]), np.array([], dtype=np.int64)
+        idx, d2 = np.concatenate(found_idx), np.concatenate(found_d2)
+        order = np.argsort(d2, kind="stable")
+        return np.sqrt(d2[order]), idx[order]
+
+
+class StationIndex:
+    """Register postaj s KD-drevesom; poizvedbe sprejmejo skalarje ali sezname koordinat"""
+
+    def __init__(self, registry, tree=None):
+        self.registry = registry.reset_index(drop=True)
+        located = self.registry[["lat", "lon"]].notna().all(axis=1).to_numpy()
+        self.located = np.flatnonzero(located)
+        if tree is None:
+            points = to_unit_vectors(self.registry["lat"].to_numpy()[located],
+                                     self.registry["lon"].to_numpy()[located])
+            tree = KDTree(points.reshape(-1, 3))
+        self.tree = tree
+
+    def nearest(self, lat, lon, k=1):
+        """k najbližjih postaj za vsako točko; vrne (razdalje v km, indeksi v registru), oblike (n, k)"""
+        queries = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        k = min(k, len(self.located))
+        distances = np.empty((len(queries), k))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        for row, q in enumerate(queries):
+            chord, idx = self.tree.query(q, k)
+            distances[row] = chord_to_km(chord)
+            indices[row] = self.located[idx]
+        return distances, indices
+
+    def within(self, lat, lon, km):
+        """Postaje v polmeru km od vsake točke; vrne seznam parov (razdalje v km, indeksi v registru)"""
+        queries = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        radius = float(km_to_chord(km))
+        results = []
+        for q in queries:
+            chord, idx = self.tree.query_radius(q, radius)
+            results.append((chord_to_km(chord), self.located[idx]))
+        return results
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tree = self.tree
+        np.savez(
+            path,
+            **{f"registry_{column}": np.array(self.registry[column].astype(str), dtype=str)
+               for column in ["id", "name", "source", "city"]},
+            lat=self.registry["lat"].to_numpy(dtype=float),
+            lon=self.registry["lon"].to_numpy(dtype=float),
+            points=tree.points, order=tree.order, start=tree.start, end=tree.end,
+            left=tree.left, right=tree.right, lo=tree.lo, hi=tree.hi,
+        )
+        return path.stat().st_size
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            registry = pd.DataFrame({
+                column: data[f"registry_{column}"] for column in ["id", "name", "source", "city"]
+            })
+            registry["city"] = registry["city"].replace("nan", np.nan)
+            registry["lat"], registry["lon"] = data["lat"], data["lon"]
+            nodes = tuple(data[name] for name in ["order", "start", "end", "left", "right", "lo", "hi"])
+            tree = KDTree(data["points"], nodes=nodes)
+        return cls(registry, tree)
+
+
+def build_registry(data_dir, eea_metadata=None):
+    data_dir = Path(data_dir)
+    frames = [
+        arso_stations(),
+        waqi_stations(data_dir / "WAQI_arhiv"),
+        eea_stations(
+            [data_dir / "EEA_historical_data", data_dir / "EEA_podatki" / "po_postajah"],
+            metadata=eea_metadata or data_dir / EEA_METADATA,
+            mapping=data_dir / "station_mapping.csv",
+        ),
+    ]
+    return pd.concat([frame for frame in frames if not frame.empty], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Zgradi register postaj ARSO, WAQI in EEA s prostorskim indeksom"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s podatki (privzeto: data)")
+    parser.add_argument(
+        "-o", "--output",
+        default="data/station_index.npz",
+        help="Izhodna datoteka indeksa (privzeto: data/station_index.npz)"
+    )
+    parser.add_argument("--eea-metadata",
+                        help="CSV s stolpci station,name,lat,lon,location za postaje EEA (privzeto: data/EEA_postaje.csv)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Zgradi indeks tudi, če postaje EEA iz podatkov nimajo koordinat")
+    parser.add_argument("--nearest", nargs=2, type=float, metavar=("LAT", "LON"),
+                        help="Po gradnji izpiši najbližje postaje tej točki")
+    parser.add_argument("-k", type=int, default=3, help="Število najbližjih postaj (privzeto: 3)")
+
+    args = parser.parse_args()
+
+    registry = build_registry(args.data, args.eea_metadata)
+    missing = unlocated(registry)
+    if missing:
+        metadata = args.eea_metadata or Path(args.data) / EEA_METADATA
+        print(f"{'Opozorilo' if args.allow_missing else 'Napaka'}: {len(missing)} postaj EEA nima koordinat "
+              f"v {metadata}: {', '.join(missing)}")
+        if not args.allow_missing:
+            print("Dodaj jih v metapodatke (station,name,lat,lon,location) ali zaženi z --allow-missing")
+            sys.exit(1)
+    index = StationIndex(registry)
+    size = index.save(args.output)
+
+    counts = registry.groupby("source").agg(total=("id", "size"), located=("lat", "count"))
+    for source, row in counts.iterrows():
+        print(f"{source}: {row['total']} postaj, {row['located']} s koordinatami")
+    print(f"Shranjeno: {args.output} ({size / 1024:.1f} KiB)")
+
+    if args.nearest:
+        distances, indices = index.nearest(*args.nearest, k=args.k)
+        for distance, i in zip(distances[0], indices[0]):
+            station = registry.iloc[i]
+            print(f"  {station['name']} ({station['source']}): {distance:.1f} km")
+
+
+if __name__ == "__main__":
+    main()
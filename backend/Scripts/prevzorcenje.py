@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Skripta za prevzorčenje dnevnih podatkov na skupni koledar.
+Poljubno podmnožico združenih dnevnih podatkov (UnifiedRow) pretvori v gosto
+matriko serije x dnevi, kjer manjkajoči dnevi niso izpuščeni, ampak NaN.
+Vrzeli lahko zapolni z linearno interpolacijo (do N dni) in s sezonskimi
+povprečji. Vse operacije delujejo nad celotno matriko hkrati.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enotni_podatki import SOURCES, load_unified_rows
+
+SERIES_KEYS = ["city", "pollutant", "source"]
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def to_dense(rows, keys=SERIES_KEYS, start=None, end=None):
+    """Pretvori vrstice v gosto matriko (serije x dnevi).
+
+    Vrne (serije, koledar, matrika): serije je DataFrame s stolpci keys (ena vrstica
+    na serijo), koledar je tabela datetime64[D] in matrika float64 z NaN za
+    manjkajoče dni. Več vrednosti istega dne v isti seriji se povpreči."""
+    dates = pd.to_datetime(rows["date"]).to_numpy().astype("datetime64[D]")
+    start = dates.min() if start is None else np.datetime64(start, "D")
+    end = dates.max() if end is None else np.datetime64(end, "D")
+    calendar = np.arange(start, end + 1, dtype="datetime64[D]")
+
+    inside = (dates >= start) & (dates <= end)
+    rows = rows[inside]
+    day = (dates[inside] - start).astype(np.int64)
+
+    series_index, series = pd.MultiIndex.from_frame(rows[list(keys)]).factorize(sort=True)
+    series = pd.DataFrame(list(series), columns=list(keys))
+
+    # Vsote in števci po celicah, nato povprečje; brez zank po serijah
+    shape = (len(series), len(calendar))
+    flat = series_index * len(calendar) + day
+    sums = np.bincount(flat, weights=rows["value"].to_numpy(dtype=float), minlength=shape[0] * shape[1])
+    counts = np.bincount(flat, minlength=shape[0] * shape[1])
+    with np.errstate(invalid="ignore"):
+        matrix = (sums / counts).reshape(shape)
+    return series, calendar, matrix
+
+
+def interpolate_linear(matrix, max_gap):
+    """Linearno zapolni notranje vrzeli, dolge največ max_gap dni; daljše vrzeli in robovi ostanejo NaN"""
+    valid = np.isfinite(matrix)
+    positions = np.arange(matrix.shape[1])
+
+    # Indeks zadnje veljavne vrednosti levo in prve desno od vsake celice
+    prev_index = np.maximum.accumulate(np.where(valid, positions, -1), axis=1)
+    next_index = np.minimum.accumulate(np.where(valid, positions, matrix.shape[1])[:, ::-1], axis=1)[:, ::-1]
+
+    gap = next_index - prev_index - 1
+    fill = ~valid & (prev_index >= 0) & (next_index < matrix.shape[1]) & (gap <= max_gap)
+
+    rows = np.arange(matrix.shape[0])[:, None]
+    left = matrix[rows, np.clip(prev_index, 0, matrix.shape[1] - 1)]
+    right = matrix[rows, np.clip(next_index, 0, matrix.shape[1] - 1)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = (positions - prev_index) / (next_index - prev_index)
+        interpolated = left + (right - left) * weight
+    return np.where(fill, interpolated, matrix)
+
+
+def seasonal_fill(matrix, calendar, season="month"):
+    """Zapolni preostale NaN s povprečjem serije za isti mesec (season="month")
+    ali isti dan v letu (season="doy") prek vseh let"""
+    if season == "month":
+        season_index = calendar.astype("datetime64[M]").astype(np.int64) % 12
+        seasons = 12
+    elif season == "doy":
+        season_index = (calendar - calendar.astype("datetime64[Y]")).astype(np.int64)
+        seasons = 366
+    else:
+        raise ValueError(f"Neznana sezona: {season}")
+
+    valid = np.isfinite(matrix)
+    sums = np.zeros((matrix.shape[0], seasons))
+    counts = np.zeros((matrix.shape[0], seasons))
+    np.add.at(sums.T, season_index, np.where(valid, matrix, 0).T)
+    np.add.at(counts.T, season_index, valid.T)
+    with np.errstate(invalid="ignore"):
+        means = sums / counts
+    return np.where(valid, matrix, means[:, season_index])
+
+
+def fill_gaps(matrix, calendar, max_gap=0, seasonal=None):
+    """Zapolnjevanje vrzeli: najprej linearna interpolacija, nato po želji sezonska povprečja"""
+    if max_gap > 0:
+        matrix = interpolate_linear(matrix, max_gap)
+    if seasonal:
+        matrix = seasonal_fill(matrix, calendar, seasonal)
+    return matrix
+
+
+def save_dense(path, series, calendar, matrix, observed=None):
+    """Shrani gosto matriko v stisnjeno datoteko .npz.
+
+    Vrednosti so float32, koledar je podan z začetnim dnem in številom dni,
+    maska izmerjenih (nezapolnjenih) celic pa je zapisana po bitih."""
+    observed = np.isfinite(matrix) if observed is None else observed
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        values=matrix.astype(np.float32),
+        observed=np.packbits(observed, axis=1),
+        start=np.int32((calendar[0] - EPOCH).astype(np.int64)),
+        days=np.int32(len(calendar)),
+        keys=np.array(list(series.columns), dtype=str),
+        **{f"key_{column}": np.array(series[column].astype(str), dtype=str) for column in series.columns},
+    )
+    return path.stat().st_size
+
+
+def load_dense(path):
+    """Prebere datoteko iz save_dense; vrne (serije, koledar, matrika, izmerjeno)"""
+    with np.load(path) as data:
+        days = int(data["days"])
+        calendar = EPOCH + int(data["start"]) + np.arange(days)
+        series = pd.DataFrame({column: data[f"key_{column}"] for column in data["keys"].tolist()})
+        observed = np.unpackbits(data["observed"], axis=1, count=days).astype(bool)
+        return series, calendar, data["values"].astype(np.float64), observed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prevzorči dnevne podatke na skupni koledar in zapolni vrzeli"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument(
+        "-o", "--output",
+        default="data/Daily_dense.npz",
+        help="Izhodna datoteka .npz (privzeto: data/Daily_dense.npz)"
+    )
+    parser.add_argument("-s", "--sources", nargs="+", choices=SOURCES, default=["arso", "eea"],
+                        help="Viri podatkov (privzeto: arso eea)")
+    parser.add_argument("-p", "--pollutant", nargs="+", help="Samo izbrana onesnaževala (npr. PM10 O3)")
+    parser.add_argument("-c", "--city", nargs="+", help="Samo izbrana mesta")
+    parser.add_argument("--start", help="Začetni dan koledarja (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Zadnji dan koledarja (YYYY-MM-DD)")
+    parser.add_argument("--max-gap", type=int, default=0,
+                        help="Največja dolžina vrzeli v dneh za linearno interpolacijo (privzeto: 0 = brez)")
+    parser.add_argument("--seasonal", choices=["month", "doy"],
+                        help="Preostale vrzeli zapolni s povprečjem meseca ali dneva v letu")
+
+    args = parser.parse_args()
+
+    rows, warnings = load_unified_rows(args.data, sources=args.sources)
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if args.pollutant:
+        rows = rows[rows["pollutant"].isin(args.pollutant)]
+    if args.city:
+        rows = rows[rows["city"].isin(args.city)]
+    if rows.empty:
+        print("Napaka: Ni podatkov za izbrane filtre!")
+        return
+
+    series, calendar, matrix = to_dense(rows, start=args.start, end=args.end)
+    observed = np.isfinite(matrix)
+    matrix = fill_gaps(matrix, calendar, args.max_gap, args.seasonal)
+
+    size = save_dense(args.output, series, calendar, matrix, observed)
+    print(f"Serije: {len(series)}, dnevi: {len(calendar)} ({calendar[0]} - {calendar[-1]})")
+    print(f"Izmerjeno: {observed.mean() * 100:.1f} %, po zapolnjevanju: {np.isfinite(matrix).mean() * 100:.1f} %")
+    print(f"Shranjeno: {args.output} ({size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
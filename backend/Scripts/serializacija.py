@@ -0,0 +1,103 @@
+"""
+Skupno zapisovanje in branje JSON za skripte v backend/Scripts.
+Hiter kodirnik (orjson ali msgspec) se uporabi, če je nameščen, sicer
+standardna knjižnica json. Načini zapisa:
+    compat   bajtno enako kot json.dump(..., ensure_ascii=False, indent=2)
+    pretty   zamik 2 presledka s hitrim kodirnikom (lahko se razlikuje v zapisu števil)
+    compact  brez presledkov, najmanjše datoteke
+Datoteke se zapišejo atomarno: najprej v začasno datoteko, nato preimenovanje.
+"""
+
+import os
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+
+MODES = ["compat", "pretty", "compact"]
+DEFAULT_MODE = "compat"
+
+
+def _default(obj):
+    """Pretvorba tipov, ki jih kodirniki ne poznajo (numpy skalarji, poti, datumi)"""
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Tipa {type(obj).__name__} ni mogoče zapisati v JSON")
+
+
+def dumps(obj, mode=None, backend=None):
+    """Zakodira obj v bajte UTF-8 v izbranem načinu"""
+    mode = mode or DEFAULT_MODE
+    backend = backend or BACKEND
+    if mode not in MODES:
+        raise ValueError(f"Neznan način zapisa JSON: {mode}")
+
+    if mode == "compat" or backend == "json":
+        if mode == "compact":
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+        return text.encode("utf-8")
+
+    if backend == "orjson":
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if mode == "pretty":
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    encoded = msgspec.json.encode(obj, enc_hook=_default)
+    return msgspec.json.format(encoded, indent=2) if mode == "pretty" else encoded
+
+
+def loads(data):
+    """Razčleni JSON iz bajtov ali niza"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def write_bytes(path, content):
+    """Atomarno zapiše bajte: začasna datoteka v isti mapi in os.replace; vrne velikost"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return len(content)
+
+
+def write_json(path, obj, mode=None):
+    """Zapiše obj v datoteko JSON (atomarno); vrne velikost v bajtih"""
+    return write_bytes(path, dumps(obj, mode))
+
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def set_default_mode(mode):
+    """Nastavi privzeti način za klice brez izrecnega načina (npr. iz argumenta ukazne vrstice)"""
+    global DEFAULT_MODE
+    if mode not in MODES:
+        raise ValueError(f"Neznan način zapisa JSON: {mode}")
+    DEFAULT_MODE = mode
@@ -0,0 +1,145 @@
+"""
+Testi cevovoda na majhni verigi v začasni mapi: vrstni red odvisnosti,
+zaznavanje zastarelih stopenj (vhodi, skripta, uvoženi lokalni moduli, izhodi),
+predpomnilnik izhodov in preskok stopenj za neuspešno odvisnostjo.
+"""
+
+from graphlib import TopologicalSorter
+
+import pytest
+
+import cevovod
+
+SCRIPTS = {
+    "pomoc.py": "FACTOR = 2\n",
+    "prvi.py": (
+        "from pathlib import Path\n"
+        "Path('data/vmesni.txt').write_text(Path('data/vhod.txt').read_text().upper())\n"
+    ),
+    "drugi.py": (
+        "from pathlib import Path\n"
+        "def main():\n"
+        "    import pomoc\n"
+        "    text = Path('data/vmesni.txt').read_text()\n"
+        "    Path('data/izhod').mkdir(exist_ok=True)\n"
+        "    Path('data/izhod/rezultat.txt').write_text(text * pomoc.FACTOR)\n"
+        "main()\n"
+    ),
+    "napaka.py": "raise SystemExit(3)\n",
+}
+
+STAGES = [
+    {"name": "drugi", "script": "drugi.py", "args": [], "inputs": ["data/vmesni.txt"],
+     "outputs": ["data/izhod/*.txt"]},
+    {"name": "prvi", "script": "prvi.py", "args": [], "inputs": ["data/vhod.txt"],
+     "outputs": ["data/vmesni.txt"]},
+]
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    scripts = tmp_path / "Scripts"
+    scripts.mkdir()
+    for name, source in SCRIPTS.items():
+        (scripts / name).write_text(source, encoding="utf-8")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "vhod.txt").write_text("abc", encoding="utf-8")
+    monkeypatch.setattr(cevovod, "SCRIPTS_DIR", scripts)
+    monkeypatch.setattr(cevovod, "BACKEND_DIR", tmp_path)
+    return tmp_path
+
+
+def run(stages=STAGES, **kwargs):
+    results = cevovod.run_pipeline(stages, jobs=2, **kwargs)
+    return {result["name"]: (result["status"], result["reason"]) for result in results}
+
+
+def test_graph_follows_inputs_and_outputs():
+    graph = cevovod.build_graph(STAGES)
+
+    assert graph == {"drugi": {"prvi"}, "prvi": set()}
+    assert list(TopologicalSorter(graph).static_order()) == ["prvi", "drugi"]
+
+
+def test_default_stages_form_a_valid_graph():
+    stages = cevovod.build_stages()
+    graph = cevovod.build_graph(stages)
+    order = list(TopologicalSorter(graph).static_order())
+
+    for name, dependencies in graph.items():
+        assert all(order.index(dependency) < order.index(name) for dependency in dependencies)
+    assert graph["daily_csv"] >= {"arso_pm10", "arso_pm25"}
+    for name in ["reconcile", "snapshot", "trends", "dense", "lttb", "climatology", "health"]:
+        assert {"daily_csv", "validate"} <= graph[name]
+    assert "reconcile" in graph["stations"]
+    # Indeks postaj čaka na koordinate vseh postaj EEA in ni v privzetem zagonu
+    assert {stage["name"] for stage in stages if stage.get("manual")} == {"eea_download", "stations"}
+
+
+def test_upstream_skips_manual_stages_unless_selected():
+    graph = {"download": set(), "convert": {"download"}, "report": {"convert"}}
+
+    assert cevovod.upstream(graph, {"report"}, manual={"download"}) == {"report", "convert"}
+    assert cevovod.upstream(graph, {"report", "download"}, manual={"download"}) == set(graph)
+
+
+def test_local_modules_follow_imports_inside_functions(backend):
+    assert [path.name for path in cevovod.local_modules(backend / "Scripts" / "drugi.py")] == ["pomoc.py"]
+    assert cevovod.local_modules(backend / "Scripts" / "prvi.py") == []
+
+
+def test_runs_once_then_up_to_date(backend):
+    assert run() == {"prvi": ("izvedeno", "prvi zagon"), "drugi": ("izvedeno", "prvi zagon")}
+    assert (backend / "data" / "izhod" / "rezultat.txt").read_text() == "ABCABC"
+
+    assert run() == {"prvi": ("ažurno", None), "drugi": ("ažurno", None)}
+    assert run(dry_run=True) == {"prvi": ("ažurno", None), "drugi": ("ažurno", None)}
+
+
+def test_changed_input_reruns_dependents(backend):
+    run()
+    (backend / "data" / "vhod.txt").write_text("xyz", encoding="utf-8")
+
+    assert run(dry_run=True)["prvi"] == ("zastarelo", "spremenjeni vhodi")
+    assert run() == {"prvi": ("izvedeno", "spremenjeni vhodi"), "drugi": ("izvedeno", "spremenjeni vhodi")}
+    assert (backend / "data" / "izhod" / "rezultat.txt").read_text() == "XYZXYZ"
+
+
+def test_changed_imported_module_marks_stage_stale(backend):
+    run()
+    (backend / "Scripts" / "pomoc.py").write_text("FACTOR = 3\n", encoding="utf-8")
+
+    assert run() == {"prvi": ("ažurno", None), "drugi": ("izvedeno", "spremenjeni vhodi")}
+    assert (backend / "data" / "izhod" / "rezultat.txt").read_text() == "ABCABCABC"
+
+
+def test_missing_or_edited_outputs_are_restored_from_cache(backend):
+    run()
+    result = backend / "data" / "izhod" / "rezultat.txt"
+
+    result.unlink()
+    assert run()["drugi"] == ("iz predpomnilnika", "manjkajoči izhodi")
+    assert result.read_text() == "ABCABC"
+
+    result.write_text("ročno urejeno", encoding="utf-8")
+    assert run(use_cache=False)["drugi"] == ("izvedeno", "spremenjeni izhodi")
+    assert result.read_text() == "ABCABC"
+
+
+def test_cache_restores_outputs_for_previous_inputs(backend):
+    run()
+    (backend / "data" / "vhod.txt").write_text("xyz", encoding="utf-8")
+    run()
+    (backend / "data" / "vhod.txt").write_text("abc", encoding="utf-8")
+
+    assert run() == {"prvi": ("iz predpomnilnika", "spremenjeni vhodi"),
+                     "drugi": ("iz predpomnilnika", "spremenjeni vhodi")}
+    assert (backend / "data" / "izhod" / "rezultat.txt").read_text() == "ABCABC"
+
+
+def test_failed_stage_skips_dependents_and_is_retried(backend):
+    failing = [{**STAGES[1], "script": "napaka.py"}, STAGES[0]]
+
+    assert run(failing) == {"prvi": ("napaka", "prvi zagon"), "drugi": ("preskočeno", "neuspešna odvisnost")}
+    # Neuspešna stopnja ne zapiše stanja, zato se ob naslednjem zagonu izvede znova
+    assert run(failing, dry_run=True)["prvi"] == ("zastarelo", "prvi zagon")
@@ -0,0 +1,79 @@
+"""
+Testi izvoza dnevnih particij: nespremenjena particija se ne zapiše znova,
+manifest in dnevnik sprememb pa sledita dodanim, spremenjenim in odstranjenim letom.
+"""
+
+import hashlib
+import json
+
+import dnevni_izvoz
+
+COLUMNS = ["date", "value", "city"]
+ROWS = [
+    ["2023-12-31", 10.0, "Celje"],
+    ["2024-01-01", 12.0, "Celje"],
+    ["2024-01-02", 14.0, "Koper"],
+]
+
+
+def export(tmp_path, rows):
+    return dnevni_izvoz.export_partitions(COLUMNS, rows, tmp_path, "Test")
+
+
+def changelog(tmp_path):
+    lines = (tmp_path / "changelog.jsonl").read_text(encoding="utf-8").splitlines()
+    return [{key: value for key, value in json.loads(line).items() if key != "run_at"} for line in lines]
+
+
+def test_unchanged_partition_is_not_rewritten(tmp_path):
+    assert export(tmp_path, ROWS) == {"added": ["2023", "2024"], "changed": [], "removed": []}
+    inodes = {year: (tmp_path / f"{year}.csv").stat().st_ino for year in ["2023", "2024"]}
+
+    changed = [*ROWS[:2], ["2024-01-02", 15.0, "Koper"]]
+    assert export(tmp_path, changed) == {"added": [], "changed": ["2024"], "removed": []}
+
+    # Zapis gre prek začasne datoteke in os.replace, zato prepisana particija dobi nov inode
+    assert (tmp_path / "2023.csv").stat().st_ino == inodes["2023"]
+    assert (tmp_path / "2024.csv").stat().st_ino != inodes["2024"]
+    assert (tmp_path / "2024.csv").read_text(encoding="utf-8") == \
+        "date,value,city\n2024-01-01,12.0,Celje\n2024-01-02,15.0,Koper\n"
+
+
+def test_manifest_tracks_partition_hashes(tmp_path):
+    export(tmp_path, ROWS)
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+
+    assert manifest["dataset"] == "Test" and manifest["columns"] == COLUMNS and manifest["total_rows"] == 3
+    for year, rows in [("2023", 1), ("2024", 2)]:
+        content = (tmp_path / f"{year}.csv").read_bytes()
+        assert manifest["partitions"][year] == {
+            "file": f"{year}.csv", "sha256": hashlib.sha256(content).hexdigest(), "rows": rows,
+        }
+
+
+def test_changelog_records_only_real_changes(tmp_path):
+    export(tmp_path, ROWS)
+    export(tmp_path, ROWS)
+    manifest_inode = (tmp_path / "manifest.json").stat().st_ino
+    export(tmp_path, ROWS[1:])
+
+    assert changelog(tmp_path) == [
+        {"added": ["2023", "2024"], "changed": [], "removed": []},
+        {"added": [], "changed": [], "removed": ["2023"]},
+    ]
+    assert not (tmp_path / "2023.csv").exists()
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert list(manifest["partitions"]) == ["2024"] and manifest["total_rows"] == 2
+    assert (tmp_path / "manifest.json").stat().st_ino != manifest_inode
+
+
+def test_export_dataset_writes_monolith_only_on_change(tmp_path, capsys):
+    dnevni_izvoz.export_dataset(COLUMNS, ROWS, tmp_path, "Test")
+    inode = (tmp_path / "Test.csv").stat().st_ino
+    capsys.readouterr()
+
+    dnevni_izvoz.export_dataset(COLUMNS, ROWS, tmp_path, "Test")
+
+    assert (tmp_path / "Test.csv").stat().st_ino == inode
+    assert capsys.readouterr().out == "Test: spremenjene particije: -\n"
+    assert not list(tmp_path.rglob("*.tmp"))
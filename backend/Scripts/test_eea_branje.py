@@ -0,0 +1,118 @@
+"""
+Testi pretočnega branja EEA: iter_records in read_columns morata dati enak
+rezultat kot json.load celotne datoteke, tudi ko meje branja padejo sredi
+števil, nizov ali zapisov in ko nizi vsebujejo ločila "},".
+"""
+
+import json
+import random
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import eea_branje
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+READ_SIZES = [1, 7, 64, 4096]
+
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        records.append({
+            "Samplingpoint": f"SI/SPO-SI00{rng.randint(10, 99)}A_00005_100",
+            "Pollutant": rng.choice([5, 7, 6001]),
+            "Start": f"2025-01-{1 + i % 28:02d} {i % 24:02d}:00:00",
+            "End": f"2025-01-{1 + i % 28:02d} {i % 24:02d}:59:59" if i % 5 else None,
+            "Value": rng.choice([None, -1.5e-3, 0, rng.randint(0, 400), round(rng.uniform(0, 400), 6), 1e21]),
+            "Unit": rng.choice(["ug.m-3", "µg/m³", "a},b", 'x"},{"y', "\\},\n"]),
+            "AggType": rng.choice(["hour", "day"]),
+            "Validity": rng.choice([1, 2, -1, None]),
+            "Verification": 3,
+            "Nested": {"list": [1, {"k": "},"}], "empty": {}},
+        })
+    return records
+
+
+def write(path, payload, indent):
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=indent), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(params=READ_SIZES)
+def read_size(request, monkeypatch):
+    monkeypatch.setattr(eea_branje, "_StreamingDecoder",
+                        partial(eea_branje._StreamingDecoder, read_size=request.param))
+    return request.param
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("layout", ["wrapped", "data_last", "top_level_list"])
+def test_streaming_records_match_json_load(tmp_path, read_size, layout, indent):
+    records = make_records(60, seed=len(layout))
+    payload = {
+        "wrapped": {"station": "SPO-SI0032R", "total_measurements": len(records), "data": records},
+        "data_last": {"meta": {"data": [1, 2]}, "note": "data: [", "data": records},
+        "top_level_list": records,
+    }[layout]
+    path = write(tmp_path / "postaja.json", payload, indent)
+
+    assert list(eea_branje.iter_records(path)) == records
+
+
+@pytest.mark.parametrize("payload", [[], {"station": "x", "data": []}, {"station": "x"}])
+def test_empty_files(tmp_path, read_size, payload):
+    path = write(tmp_path / "prazno.json", payload, None)
+
+    assert list(eea_branje.iter_records(path)) == []
+    assert len(eea_branje.read_columns(path)["Value"]) == 0
+
+
+def test_truncated_file_raises(tmp_path, read_size):
+    text = json.dumps({"data": make_records(5)})
+    path = tmp_path / "odrezano.json"
+    path.write_text(text[: len(text) // 2], encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(eea_branje.iter_records(path))
+
+
+def test_ndjson_matches_json(tmp_path):
+    records = make_records(40, seed=3)
+    path = tmp_path / "postaja.ndjson"
+    path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n\n", encoding="utf-8")
+
+    assert list(eea_branje.iter_records(path)) == records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10000])
+def test_read_columns_match_json_load(tmp_path, chunk_size):
+    records = make_records(50, seed=4)
+    path = write(tmp_path / "postaja.json", {"data": records}, 2)
+
+    columns = eea_branje.read_columns(path, chunk_size=chunk_size)
+
+    values = np.array([np.nan if r["Value"] is None else r["Value"] for r in records], dtype=float)
+    np.testing.assert_array_equal(columns["Value"], values)
+    assert columns["Unit"].tolist() == [r["Unit"] for r in records]
+    assert columns["Start"].tolist() == np.array([r["Start"] for r in records], dtype="datetime64[s]").tolist()
+    assert np.isnat(columns["End"]).tolist() == [r["End"] is None for r in records]
+
+    valid = eea_branje.read_columns(path, chunk_size=chunk_size, where=lambda c: c["Validity"] >= 1)
+    np.testing.assert_array_equal(valid["Value"], values[[r["Validity"] is not None and r["Validity"] >= 1
+                                                          for r in records]])
+
+
+@pytest.mark.parametrize("folder", ["EEA_historical_data", "EEA_podatki/po_postajah"])
+def test_committed_files_match_json_load(folder):
+    files = sorted((DATA_DIR / folder).glob("*.json"), key=lambda p: p.stat().st_size)[:3]
+    if not files:
+        pytest.skip(f"ni datotek v {DATA_DIR / folder}")
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        expected = payload if isinstance(payload, list) else payload.get("data", [])
+        assert list(eea_branje.iter_records(path)) == expected, path.name
@@ -0,0 +1,106 @@
+"""
+Testi preseganj ozona na ročno sestavljenih urnih serijah: pravilo 6 od 8 ur
+za drseče povprečje, 18 veljavnih povprečij na dan, zajem podatkov 90 % poleti
+in 75 % pozimi ter ročno preštete ure nad 180 in dnevi nad 120 μg/m³.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import eea_ozon_preseganja as ozon
+
+H180 = ozon.DETAILS_180
+D120 = ozon.DETAILS_120_8H
+
+
+def hours(start, days, value=100.0):
+    index = pd.date_range(start, periods=days * 24, freq="h")
+    return pd.Series(value, index=index)
+
+
+def test_8h_mean_needs_six_of_eight_hours():
+    series = pd.Series(np.arange(8, dtype=float), index=pd.date_range("2025-07-01", periods=8, freq="h"))
+    series.iloc[[2, 3]] = np.nan
+    means = ozon.rolling_8h_means(series.to_frame("A"))["A"]
+
+    assert means.iloc[-1] == pytest.approx((0 + 1 + 4 + 5 + 6 + 7) / 6)
+    assert means.iloc[:-1].isna().all()
+
+    series.iloc[4] = np.nan
+    assert np.isnan(ozon.rolling_8h_means(series.to_frame("A"))["A"].iloc[-1])
+
+
+@pytest.mark.parametrize("valid_hours, kept", [(16, True), (15, False)])
+def test_daily_max_needs_18_valid_means(valid_hours, kept):
+    # Drugi dan ima veljavne ure 0..k-1; povprečje ob uri h je veljavno do h = k + 1,
+    # zato ima dan k + 2 veljavnih povprečij
+    series = hours("2025-07-01", 2)
+    series.iloc[24 + valid_hours:] = np.nan
+    daily_max = ozon.daily_max_8h(series.to_frame("A"))["A"]
+
+    assert daily_max.iloc[0] == 100
+    assert (daily_max.iloc[1] == 100) if kept else np.isnan(daily_max.iloc[1])
+
+
+def test_summer_exceedances_and_90_percent_capture():
+    base = hours("2025-07-01", 31)
+    base["2025-07-05 12:00":"2025-07-05 14:00"] = 200
+    base["2025-07-20 10:00":"2025-07-20 17:00"] = 130
+
+    # Po tri manjkajoče ure na dan (1, 9, 17), da ima vsako 8-urno okno 7 veljavnih ur
+    gaps = [pd.Timestamp(f"2025-07-{day:02d} {hour:02d}:00") for day in range(1, 26) for hour in (1, 9, 17)]
+    hourly = pd.DataFrame({
+        "A": base,
+        "B": base.drop(gaps).reindex(base.index),       # 669 / 744 ur < 90 %
+        "C": base.drop(gaps[:-1]).reindex(base.index),  # 670 / 744 ur >= 90 %
+    })
+
+    result = ozon.monthly_exceedances(hourly)
+
+    # Ure 12-14 nad 180 (3 ure); 8-urni maksimum (5 * 100 + 3 * 200) / 8 = 137,5 na 5. 7. in 130 na 20. 7.
+    assert result[H180].loc["2025-07-01", ["A", "C"]].tolist() == [3, 3]
+    assert np.isnan(result[H180].loc["2025-07-01", "B"])
+    # Vsi dnevi imajo 24 veljavnih povprečij, zato so dnevna preseganja veljavna za vse postaje
+    assert result[D120].loc["2025-07-01"].tolist() == [2, 2, 2]
+
+
+def test_winter_exceedances_and_75_percent_capture():
+    base = hours("2025-01-01", 31)
+    base["2025-01-20 10:00":"2025-01-20 17:00"] = 130
+    base["2025-01-21 12:00"] = 190  # 8-urni maksimum (7 * 100 + 190) / 8 = 111,25 ne preseže 120
+
+    def without_days(days):
+        series = base.copy()
+        for day in days:
+            series[f"2025-01-{day:02d}"] = np.nan
+        return series
+
+    hourly = pd.DataFrame({
+        "E": without_days([2, 4, 6, 8, 10, 12, 14]),      # 24 dni, 576 ur (77 %)
+        "F": without_days([2, 4, 6, 8, 10, 12, 14, 16]),  # 23 dni, 552 ur (74 %)
+    })
+
+    result = ozon.monthly_exceedances(hourly)
+
+    assert result[H180].loc["2025-01-01", "E"] == 1
+    assert result[D120].loc["2025-01-01", "E"] == 1
+    assert np.isnan(result[H180].loc["2025-01-01", "F"])
+    assert np.isnan(result[D120].loc["2025-01-01", "F"])
+
+
+def test_load_keeps_last_hour_at_midnight(tmp_path):
+    records = [{"PollutantName": "O3", "AggType": "hour", "Validity": 1,
+                "Start": f"{start:%Y-%m-%d %H:%M:%S}", "Value": 50 + i}
+               for i, start in enumerate(pd.date_range("2025-07-01", "2025-07-02", freq="h"))]
+    records += [{"PollutantName": "NO2", "AggType": "hour", "Validity": 1, "Start": "2025-07-02 01:00:00", "Value": 9},
+                {"PollutantName": "O3", "AggType": "hour", "Validity": -1, "Start": "2025-07-02 02:00:00", "Value": 9}]
+    (tmp_path / "SPO-SI0001A.json").write_text(json.dumps({"data": records}), encoding="utf-8")
+
+    hourly = ozon.load_hourly_o3(tmp_path)
+
+    assert hourly.index[0] == pd.Timestamp("2025-07-01") and hourly.index[-1] == pd.Timestamp("2025-07-02 23:00")
+    assert hourly.loc["2025-07-02 00:00", "SPO-SI0001A"] == 74
+    assert hourly["SPO-SI0001A"].count() == 25
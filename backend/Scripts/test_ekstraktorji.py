@@ -0,0 +1,113 @@
+"""
+Testi ekstraktorjev ARSO: razdelitev strani med procese (pdf_strani) in vzporedna
+ekstrakcija, ki mora na sintetičnem PDF dati enake meritve kot zaporedna, pri ozonu
+tudi enake oznake preglednic.
+"""
+
+import importlib.util
+from datetime import date, timedelta
+
+import pytest
+
+import arso_ozon_ekstraktor
+import arso_pm10_ekstraktor
+import arso_pm25_ekstraktor
+import pdf_strani
+
+needs_pdfplumber = pytest.mark.skipif(importlib.util.find_spec("pdfplumber") is None,
+                                      reason="pdfplumber ni nameščen")
+
+EXTRACTORS = {
+    "PM10": (arso_pm10_ekstraktor, arso_pm10_ekstraktor.extract_pm10_data),
+    "PM25": (arso_pm25_ekstraktor, arso_pm25_ekstraktor.extract_pm25_data),
+    "Ozon": (arso_ozon_ekstraktor, arso_ozon_ekstraktor.extract_Ozone_data),
+}
+
+
+def write_report(path, pages):
+    """Zapiše PDF s tabelo dnevnih vrednosti; pages je seznam (y prve vrstice, dnevi, število stolpcev)"""
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+    pdf = canvas.Canvas(str(path), pagesize=(595, 842))
+    day = date(2013, 1, 1)
+    for first_row, days, columns in pages:
+        pdf.setFont("Helvetica", 14)
+        pdf.drawString(50, 810, "Dnevne koncentracije delcev")
+        pdf.setFont("Helvetica", 8)
+        for row in range(days):
+            y = first_row - row * 12
+            pdf.drawString(40, y, day.strftime("%d.%m.%y"))
+            for column in range(columns):
+                pdf.drawString(85 + column * 30, y, str(20 + (row * 7 + column * 3) % 60))
+            day += timedelta(days=1)
+        pdf.showPage()
+    pdf.save()
+
+
+@pytest.mark.parametrize("num_pages, workers", [(0, 4), (1, 4), (7, 3), (12, 4), (5, 8), (9, 1)])
+def test_split_page_ranges_covers_all_pages_in_order(num_pages, workers):
+    ranges = pdf_strani.split_page_ranges(num_pages, workers)
+
+    assert len(ranges) == max(1, min(workers, num_pages))
+    assert ranges[0][0] == 0 and ranges[-1][1] == num_pages
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    sizes = [end - start for start, end in ranges]
+    assert max(sizes) - min(sizes) <= 1
+
+
+@needs_pdfplumber
+@pytest.mark.parametrize("kind", ["PM10", "PM25"])
+def test_parallel_matches_serial_on_synthetic_report(tmp_path, kind):
+    path = tmp_path / f"{kind}_2013.pdf"
+    write_report(path, [(780, 30, 8), (780, 31, 8), (780, 28, 8), (780, 31, 8)])
+    _, extract = EXTRACTORS[kind]
+
+    serial = extract(path, workers=1)
+    parallel = extract(path, workers=3)
+
+    assert len(serial[0]) > 0
+    assert parallel == serial
+
+
+
+def write_ozone_report(path, pages):
+    """Zapiše PDF z mesečnimi vrednostmi ozona; vsaka stran je seznam vrstic (lokacija ali naslov)"""
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+    pdf = canvas.Canvas(str(path), pagesize=(595, 842))
+    for lines in pages:
+        pdf.setFont("Helvetica", 8)
+        y = 780
+        for index, line in enumerate(lines):
+            if not line.startswith("Preglednica"):
+                line += "".join(f" {(index * 5 + month * 3) % 40}" for month in range(12))
+            pdf.drawString(40, y, line)
+            y -= 14
+        pdf.showPage()
+    pdf.save()
+
+
+@needs_pdfplumber
+@pytest.mark.parametrize("workers", [2, 3, 4])
+def test_ozone_parallel_keeps_table_labels(tmp_path, workers):
+    # "Preglednica 2" je na sredinski strani in velja samo za vrstice pod njo na isti strani
+    path = tmp_path / "Ozone_2013.pdf"
+    write_ozone_report(path, [
+        ["Preglednica 1", "Celje"],
+        ["Koper"],
+        ["Trbovlje", "Preglednica 2", "Zagorje"],
+        ["Hrastnik"],
+    ])
+    extract = EXTRACTORS["Ozon"][1]
+
+    serial, _ = extract(path, workers=1)
+    parallel, _ = extract(path, workers=workers)
+
+    assert parallel == serial
+    labels = {measurement["location"]: measurement["detail"] for measurement in serial}
+    assert labels == {
+        "Celje": arso_ozon_ekstraktor.DETAILS_180,
+        "Koper": arso_ozon_ekstraktor.DETAILS_180,
+        "Trbovlje": arso_ozon_ekstraktor.DETAILS_180,
+        "Zagorje": arso_ozon_ekstraktor.DETAILS_120_8H,
+        "Hrastnik": arso_ozon_ekstraktor.DETAILS_180,
+    }
+    assert len(serial) == 5 * 12
@@ -0,0 +1,94 @@
+"""
+Testi klimatologije: indeks dneva v letu (29. februar) in krožno okno ±N dni
+prek konca leta se primerjata z neposrednim izračunom po posameznih dnevih.
+"""
+
+import numpy as np
+import pytest
+
+import klimatologija
+
+
+def days(start, end):
+    return np.arange(start, end, dtype="datetime64[D]")
+
+
+def test_day_of_year_aligns_leap_and_common_years():
+    dates = np.array(["2023-02-28", "2023-03-01", "2024-02-28", "2024-02-29", "2024-03-01",
+                      "2023-12-31", "2024-12-31", "2000-02-29", "1900-03-01"], dtype="datetime64[D]")
+
+    assert klimatologija.day_of_year(dates).tolist() == [58, 60, 58, 59, 60, 365, 365, 59, 60]
+
+
+def test_day_of_year_is_unique_within_each_year():
+    for year in [2023, 2024]:
+        doy = klimatologija.day_of_year(days(f"{year}-01-01", f"{year + 1}-01-01"))
+        assert len(set(doy.tolist())) == len(doy)
+        assert doy.min() == 0 and doy.max() == 365
+
+
+def reference_climatology(matrix, calendar, window, min_samples):
+    """Za vsak dan v letu zbere vrednosti, katerih indeks je krožno oddaljen največ window dni"""
+    doy = klimatologija.day_of_year(calendar)
+    distance = np.abs(doy[None, :] - np.arange(klimatologija.DAYS_IN_YEAR)[:, None])
+    in_window = np.minimum(distance, klimatologija.DAYS_IN_YEAR - distance) <= window
+
+    shape = (matrix.shape[0], klimatologija.DAYS_IN_YEAR)
+    result = {name: np.full(shape, np.nan) for name in ["p10", "p50", "p90", "mean", "std"]}
+    result["count"] = np.zeros(shape, dtype=int)
+    for row in range(matrix.shape[0]):
+        for day in range(klimatologija.DAYS_IN_YEAR):
+            values = matrix[row, in_window[day]]
+            values = values[np.isfinite(values)]
+            result["count"][row, day] = len(values)
+            if len(values) < min_samples:
+                continue
+            for p in klimatologija.PERCENTILES:
+                result[f"p{p}"][row, day] = np.percentile(values, p)
+            result["mean"][row, day] = values.mean()
+            result["std"][row, day] = values.std(ddof=1)
+    return result
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("window, min_samples", [(0, 1), (3, 5), (15, 10)])
+def test_circular_window_matches_per_day_reference(window, min_samples):
+    rng = np.random.default_rng(window)
+    calendar = days("2021-11-15", "2024-02-10")
+    matrix = rng.gamma(3, 10, size=(3, len(calendar)))
+    matrix[rng.random(matrix.shape) < 0.2] = np.nan
+    matrix[2, :] = np.nan
+
+    result = klimatologija.climatology(matrix, calendar, window, min_samples)
+    expected = reference_climatology(matrix, calendar, window, min_samples)
+
+    np.testing.assert_array_equal(result["count"], expected["count"])
+    for name in ["p10", "p50", "p90", "mean", "std"]:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-12, equal_nan=True, err_msg=name)
+
+
+def test_window_wraps_over_new_year():
+    calendar = days("2023-12-29", "2024-01-04")
+    matrix = np.arange(len(calendar), dtype=float)[None, :]
+
+    result = klimatologija.climatology(matrix, calendar, window=2, min_samples=1)
+
+    # Vrednosti so 0..5 od 29. 12. do 3. 1.; 1. januar (indeks 0) vidi 30. 12. do 3. 1.
+    assert result["count"][0, 0] == 5
+    assert result["mean"][0, 0] == pytest.approx(3.0)
+    # 31. december (indeks 365) vidi 29. 12. do 2. 1.
+    assert result["count"][0, 365] == 5
+    assert result["mean"][0, 365] == pytest.approx(2.0)
+
+
+def test_anomalies_use_day_of_year_statistics():
+    calendar = days("2020-01-01", "2023-12-31")
+    rng = np.random.default_rng(7)
+    matrix = rng.normal(50, 10, size=(2, len(calendar)))
+    clim = klimatologija.climatology(matrix, calendar, window=5, min_samples=10)
+
+    z = klimatologija.anomalies(matrix, calendar, clim, rows=np.array([0, -1]))
+
+    doy = klimatologija.day_of_year(calendar)
+    np.testing.assert_allclose(z[0], (matrix[0] - clim["mean"][0, doy]) / clim["std"][0, doy])
+    assert np.isnan(z[1]).all()
@@ -0,0 +1,97 @@
+"""
+Testi zmanjševanja serij: vektorski LTTB (vse serije hkrati, vrzeli kot NaN)
+mora izbrati iste točke kot skalarna referenčna izvedba za eno serijo.
+"""
+
+import math
+import argparse
+
+import numpy as np
+import pytest
+
+import lttb
+
+
+def reference_lttb(x, y, threshold):
+    """Klasični Largest-Triangle-Three-Buckets za eno serijo; vrne indekse izbranih točk"""
+    n = len(x)
+    if n <= threshold:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    selected = [0]
+    for bucket in range(threshold - 2):
+        avg_start = math.floor((bucket + 1) * every) + 1
+        avg_end = min(math.floor((bucket + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+
+        best, best_area = None, -1.0
+        for j in range(math.floor(bucket * every) + 1, math.floor((bucket + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def sample_matrix(seed, series=6, days=900):
+    rng = np.random.default_rng(seed)
+    t = np.arange(days)
+    matrix = 40 + 15 * np.sin(t / 30.0)[None, :] + rng.normal(0, 8, size=(series, days))
+    matrix[rng.random(matrix.shape) < 0.15] = np.nan
+    matrix[0, 100:400] = np.nan
+    matrix[1, 50:] = np.nan
+    matrix[2, :] = np.nan
+    return matrix
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 50, 200, 1000])
+@pytest.mark.parametrize("seed", range(3))
+def test_downsample_matches_scalar_reference(seed, threshold):
+    matrix = sample_matrix(seed)
+    calendar = np.datetime64("2020-01-01") + np.arange(matrix.shape[1])
+
+    sampled = lttb.downsample(calendar, matrix, threshold)
+
+    assert len(sampled) == len(matrix)
+    for row, (days, values) in zip(matrix, sampled):
+        x = np.flatnonzero(np.isfinite(row))
+        expected = reference_lttb(x.astype(float).tolist(), row[x].tolist(), threshold)
+        np.testing.assert_array_equal(days, calendar[x[expected]])
+        np.testing.assert_array_equal(values, row[x[expected]])
+
+
+def test_short_and_empty_series_keep_all_points():
+    matrix = np.array([[1.0, np.nan, 3.0, 4.0], [np.nan] * 4])
+    calendar = np.datetime64("2024-01-01") + np.arange(4)
+
+    (days, values), (empty_days, empty_values) = lttb.downsample(calendar, matrix, 5)
+
+    np.testing.assert_array_equal(values, [1.0, 3.0, 4.0])
+    np.testing.assert_array_equal(days, calendar[[0, 2, 3]])
+    assert len(empty_days) == 0 and len(empty_values) == 0
+
+
+def test_compact_rows_moves_valid_points_to_front():
+    matrix = np.array([[np.nan, 2.0, np.nan, 5.0], [7.0, 8.0, 9.0, 10.0]])
+
+    order, values, counts = lttb.compact_rows(matrix)
+
+    assert counts.tolist() == [2, 4]
+    np.testing.assert_array_equal(order, [[1, 3, 3, 3], [0, 1, 2, 3]])
+    np.testing.assert_array_equal(values, [[2.0, 5.0, 5.0, 5.0], [7.0, 8.0, 9.0, 10.0]])
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 2])
+def test_threshold_below_three_is_rejected(threshold):
+    matrix = sample_matrix(0)
+    calendar = np.datetime64("2020-01-01") + np.arange(matrix.shape[1])
+
+    with pytest.raises(ValueError):
+        lttb.downsample(calendar, matrix, threshold)
+    with pytest.raises(argparse.ArgumentTypeError):
+        lttb.resolution(str(threshold))
+    assert lttb.resolution("3") == 3
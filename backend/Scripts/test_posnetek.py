@@ -0,0 +1,86 @@
+"""
+Testi binarnega posnetka AQSNAP: zapis in branje morata vrniti enako tabelo
+UnifiedRow (tipi stolpcev in vrednosti), stolpci so poravnani na 8 bajtov,
+napačno magično zaporedje ali različica sheme pa se zavrneta.
+"""
+
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import posnetek
+from enotni_podatki import UNIFIED_COLUMNS, load_unified_rows
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def unified_rows():
+    dates = ["1969-12-31", "2000-02-29", "2024-02-29", "2024-12-31", "2026-10-19", "2013-01-01"]
+    rows = pd.DataFrame({
+        "date": dates,
+        "value": [0.1, 12.345678901234, -3.0, 1e6, 55.5, 0.0],
+        "city": ["Žerjav", "Ljubljana", "Celje", "Ljubljana", "Koper", "Murska Sobota"],
+        "year": [int(date[:4]) for date in dates],
+        "pollutant": ["PM10", "PM2.5", "O3", "PM10", "PM10", "PM2.5"],
+        "month": [int(date[5:7]) for date in dates],
+        "source": ["arso", "eea", "eea", "arso_forecast", "eea_forecast", "eea"],
+        "station_id": pd.Series([None, "SI0001A", "SI0002A", None, None, "SI0001A"], dtype=object),
+    })
+    return rows.astype({"year": "int64", "month": "int64"})[UNIFIED_COLUMNS]
+
+
+def round_trip(rows, path):
+    posnetek.write_snapshot(rows, path)
+    header, columns = posnetek.read_snapshot(path)
+    return header, columns, posnetek.snapshot_to_frame(header, columns)
+
+
+def test_round_trip_keeps_dtypes_and_values(tmp_path):
+    rows = unified_rows()
+    header, columns, frame = round_trip(rows, tmp_path / "posnetek.aqs")
+
+    pd.testing.assert_frame_equal(frame, rows)
+    assert header["rows"] == len(rows)
+    assert header["dictionaries"]["source"] == list(posnetek.SOURCES)
+    assert {name: array.dtype for name, array in columns.items()} == {name: np.dtype(dtype) for name, dtype in posnetek.COLUMNS}
+    assert columns["station_id"].tolist() == [-1, 0, 1, -1, -1, 0]
+
+
+def test_columns_are_aligned(tmp_path):
+    path = tmp_path / "posnetek.aqs"
+    header, columns, _ = round_trip(unified_rows().iloc[:5], path)
+
+    buffer = path.read_bytes()
+    assert buffer[:8] == posnetek.MAGIC
+    data_start = posnetek._align(16 + struct.unpack("<II", buffer[8:16])[1])
+    for column in header["columns"]:
+        assert (data_start + column["offset"]) % posnetek.ALIGNMENT == 0
+    # Mapirani stolpci se sklicujejo na datoteko in se ne kopirajo
+    assert isinstance(columns["value"], np.memmap)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("offset, content, message", [(0, b"NOTSNAP\0", "ni posnetek"),
+                                                      (8, struct.pack("<I", 99), "različica sheme")])
+def test_rejects_foreign_files_and_other_schema_versions(tmp_path, offset, content, message):
+    path = tmp_path / "posnetek.aqs"
+    posnetek.write_snapshot(unified_rows(), path)
+    data = bytearray(path.read_bytes())
+    data[offset:offset + len(content)] = content
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match=message):
+        posnetek.read_snapshot(path)
+
+
+def test_round_trip_on_committed_daily_data(tmp_path):
+    rows, _ = load_unified_rows(DATA_DIR)
+    if rows.empty:
+        pytest.skip(f"ni dnevnih podatkov v {DATA_DIR}")
+
+    _, _, frame = round_trip(rows, tmp_path / "posnetek.aqs")
+
+    pd.testing.assert_frame_equal(frame, rows.reset_index(drop=True))
@@ -0,0 +1,138 @@
+"""
+Testi prostorskega indeksa postaj: KD-drevo v enotskih vektorjih na krogli mora
+vrniti iste postaje in razdalje kot neposreden izračun haversine za vse pare.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import postaje
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * postaje.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def random_registry(seed, count=300, missing=10):
+    rng = np.random.default_rng(seed)
+    # Večina postaj v Sloveniji, nekaj po vsem svetu (tudi blizu datumske meje in polov)
+    lat = np.concatenate([rng.uniform(45.4, 46.9, count - 40), rng.uniform(-89, 89, 40)])
+    lon = np.concatenate([rng.uniform(13.3, 16.6, count - 40), rng.uniform(-180, 180, 40)])
+    registry = pd.DataFrame({
+        "id": [f"s{i}" for i in range(count)],
+        "name": [f"Postaja {i}" for i in range(count)],
+        "source": "test",
+        "city": None,
+        "lat": lat,
+        "lon": lon,
+    })
+    registry.loc[rng.choice(count, missing, replace=False), ["lat", "lon"]] = np.nan
+    return registry
+
+
+def brute_force(registry, lat, lon):
+    distances = haversine_km(lat, lon, registry["lat"].to_numpy(), registry["lon"].to_numpy())
+    located = np.flatnonzero(np.isfinite(distances))
+    order = located[np.argsort(distances[located], kind="stable")]
+    return distances[order], order
+
+
+@pytest.fixture(params=[0, 1])
+def registry(request):
+    return random_registry(request.param)
+
+
+QUERIES = [(46.05, 14.51), (45.5, 13.7), (46.9, 16.6), (0.0, 179.9), (0.0, -179.9), (89.5, 10.0), (-60.0, -70.0)]
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_nearest_matches_brute_force_haversine(registry, k):
+    index = postaje.StationIndex(registry)
+    lat, lon = zip(*QUERIES)
+
+    distances, indices = index.nearest(lat, lon, k)
+
+    assert distances.shape == indices.shape == (len(QUERIES), k)
+    for (q_lat, q_lon), row_distances, row_indices in zip(QUERIES, distances, indices):
+        expected_distances, expected_indices = brute_force(registry, q_lat, q_lon)
+        np.testing.assert_allclose(row_distances, expected_distances[:k], rtol=1e-9, atol=1e-6)
+        assert row_indices.tolist() == expected_indices[:k].tolist()
+
+
+@pytest.mark.parametrize("km", [0.5, 10, 50, 300, 5000])
+def test_within_matches_brute_force_haversine(registry, km):
+    index = postaje.StationIndex(registry)
+    lat, lon = zip(*QUERIES)
+
+    for (q_lat, q_lon), (distances, indices) in zip(QUERIES, index.within(lat, lon, km)):
+        expected_distances, expected_indices = brute_force(registry, q_lat, q_lon)
+        inside = expected_distances <= km
+        assert indices.tolist() == expected_indices[inside].tolist()
+        np.testing.assert_allclose(distances, expected_distances[inside], rtol=1e-9, atol=1e-6)
+
+
+@pytest.mark.parametrize("leaf_size", [1, 2, postaje.LEAF_SIZE, 1000])
+def test_tree_query_independent_of_leaf_size(registry, leaf_size):
+    located = registry.dropna(subset=["lat", "lon"])
+    points = postaje.to_unit_vectors(located["lat"].to_numpy(), located["lon"].to_numpy())
+    tree = postaje.KDTree(points, leaf_size=leaf_size)
+    q = postaje.to_unit_vectors(46.0, 14.5)
+
+    chord, idx = tree.query(q, 10)
+    expected = np.sort(np.linalg.norm(points - q, axis=1))[:10]
+
+    np.testing.assert_allclose(chord, expected, rtol=1e-12)
+    np.testing.assert_allclose(np.linalg.norm(points[idx] - q, axis=1), chord, rtol=1e-12)
+
+
+def test_save_and_load_keep_results(tmp_path, registry):
+    index = postaje.StationIndex(registry)
+    path = tmp_path / "station_index.npz"
+    index.save(path)
+
+    loaded = postaje.StationIndex.load(path)
+
+    lat, lon = zip(*QUERIES)
+    for expected, actual in zip(index.nearest(lat, lon, 7), loaded.nearest(lat, lon, 7)):
+        np.testing.assert_array_equal(actual, expected)
+    assert loaded.registry["id"].tolist() == registry["id"].tolist()
+
+
+def test_chord_and_km_are_inverse():
+    km = np.array([0.0, 0.001, 1.0, 150.0, 10000.0, np.pi * postaje.EARTH_RADIUS_KM])
+    np.testing.assert_allclose(postaje.chord_to_km(postaje.km_to_chord(km)), km, rtol=1e-9, atol=1e-9)
+
+
+def test_eea_stations_without_metadata_are_reported(tmp_path):
+    eea_dir = tmp_path / "eea"
+    eea_dir.mkdir()
+    for stem in ["SPO-SI0008R_00005_100", "SPO-SI0008R_06001_100", "SPO-SI0002A_00005_101", "povzetek"]:
+        (eea_dir / f"{stem}.json").write_text("[]", encoding="utf-8")
+    metadata = tmp_path / "EEA_postaje.csv"
+    metadata.write_text("station,name,lat,lon,location\nSI0008R,Iskrba,45.5647,14.8631,Iskrba\n", encoding="utf-8")
+
+    stations = postaje.eea_stations([eea_dir], metadata=metadata)
+
+    assert stations["id"].tolist() == ["eea:SI0002A", "eea:SI0008R"]
+    assert stations.set_index("id").loc["eea:SI0008R", "name"] == "Iskrba"
+    assert postaje.unlocated(stations) == ["SI0002A"]
+
+
+def test_arso_stations_have_unique_sites():
+    stations = postaje.arso_stations()
+
+    assert stations["id"].is_unique
+    assert not stations.duplicated(["lat", "lon"]).any()
+
+
+@pytest.mark.parametrize("points, k", [(np.empty((0, 3)), 3), (postaje.to_unit_vectors([46.0], [14.5]), 0)])
+def test_query_on_empty_tree_or_zero_k(points, k):
+    tree = postaje.KDTree(points)
+
+    chord, idx = tree.query(postaje.to_unit_vectors(46.0, 14.5), k)
+
+    assert len(chord) == 0 and len(idx) == 0
+    assert len(tree.query_radius(postaje.to_unit_vectors(46.0, 14.5), 1.0)[1]) == (0 if k else 1)
@@ -0,0 +1,96 @@
+"""
+Testi prevzorčenja: to_dense se primerja z vrtilno tabelo pandas, linearna
+interpolacija pa z zanko po posameznih vrzelih.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import prevzorcenje
+
+
+def sample_rows(seed=0, count=400):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2023-12-20") + pd.to_timedelta(rng.integers(0, 60, count), unit="D")
+    return pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "city": rng.choice(["Ljubljana", "Maribor", "Celje"], count),
+        "pollutant": rng.choice(["PM10", "PM2.5"], count),
+        "source": rng.choice(["arso", "eea"], count),
+        "value": rng.uniform(0, 120, count).round(1),
+    })
+
+
+def reference_dense(rows, keys, start, end):
+    table = rows.assign(date=pd.to_datetime(rows["date"])).pivot_table(
+        index=keys, columns="date", values="value", aggfunc="mean"
+    )
+    calendar = pd.date_range(start, end, freq="D")
+    return table.reindex(columns=calendar)
+
+
+@pytest.mark.parametrize("keys", [prevzorcenje.SERIES_KEYS, ["city", "pollutant"], ["source"]])
+@pytest.mark.parametrize("start, end", [(None, None), ("2024-01-01", "2024-01-31"), ("2023-12-01", "2024-03-01")])
+def test_to_dense_matches_pivot_table(keys, start, end):
+    rows = sample_rows()
+    series, calendar, matrix = prevzorcenje.to_dense(rows, keys, start, end)
+
+    dates = pd.to_datetime(rows["date"])
+    start = dates.min() if start is None else pd.Timestamp(start)
+    end = dates.max() if end is None else pd.Timestamp(end)
+    inside = rows[(dates >= start) & (dates <= end)]
+    expected = reference_dense(inside, keys, start, end)
+
+    assert calendar[0] == np.datetime64(start.date()) and calendar[-1] == np.datetime64(end.date())
+    assert len(calendar) == (end - start).days + 1
+    assert list(series.itertuples(index=False, name=None)) == [
+        key if isinstance(key, tuple) else (key,) for key in expected.index
+    ]
+    np.testing.assert_allclose(matrix, expected.to_numpy(dtype=float), equal_nan=True)
+
+
+def test_to_dense_averages_same_day_values():
+    rows = pd.DataFrame({
+        "date": ["2024-01-01", "2024-01-01", "2024-01-03"],
+        "city": ["Celje"] * 3,
+        "pollutant": ["PM10"] * 3,
+        "source": ["arso"] * 3,
+        "value": [10.0, 20.0, 40.0],
+    })
+    _, calendar, matrix = prevzorcenje.to_dense(rows)
+
+    assert calendar.tolist() == np.arange("2024-01-01", "2024-01-04", dtype="datetime64[D]").tolist()
+    np.testing.assert_array_equal(matrix, [[15.0, np.nan, 40.0]])
+
+
+def reference_interpolation(row, max_gap):
+    row = row.copy()
+    valid = np.flatnonzero(np.isfinite(row))
+    for left, right in zip(valid, valid[1:]):
+        if 0 < right - left - 1 <= max_gap:
+            for i in range(left + 1, right):
+                row[i] = row[left] + (row[right] - row[left]) * (i - left) / (right - left)
+    return row
+
+
+@pytest.mark.parametrize("max_gap", [1, 3, 10])
+def test_interpolate_linear_matches_per_gap_loop(max_gap):
+    _, _, matrix = prevzorcenje.to_dense(sample_rows(seed=1, count=250))
+    filled = prevzorcenje.interpolate_linear(matrix, max_gap)
+
+    expected = np.array([reference_interpolation(row, max_gap) for row in matrix])
+    np.testing.assert_allclose(filled, expected, equal_nan=True)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    series, calendar, matrix = prevzorcenje.to_dense(sample_rows(seed=2))
+    path = tmp_path / "dense.npz"
+    prevzorcenje.save_dense(path, series, calendar, matrix)
+
+    loaded_series, loaded_calendar, loaded_matrix, observed = prevzorcenje.load_dense(path)
+
+    pd.testing.assert_frame_equal(loaded_series, series.astype(str))
+    np.testing.assert_array_equal(loaded_calendar, calendar)
+    np.testing.assert_allclose(loaded_matrix, matrix.astype(np.float32), equal_nan=True)
+    np.testing.assert_array_equal(observed, np.isfinite(matrix))
@@ -0,0 +1,132 @@
+"""
+Testi trendov: vektorski sezonski Mann-Kendall, parni nakloni in Senov naklon
+se primerjajo z neposrednimi skalarnimi izračuni po definiciji in z ročno
+izračunanim primerom.
+"""
+
+import math
+import statistics
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import trendi
+
+
+def reference_mann_kendall(monthly):
+    """S in var(S) z zankami po parih let znotraj vsakega meseca"""
+    s = 0.0
+    var_s = 0.0
+    for month in range(monthly.shape[1]):
+        values = [v for v in monthly[:, month] if np.isfinite(v)]
+        s += sum(np.sign(values[j] - values[i]) for i, j in combinations(range(len(values)), 2))
+        n = len(values)
+        if n > 1:
+            ties = [values.count(v) for v in set(values)]
+            var_s += (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties if t > 1)) / 18
+    return s, var_s
+
+
+def monthly_sample(years, seed, missing=0.2, ties=False):
+    rng = np.random.default_rng(seed)
+    monthly = rng.normal(30, 8, size=(years, 12)) + 0.7 * np.arange(years)[:, None]
+    if ties:
+        monthly = np.round(monthly / 5) * 5
+    monthly[rng.random(monthly.shape) < missing] = np.nan
+    return monthly
+
+
+@pytest.mark.parametrize("years, seed, ties", [(3, 0, False), (8, 1, False), (12, 2, True), (20, 3, True)])
+def test_seasonal_mann_kendall_matches_reference(years, seed, ties):
+    monthly = monthly_sample(years, seed, ties=ties)
+    result = trendi.seasonal_mann_kendall(monthly)
+    s, var_s = reference_mann_kendall(monthly)
+
+    assert result["S"] == s
+    assert result["var_S"] == pytest.approx(var_s)
+    assert 0 <= result["p"] <= 1
+
+
+def test_mann_kendall_strictly_increasing_single_season():
+    monthly = np.full((10, 12), np.nan)
+    monthly[:, 0] = np.arange(10)
+    result = trendi.seasonal_mann_kendall(monthly)
+
+    # n = 10: S = 45, var(S) = 10 * 9 * 25 / 18 = 125, Z = (S - 1) / sqrt(var(S))
+    assert result["S"] == 45
+    assert result["var_S"] == 125
+    assert result["Z"] == pytest.approx(44 / math.sqrt(125))
+    assert result["p"] == pytest.approx(math.erfc(44 / math.sqrt(125) / math.sqrt(2)))
+
+
+def test_mann_kendall_without_pairs():
+    result = trendi.seasonal_mann_kendall(np.full((4, 12), np.nan))
+    assert (result["S"], result["var_S"], result["Z"], result["p"]) == (0, 0, 0, 1)
+
+
+@pytest.mark.parametrize("n, chunk", [(2, 512), (9, 2), (40, 7), (100, 512)])
+def test_pairwise_slopes_match_double_loop(n, chunk):
+    rng = np.random.default_rng(n)
+    t = np.sort(rng.choice(1000, size=n, replace=False)).astype(float) / 365.25
+    x = rng.normal(20, 5, size=n)
+    x[rng.random(n) < 0.1] = np.nan
+
+    slopes = trendi.pairwise_slopes(t, x, chunk=chunk)
+    expected = [(x[j] - x[i]) / (t[j] - t[i]) for i, j in combinations(range(n), 2)]
+
+    np.testing.assert_allclose(slopes, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_sens_slope_worked_example():
+    # t = 0..5, x = 10, 12, 11, 15, 14, 18: 15 parnih naklonov, urejenih ročno
+    # -1, -1, 0.5, 2/3, 1, 1.5, 1.5, 1.5, 1.5, 1.6, 5/3, 2, 7/3, 4, 4
+    t = np.arange(6, dtype=float)
+    x = np.array([10, 12, 11, 15, 14, 18], dtype=float)
+    # var(S) = 6 * 5 * 17 / 18, C = 1.96 * sqrt(var(S)) = 10.43 (Gilbert 1987, 16.4):
+    # M1 = (15 - C) / 2 = 2.28 -> 2. naklon, M2 = (15 + C) / 2 + 1 = 13.72 -> 14. naklon
+    result = trendi.sens_slope(trendi.pairwise_slopes(t, x), 6 * 5 * 17 / 18)
+
+    assert result == {"slope": 1.5, "lower": -1.0, "upper": 4.0}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sens_slope_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(4, 40))
+    t = np.sort(rng.choice(2000, size=n, replace=False)).astype(float) / 365.25
+    x = rng.normal(20, 5, size=n) + 1.5 * t
+    x[rng.random(n) < 0.1] = np.nan
+    var_s = float(rng.uniform(0, 400))
+
+    result = trendi.sens_slope(trendi.pairwise_slopes(t, x), var_s)
+
+    # Vsi nakloni z dvojno zanko, mediana iz statistics, meje po Gilbertovih rangih (od 1)
+    slopes = sorted((x[j] - x[i]) / (t[j] - t[i]) for i, j in combinations(range(n), 2)
+                    if np.isfinite(x[i]) and np.isfinite(x[j]))
+    c = trendi.Z_95 * math.sqrt(var_s)
+    m1 = max(1, math.floor((len(slopes) - c) / 2))
+    m2 = min(len(slopes), math.ceil((len(slopes) + c) / 2 + 1))
+    assert result["slope"] == pytest.approx(statistics.median(slopes), rel=1e-12)
+    assert result["lower"] == pytest.approx(slopes[m1 - 1], rel=1e-12)
+    assert result["upper"] == pytest.approx(slopes[m2 - 1], rel=1e-12)
+    assert result["lower"] <= result["slope"] <= result["upper"]
+
+
+def test_sens_slope_without_finite_slopes():
+    assert trendi.sens_slope(np.array([np.nan]), 1.0) == {"slope": None, "lower": None, "upper": None}
+
+
+def test_series_trend_recovers_linear_trend():
+    days = pd.date_range("2015-01-01", "2022-12-31", freq="D")
+    years = (days - days[0]).days.to_numpy() / 365.25
+    seasonal = 10 * np.cos(2 * np.pi * days.dayofyear.to_numpy() / 365.25)
+    daily = pd.Series(40 + 2.0 * years + seasonal, index=days)
+
+    result = trendi.series_trend(daily)
+
+    assert result["mann_kendall"]["trend"] == "increasing"
+    assert result["sen_slope_seasonal"]["slope"] == pytest.approx(2.0, abs=0.05)
+    assert result["sen_slope_daily"]["slope"] == pytest.approx(2.0, abs=0.5)
+    assert [entry["year"] for entry in result["annual"]] == list(range(2015, 2023))
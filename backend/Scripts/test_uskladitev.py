@@ -0,0 +1,91 @@
+"""
+Testi uskladitve ARSO in EEA: več postaj istega mesta se povpreči pred stikom,
+zgoščevalni stik ohrani vse ključe, izbira vrednosti sledi prednosti virov
+(nenavedeni viri so rezerva), način mean pa povpreči vire.
+"""
+
+import pandas as pd
+import pytest
+
+import uskladitev
+from enotni_podatki import SOURCE_SEPARATOR, UNIFIED_COLUMNS
+
+
+def unified(records):
+    rows = pd.DataFrame(records, columns=["source", "city", "pollutant", "date", "value", "station_id"])
+    rows["station_id"] = rows["station_id"].astype(object).where(rows["station_id"].notna(), None)
+    rows["year"] = rows["date"].str.slice(0, 4).astype(int)
+    rows["month"] = rows["date"].str.slice(5, 7).astype(int)
+    return rows[UNIFIED_COLUMNS]
+
+
+ROWS = unified([
+    # Celje 1. 1.: ARSO in dve postaji EEA (povprečje 45)
+    ("arso", "Celje", "PM10", "2024-01-01", 30.0, None),
+    ("eea", "Celje", "PM10", "2024-01-01", 50.0, "SI0002A"),
+    ("eea", "Celje", "PM10", "2024-01-01", 40.0, "SI0001A"),
+    # Celje 2. 1.: samo EEA; Koper 1. 1.: samo ARSO
+    ("eea", "Celje", "PM10", "2024-01-02", 20.0, "SI0001A"),
+    ("arso", "Koper", "PM10", "2024-01-01", 10.0, None),
+])
+
+
+def picked(result):
+    # Manjkajoč station_id je lahko None ali NaN; v CSV se oba zapišeta kot prazen niz
+    return {(row.city, row.date): (row.value, row.source, None if pd.isna(row.station_id) else row.station_id)
+            for row in result.itertuples()}
+
+
+def test_daily_by_source_averages_stations_of_a_city():
+    daily = uskladitev.daily_by_source(ROWS).set_index(["source", "city", "date"])
+
+    celje = daily.loc[("eea", "Celje", "2024-01-01")]
+    assert (celje["value"], celje["stations"], celje["station_id"]) == (45.0, 2, "SI0001A;SI0002A")
+    assert pd.isna(daily.loc[("arso", "Celje", "2024-01-01"), "station_id"])
+
+
+def test_hash_join_keeps_all_keys_and_measures_differences():
+    daily = uskladitev.daily_by_source(ROWS)
+    joined = uskladitev.join_sources(daily)
+
+    merge = joined.set_index(["city", "date"])["_merge"].astype(str).to_dict()
+    assert merge == {("Celje", "2024-01-01"): "both", ("Celje", "2024-01-02"): "right_only",
+                     ("Koper", "2024-01-01"): "left_only"}
+
+    diff = uskladitev.differences(joined)
+    assert diff[["city", "value_arso", "value_eea", "difference"]].values.tolist() == [["Celje", 30.0, 45.0, -15.0]]
+    assert diff["relative_difference"].iloc[0] == pytest.approx(-15 / 37.5)
+
+
+@pytest.mark.parametrize("priority, celje", [
+    (["arso", "eea"], (30.0, "arso", None)),
+    (["eea", "arso"], (45.0, "eea", "SI0001A;SI0002A")),
+    (["eea"], (45.0, "eea", "SI0001A;SI0002A")),
+])
+def test_priority_picks_highest_ranked_source_and_falls_back(priority, celje):
+    result = uskladitev.reconcile(uskladitev.daily_by_source(ROWS), priority)
+
+    assert list(result.columns) == UNIFIED_COLUMNS
+    assert picked(result) == {
+        ("Celje", "2024-01-01"): celje,
+        # Dneve, ki jih ima samo en vir, ohrani ne glede na prednost
+        ("Celje", "2024-01-02"): (20.0, "eea", "SI0001A"),
+        ("Koper", "2024-01-01"): (10.0, "arso", None),
+    }
+
+
+@pytest.mark.parametrize("priority", [["arso", "eea"], ["eea", "arso"]])
+def test_mean_averages_sources_after_averaging_stations(priority):
+    result = uskladitev.reconcile(uskladitev.daily_by_source(ROWS), priority, mode="mean")
+
+    value, source, station_id = picked(result)[("Celje", "2024-01-01")]
+    # (30 + (40 + 50) / 2) / 2, ne (30 + 40 + 50) / 3
+    assert value == 37.5
+    assert source == SOURCE_SEPARATOR.join(priority)
+    assert station_id == "SI0001A;SI0002A"
+    assert picked(result)[("Koper", "2024-01-01")][:2] == (10.0, "arso")
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        uskladitev.reconcile(uskladitev.daily_by_source(ROWS), mode="median")
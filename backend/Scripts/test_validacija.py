@@ -0,0 +1,93 @@
+"""
+Testi preverjanja kakovosti: zamik stolpcev v vrstici tabele ARSO se zazna,
+epizoda onesnaženja na vseh postajah pa ne; ugotovitve iz osnovnice se ločijo
+od novih, tudi na ARSO podatkih v data/ARSO.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import validacija
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+LEVELS = np.array([10, 40, 160, 20, 80, 320.0])
+
+
+def arso_table(seed, shifted_rows=(), episode_row=None, days=60):
+    """Tabela ARSO (dnevi x postaje) z običajnimi ravnmi postaj, skupnim dnevnim faktorjem in šumom"""
+    rng = np.random.default_rng(seed)
+    values = LEVELS * rng.lognormal(0, 0.15, size=(days, len(LEVELS))) * rng.lognormal(0, 0.4, size=(days, 1))
+    if episode_row is not None:
+        values[episode_row] *= 6
+    for row in shifted_rows:
+        # Vrednosti od druge postaje naprej so zamaknjene za en stolpec v levo, zadnja manjka
+        values[row, 1:-1] = values[row, 2:].copy()
+        values[row, -1] = np.nan
+
+    dates = pd.date_range("2019-01-01", periods=days)
+    rows = [
+        {"date": date, "station": f"S{column}", "value": round(values[i, column]), "column": column,
+         "file": "PM10_2019_all_test.json", "pollutant": "PM10", "source": "arso"}
+        for i, date in enumerate(dates) for column in range(len(LEVELS)) if np.isfinite(values[i, column])
+    ]
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_detects_row_shifted_by_one_column(seed):
+    shifts = validacija.check_column_shifts(arso_table(seed, shifted_rows=[30], episode_row=10))
+
+    assert shifts["date"].tolist() == [pd.Timestamp("2019-01-31")]
+    assert shifts["first_station"].tolist() == ["S1"]
+    assert (shifts["score"] > 4).all()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_episode_on_all_stations_is_not_a_shift(seed):
+    assert validacija.check_column_shifts(arso_table(seed, episode_row=10)).empty
+
+
+def test_baseline_separates_known_from_new_findings(tmp_path):
+    path = tmp_path / "baseline.json"
+    known_table = arso_table(0, shifted_rows=[30])
+    findings = validacija.validate(known_table)
+    validacija.write_baseline(path, findings, note="znano")
+
+    baseline = validacija.load_baseline(path)
+    assert set(baseline) == {"column_shifts"}
+    assert baseline["column_shifts"].to_dict("records") == [{"file": "PM10_2019_all_test.json", "date": "2019-01-31"}]
+
+    # Nov zamik v drugi vrstici ni v osnovnici
+    current = validacija.check_column_shifts(arso_table(0, shifted_rows=[30, 45]))
+    new, known = validacija.split_known(current, baseline["column_shifts"])
+    assert known == 1
+    assert new["date"].tolist() == [pd.Timestamp("2019-02-15")]
+
+    # Ponoven zapis ohrani opombo
+    validacija.write_baseline(path, findings)
+    assert validacija.read_json(path)["note"] == "znano"
+
+
+def test_missing_baseline_keeps_all_findings(tmp_path):
+    findings = validacija.check_column_shifts(arso_table(0, shifted_rows=[30]))
+    baseline = validacija.load_baseline(tmp_path / "ni.json")
+
+    assert baseline == {}
+    assert validacija.split_known(findings, baseline.get("column_shifts")) == (findings, 0)
+
+
+def test_committed_baseline_covers_committed_arso_reports():
+    df = validacija.load_arso(DATA_DIR / "ARSO")
+    if df.empty:
+        pytest.skip(f"ni ARSO podatkov v {DATA_DIR / 'ARSO'}")
+    findings = validacija.validate(df)
+    baseline = validacija.load_baseline(DATA_DIR / "validation_baseline.json")
+
+    assert set(findings["column_shifts"]["file"]) == {"PM10_2019_all_PM10_D_dec19_slo.json"}
+    for name, known in baseline.items():
+        new, count = validacija.split_known(findings[name], known)
+        assert new.empty, name
+        assert count == len(findings[name])
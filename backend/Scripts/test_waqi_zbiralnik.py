@@ -0,0 +1,121 @@
+"""
+Testi zbiralnika WAQI proti lokalnemu nadomestnemu strežniku (waqi_testni_streznik.py):
+ponovni poskus po 503, izločanje postaj zunaj Slovenije, dodajanje v Parquet arhiv
+in nadaljevanje zanke --interval, ko /map/bounds ne uspe.
+"""
+
+import asyncio
+from argparse import Namespace
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("pyarrow")
+
+import waqi_zbiralnik
+from waqi_testni_streznik import WaqiStandIn
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def start(fail=None, responses=None):
+        servers.append(WaqiStandIn(fail=fail, responses=responses).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def collect(server, retries=2, token="test"):
+    return asyncio.run(waqi_zbiralnik.collect_snapshot(server.base_url, token, retries=retries, timeout=5))
+
+
+def test_retries_after_503(server_factory):
+    server = server_factory({"/map/bounds/": (1, 503), "/feed/@9240/": (1, 503)})
+    snapshot = collect(server)
+
+    assert server.requests["/map/bounds/"] == 2
+    assert server.requests["/feed/@9240/"] == 2
+    assert sorted(snapshot["uid"]) == [9240, 9244]
+
+
+def test_station_failing_after_all_retries_is_skipped(server_factory):
+    server = server_factory({"/feed/@9244/": (5, 503)})
+    snapshot = collect(server, retries=1)
+
+    assert server.requests["/feed/@9244/"] == 2
+    assert snapshot["uid"].tolist() == [9240]
+
+
+def test_errors_do_not_print_token(server_factory, capsys):
+    server = server_factory({"/feed/@9240/": (5, 503)})
+    collect(server, retries=0, token="SECRET_TOKEN_123")
+
+    output = capsys.readouterr().out
+    assert "/feed/@9240/" in output and "HTTP 503" in output
+    assert "SECRET_TOKEN_123" not in output and "token=" not in output
+
+
+@pytest.mark.parametrize("payload", [[1, 2], None, "ok", {"status": "ok", "data": [1]}])
+def test_unexpected_feed_payload_skips_station(server_factory, capsys, payload):
+    server = server_factory(responses={"/feed/@9240/": payload})
+    snapshot = collect(server)
+
+    assert snapshot["uid"].tolist() == [9244]
+    assert "Ljubljana Bežigrad" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("payload", [None, [], {"status": "ok", "data": {"x": 1}}])
+def test_unexpected_bounds_payload_raises_waqi_error(server_factory, payload):
+    server = server_factory(responses={"/map/bounds/": payload})
+
+    with pytest.raises(waqi_zbiralnik.WaqiError):
+        collect(server)
+
+
+def test_keeps_only_slovenian_stations(server_factory):
+    server = server_factory()
+    snapshot = collect(server)
+
+    assert set(snapshot["station"]) == {"Ljubljana Bežigrad, Slovenia", "Maribor center, Slovenia"}
+    assert "/feed/@5389/" not in server.requests
+    maribor = snapshot.set_index("uid").loc[9244]
+    assert pd.isna(maribor["aqi"]) and pd.isna(maribor["pm25"])
+    assert maribor["pm10"] == 18
+
+
+def test_appends_hourly_partitions_with_stable_schema(server_factory, tmp_path):
+    server = server_factory()
+    snapshot = collect(server)
+    later = snapshot.assign(fetched_at=snapshot["fetched_at"] + pd.Timedelta(hours=1))
+
+    first = waqi_zbiralnik.append_to_archive(snapshot, tmp_path)
+    second = waqi_zbiralnik.append_to_archive(later, tmp_path)
+    # Ponovni zapis iste ure prepiše particijo namesto podvajanja vrstic
+    assert waqi_zbiralnik.append_to_archive(snapshot, tmp_path) == first
+
+    assert first != second
+    assert first.name == f"hour={snapshot['fetched_at'].iloc[0]:%H}.parquet"
+    archive = pd.concat(pd.read_parquet(path) for path in sorted(tmp_path.glob("date=*/hour=*.parquet")))
+    assert len(archive) == 2 * len(snapshot)
+    assert all(archive[column].dtype == "float64" for column in waqi_zbiralnik.VALUE_COLUMNS)
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_interval_loop_survives_bounds_failure(server_factory, tmp_path, capsys):
+    server = server_factory({"/map/bounds/": (1000, 503)})
+    args = Namespace(base_url=server.base_url, token="test", concurrency=2, retries=0, timeout=5,
+                     output=str(tmp_path), interval=0.001)
+
+    async def run_briefly():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(waqi_zbiralnik.run(args), timeout=0.5)
+
+    asyncio.run(run_briefly())
+    assert server.requests["/map/bounds/"] >= 2
+    assert "Napaka: seznama postaj ni bilo mogoče prebrati (/map/bounds/): HTTP 503" in capsys.readouterr().out
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,81 @@
+"""
+Testi zdravstvenih kategorij: pragovi se berejo iz iste datoteke kot v frontendu
+(airQualityScale.json, ki jo uporablja airQualityScale.ts), razvrstitev pa se
+ujema s pravilom t < meja iz TS tudi na samih mejah. Števila dni in nizi
+nezdravih dni se preverijo na ročno sestavljeni seriji.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import zdravje
+from serializacija import read_json
+
+SCALE_TS = zdravje.SCALE_CONFIG.with_name("airQualityScale.ts")
+GOOD, MODERATE, UNHEALTHY = range(3)
+
+
+def test_scale_is_read_from_the_frontend_config():
+    names, scale_max, default_max, bounds = zdravje.load_scale()
+    config = read_json(zdravje.SCALE_CONFIG)
+
+    assert names == ["good", "moderate", "unhealthy"]
+    assert scale_max == {"pm10": 100, "pm2.5": 60, "o3": 180, "no2": 150} == config["scaleMax"]
+    assert default_max == 100 == config["defaultScaleMax"]
+    assert bounds.tolist() == [0.30, 0.80]
+    assert config["badges"][-1]["below"] is None
+
+
+def test_frontend_uses_the_same_config_and_rule():
+    source = SCALE_TS.read_text(encoding="utf-8")
+
+    assert re.search(r"import scale from '\./airQualityScale\.json'", source)
+    assert "scaleMax[pollutant] ?? scale.defaultScaleMax" in source
+    assert "rawValue / scaleMax" in source
+    assert "b.below === null || t < b.below" in source
+
+
+@pytest.mark.parametrize("pollutant, values, expected", [
+    # Meje so maksimum lestvice x 0,30 in x 0,80; vrednost na meji spada v višjo kategorijo
+    ("PM10", [0, 29.9, 30, 79.9, 80, 250], [GOOD, GOOD, MODERATE, MODERATE, UNHEALTHY, UNHEALTHY]),
+    ("PM2.5", [17.9, 18, 47.9, 48], [GOOD, MODERATE, MODERATE, UNHEALTHY]),
+    ("O3", [53.9, 54, 143.9, 144], [GOOD, MODERATE, MODERATE, UNHEALTHY]),
+    ("NO2", [44.9, 45, 119.9, 120], [GOOD, MODERATE, MODERATE, UNHEALTHY]),
+    # Onesnaževalo brez lastne lestvice uporabi defaultScaleMax (100)
+    ("SO2", [29.9, 30, 80], [GOOD, MODERATE, UNHEALTHY]),
+    # 29.999999999999996 / 100 je natanko 0,3 (moderate v TS), čeprav je manj kot 100 * 0,3
+    ("PM10", [29.999999999999996], [MODERATE]),
+])
+def test_categories_match_frontend_thresholds(pollutant, values, expected):
+    names, scale_max, default_max, bounds = zdravje.load_scale()
+    maxima = zdravje.scale_maxima([pollutant], scale_max, default_max)
+
+    category = zdravje.categorize(np.array([values], dtype=float), maxima, bounds)
+
+    assert category[0].tolist() == expected
+
+
+def test_missing_values_have_no_category():
+    category = zdravje.categorize(np.array([[np.nan, 50.0]]), np.array([100.0]), np.array([0.3, 0.8]))
+
+    assert category.tolist() == [[-1, MODERATE]]
+
+
+def test_summary_counts_days_and_unhealthy_streaks():
+    calendar = np.arange("2024-01-30", "2024-02-05", dtype="datetime64[D]")
+    # 30. 1. do 4. 2.: nezdravi nizi dolžine 2 (čez konec meseca) in 1
+    matrix = np.array([[90.0, 95.0, 10.0, np.nan, 85.0, 40.0]])
+    series = pd.DataFrame({"city": ["Celje"], "pollutant": ["PM10"], "source": ["arso"]})
+    names, scale_max, default_max, bounds = zdravje.load_scale()
+    category = zdravje.categorize(matrix, zdravje.scale_maxima(series["pollutant"], scale_max, default_max), bounds)
+
+    summary = zdravje.summarize(series, calendar, category, names)
+
+    assert summary["months"] == ["2024-01", "2024-02"]
+    assert summary["monthly"] == [[[0, 0, 2], [1, 1, 1]]]
+    assert summary["yearly"] == [[[1, 1, 3]]]
+    assert summary["longest_streak"] == [[2]]
+    assert summary["streaks"] == [[0, "2024-01-30", 2]]
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Skripta za izračun trendov za vse serije mesto x onesnaževalo x vir.
+Za vsako serijo iz ARSO_Daily.csv in dnevnih podatkov EEA izračuna sezonski
+Mann-Kendallov test (sezona = mesec), Senov naklon z intervalom zaupanja
+in medletne spremembe. Parni nakloni (O(n²)) se računajo vektorsko po
+kosih. Rezultat je ena majhna JSON datoteka, ki jo API lahko vrne neposredno.
+"""
+
+import math
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enotni_podatki import load_unified_rows
+from serializacija import write_json
+
+MIN_DAYS_PER_MONTH = 10
+MIN_YEARS = 3
+PAIR_CHUNK = 512
+Z_95 = 1.959963984540054
+
+
+def _sign_ties_variance(values):
+    """Varianca statistike S za en niz vrednosti s popravkom za vezi"""
+    n = len(values)
+    _, counts = np.unique(values, return_counts=True)
+    ties = counts[counts > 1]
+    return (n * (n - 1) * (2 * n + 5) - np.sum(ties * (ties - 1) * (2 * ties + 5))) / 18.0
+
+
+def _z_and_p(s, var_s):
+    """Z-vrednost s popravkom za zveznost in dvostranska p-vrednost"""
+    if var_s <= 0:
+        return 0.0, 1.0
+    if s > 0:
+        z = (s - 1) / math.sqrt(var_s)
+    elif s < 0:
+        z = (s + 1) / math.sqrt(var_s)
+    else:
+        z = 0.0
+    return z, math.erfc(abs(z) / math.sqrt(2))
+
+
+def seasonal_mann_kendall(monthly):
+    """Sezonski Mann-Kendallov test nad matriko mesečnih povprečij (leta x 12, NaN = manjka)"""
+    upper = np.triu(np.ones((len(monthly), len(monthly)), dtype=bool), k=1)
+    # diff[i, j, m] = x[j, m] - x[i, m] za vse pare let hkrati
+    diff = monthly[None, :, :] - monthly[:, None, :]
+    s = float(np.nansum(np.sign(diff[upper])))
+
+    var_s = 0.0
+    for month in range(monthly.shape[1]):
+        values = monthly[:, month]
+        values = values[np.isfinite(values)]
+        if len(values) > 1:
+            var_s += _sign_ties_variance(values)
+
+    z, p = _z_and_p(s, var_s)
+    return {"S": s, "var_S": var_s, "Z": z, "p": p}
+
+
+def pairwise_slopes(t, x, chunk=PAIR_CHUNK):
+    """Vsi nakloni (x[j] - x[i]) / (t[j] - t[i]) za j > i, računani po kosih vrstic"""
+    n = len(x)
+    slopes = np.empty(n * (n - 1) // 2, dtype=np.float64)
+    columns = np.arange(n)
+    pos = 0
+    for start in range(0, n - 1, chunk):
+        rows = np.arange(start, min(start + chunk, n - 1))
+        mask = columns[None, :] > rows[:, None]
+        # Manjkajoče vrednosti (NaN) dajo NaN naklone, ki jih sens_slope izpusti
+        with np.errstate(invalid="ignore"):
+            block = ((x[None, :] - x[rows, None]) / (t[None, :] - t[rows, None]))[mask]
+        slopes[pos:pos + len(block)] = block
+        pos += len(block)
+    return slopes
+
+
+def sens_slope(slopes, var_s, z=Z_95):
+    """Senov naklon (mediana) in interval zaupanja iz ranga po varianci S"""
+    slopes = slopes[np.isfinite(slopes)]
+    n = len(slopes)
+    if n == 0:
+        return {"slope": None, "lower": None, "upper": None}
+    c = z * math.sqrt(max(var_s, 0.0))
+    lower_rank = int(max(0, math.floor((n - c) / 2) - 1))
+    upper_rank = int(min(n - 1, math.ceil((n + c) / 2)))
+    median = float(np.median(slopes))
+    ordered = np.partition(slopes, [lower_rank, upper_rank])
+    return {"slope": median, "lower": float(ordered[lower_rank]), "upper": float(ordered[upper_rank])}
+
+
+def monthly_matrix(daily):
+    """Mesečna povprečja kot matrika leta x 12; meseci z manj kot MIN_DAYS_PER_MONTH dnevi so NaN"""
+    grouped = daily.groupby([daily.index.year, daily.index.month]).agg(["mean", "count"])
+    grouped.loc[grouped["count"] < MIN_DAYS_PER_MONTH, "mean"] = np.nan
+    matrix = grouped["mean"].unstack().reindex(columns=range(1, 13))
+    return matrix.index.to_numpy(), matrix.to_numpy(dtype=float)
+
+
+def series_trend(daily):
+    """Statistike trenda za eno dnevno serijo (pd.Series z DatetimeIndex)"""
+    years, monthly = monthly_matrix(daily)
+    result = {
+        "first": daily.index.min().strftime("%Y-%m-%d"),
+        "last": daily.index.max().strftime("%Y-%m-%d"),
+        "days": int(len(daily)),
+    }
+
+    if len(years) >= MIN_YEARS:
+        mk = seasonal_mann_kendall(monthly)
+        mk["trend"] = "none" if mk["p"] >= 0.05 else ("increasing" if mk["S"] > 0 else "decreasing")
+        # Sezonski Senov naklon: nakloni samo med istimi meseci različnih let
+        seasonal = np.concatenate([
+            pairwise_slopes(years.astype(float), monthly[:, month]) for month in range(12)
+        ])
+        result["mann_kendall"] = mk
+        result["sen_slope_seasonal"] = sens_slope(seasonal, mk["var_S"])
+    else:
+        result["mann_kendall"] = None
+        result["sen_slope_seasonal"] = None
+
+    # Senov naklon na dnevnih vrednostih (na leto)
+    t = ((daily.index - daily.index.min()).days.to_numpy() / 365.25)
+    x = daily.to_numpy(dtype=float)
+    result["sen_slope_daily"] = sens_slope(pairwise_slopes(t, x), _sign_ties_variance(x))
+
+    annual = daily.groupby(daily.index.year).mean()
+    change = annual.diff()
+    change_pct = annual.pct_change(fill_method=None) * 100
+    result["annual"] = [
+        {
+            "year": int(year),
+            "mean": round(float(annual[year]), 3),
+            "change": None if pd.isna(change[year]) else round(float(change[year]), 3),
+            "change_pct": None if pd.isna(change_pct[year]) else round(float(change_pct[year]), 2),
+        }
+        for year in annual.index
+    ]
+    return result
+
+
+def compute_trends(rows):
+    """Trendi za vse serije; vrstice z istim mestom, onesnaževalom, virom in datumom se povprečijo"""
+    rows = rows.assign(date=pd.to_datetime(rows["date"]))
+    daily = rows.groupby(["city", "pollutant", "source", "date"])["value"].mean()
+
+    series = []
+    for (city, pollutant, source), values in daily.groupby(level=[0, 1, 2]):
+        values = values.droplevel([0, 1, 2]).sort_index()
+        if len(values) < 2:
+            continue
+        series.append({"city": city, "pollutant": pollutant, "source": source, **series_trend(values)})
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Izračuna Mann-Kendallove teste, Senove naklone in medletne spremembe za vse serije"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument(
+        "-o", "--output",
+        default="data/trends.json",
+        help="Izhodna JSON datoteka (privzeto: data/trends.json)"
+    )
+
+    args = parser.parse_args()
+
+    rows, warnings = load_unified_rows(args.data, sources=["arso", "eea"])
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if rows.empty:
+        print("Napaka: Ni dnevnih podatkov za izračun trendov!")
+        return
+
+    series = compute_trends(rows)
+    output = Path(args.output)
+    write_json(output, {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "method": {
+            "mann_kendall": "seasonal (season = month) on monthly means",
+            "min_days_per_month": MIN_DAYS_PER_MONTH,
+            "sen_slope_unit": "per year",
+            "confidence": 0.95,
+        },
+        "series": series,
+    }, mode="compact")
+
+    print(f"Shranjeno: {output} ({len(series)} serij)")
+
+
+if __name__ == "__main__":
+    main()
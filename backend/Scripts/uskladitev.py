@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Skripta za uskladitev prekrivajočih se dnevnih meritev ARSO in EEA.
+Postaje, ki poročajo obema viroma (npr. Ljubljana Bežigrad, Maribor, Celje),
+se v združenih podatkih pojavijo dvakrat. Skripta zgradi tabelo preslikav
+postaj v mesta, podatke obeh virov poveže z zgoščevalnim stikom po ključu
+(mesto, onesnaževalo, datum), izbere vrednost po nastavljivi prednosti virov
+in zapiše razlike med viri ter en sam dnevni nabor brez podvojitev.
+"""
+
+import json
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from enotni_podatki import (SOURCE_FILES, SOURCE_SEPARATOR, UNIFIED_COLUMNS, load_unified_rows, norm_city,
+                             norm_pollutant)
+from dnevni_izvoz import rows_to_csv_bytes, write_if_changed
+from serializacija import write_json
+
+JOIN_KEYS = ["city", "pollutant", "date"]
+OBSERVED_SOURCES = ["arso", "eea"]
+MAPPING_COLUMNS = ["source", "station", "city", "pollutant", "rows", "first", "last"]
+
+
+def station_mapping(rows, data_dir):
+    """Tabela preslikav postaja -> mesto za oba vira.
+    Postaje ARSO so imena iz ARSO_Daily.csv pred normalizacijo, postaje EEA so station_id."""
+    frames = []
+    arso_file = Path(data_dir) / SOURCE_FILES["arso"]
+    if arso_file.exists():
+        raw = pd.read_csv(arso_file, usecols=["date", "city", "pollutant"], dtype=str, keep_default_na=False)
+        frames.append(pd.DataFrame({
+            "source": "arso",
+            "station": raw["city"].str.strip(),
+            "city": raw["city"].map(norm_city),
+            "pollutant": raw["pollutant"].map(norm_pollutant),
+            "date": raw["date"].str.strip(),
+        }))
+
+    eea = rows[rows["source"] == "eea"]
+    if not eea.empty:
+        frames.append(eea.assign(station=eea["station_id"].fillna(""))[["source", "station", "city", "pollutant", "date"]])
+
+    if not frames:
+        return pd.DataFrame(columns=MAPPING_COLUMNS)
+    stations = pd.concat(frames, ignore_index=True)
+    mapping = stations.groupby(["source", "station", "city", "pollutant"], as_index=False).agg(
+        rows=("date", "size"), first=("date", "min"), last=("date", "max")
+    )
+    return mapping[MAPPING_COLUMNS]
+
+
+def _join_station_ids(frame, keys):
+    """Različni station_id po ključih, združeni z ";" (le vrstice, ki station_id imajo)"""
+    ids = frame.dropna(subset=["station_id"]).drop_duplicates(keys + ["station_id"])
+    return ids.sort_values("station_id").groupby(keys, sort=False)["station_id"].agg(";".join)
+
+
+def daily_by_source(rows):
+    """Ena vrednost na (vir, mesto, onesnaževalo, datum); več postaj istega mesta se povpreči"""
+    keys = ["source"] + JOIN_KEYS
+    grouped = rows.groupby(keys, sort=False)
+    daily = grouped["value"].mean().to_frame()
+    daily["stations"] = grouped["value"].size()
+    daily["station_id"] = _join_station_ids(rows, keys)
+    return daily.reset_index()
+
+
+def join_sources(daily, left="arso", right="eea"):
+    """Zgoščevalni stik dveh virov po (mesto, onesnaževalo, datum); ohrani vse ključe"""
+    joined = pd.merge(
+        daily[daily["source"] == left].drop(columns="source"),
+        daily[daily["source"] == right].drop(columns="source"),
+        on=JOIN_KEYS, how="outer", suffixes=(f"_{left}", f"_{right}"), indicator=True,
+    )
+    return joined
+
+
+def differences(joined, left="arso", right="eea"):
+    """Razlike med viroma za dneve, ki jih imata oba vira"""
+    both = joined[joined["_merge"] == "both"]
+    diff = pd.DataFrame({
+        "city": both["city"],
+        "pollutant": both["pollutant"],
+        "date": both["date"],
+        f"value_{left}": both[f"value_{left}"],
+        f"value_{right}": both[f"value_{right}"],
+    })
+    diff["difference"] = diff[f"value_{left}"] - diff[f"value_{right}"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (diff[f"value_{left}"] + diff[f"value_{right}"]) / 2
+        diff["relative_difference"] = np.where(mean > 0, diff["difference"] / mean, np.nan)
+    return diff.sort_values(JOIN_KEYS, ignore_index=True)
+
+
+def summarize_differences(diff, joined, left="arso", right="eea"):
+    """Povzetek prekrivanja in razlik po mestu in onesnaževalu"""
+    coverage = joined.groupby(["city", "pollutant", "_merge"], observed=True).size().unstack(fill_value=0)
+    stats = diff.assign(abs_difference=diff["difference"].abs()).groupby(["city", "pollutant"]).agg(
+        mean_difference=("difference", "mean"),
+        mean_abs_difference=("abs_difference", "mean"),
+        max_abs_difference=("abs_difference", "max"),
+        median_relative_difference=("relative_difference", "median"),
+    )
+    summary = coverage.join(stats, how="left").reset_index()
+    summary = summary.rename(columns={"left_only": f"only_{left}", "right_only": f"only_{right}", "both": "overlap"})
+    return json.loads(summary.round(3).to_json(orient="records", force_ascii=False))
+
+
+def source_ranks(priority):
+    """Rang vsakega vira: navedeni viri po vrsti, nenavedeni za njimi kot rezerva"""
+    order = list(priority) + [source for source in OBSERVED_SOURCES if source not in priority]
+    return {source: i for i, source in enumerate(order)}
+
+
+def reconcile(daily, priority=OBSERVED_SOURCES, mode="priority"):
+    """En zapis na (mesto, onesnaževalo, datum).
+
+    mode="priority": vrednost vira z najvišjo prednostjo (prvi v seznamu priority);
+    viri, ki jih priority ne navaja, ostanejo kot rezerva za dneve brez prednostnih virov.
+    mode="mean": povprečje vseh virov za ta dan; source so prispevajoči viri po prednosti,
+    združeni s SOURCE_SEPARATOR (npr. "arso+eea")."""
+    ranks = source_ranks(priority)
+    daily = daily.assign(rank=daily["source"].map(ranks)).sort_values(JOIN_KEYS + ["rank"], kind="stable")
+    if mode == "mean":
+        grouped = daily.groupby(JOIN_KEYS, sort=False)
+        result = grouped["value"].mean().to_frame()
+        result["source"] = grouped["source"].agg(SOURCE_SEPARATOR.join)
+        result["station_id"] = _join_station_ids(daily, JOIN_KEYS)
+        result = result.reset_index()
+    elif mode == "priority":
+        result = daily.drop_duplicates(JOIN_KEYS)
+    else:
+        raise ValueError(f"Neznan način uskladitve: {mode}")
+
+    result = result.sort_values(["source", "city", "pollutant", "date"], ignore_index=True)
+    result["year"] = result["date"].str.slice(0, 4).astype(int)
+    result["month"] = result["date"].str.slice(5, 7).astype(int)
+    return result[UNIFIED_COLUMNS]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Uskladi prekrivajoče se dnevne meritve ARSO in EEA v en nabor brez podvojitev"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument(
+        "-o", "--output",
+        default="data/Daily_reconciled.csv",
+        help="Usklajen dnevni CSV (privzeto: data/Daily_reconciled.csv)"
+    )
+    parser.add_argument("--priority", nargs="+", choices=OBSERVED_SOURCES, default=OBSERVED_SOURCES,
+                        help="Vrstni red prednosti virov; nenavedeni viri so rezerva (privzeto: arso eea)")
+    parser.add_argument("--mode", choices=["priority", "mean"], default="priority",
+                        help="Izbira vrednosti ob prekrivanju (privzeto: priority)")
+
+    args = parser.parse_args()
+    data_dir = Path(args.data)
+    output = Path(args.output)
+
+    rows, warnings = load_unified_rows(data_dir, sources=OBSERVED_SOURCES)
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if rows.empty:
+        print("Napaka: Ni dnevnih podatkov za uskladitev!")
+        return
+
+    mapping = station_mapping(rows, data_dir)
+    mapping_file = output.with_name("station_mapping.csv")
+    write_if_changed(mapping_file, rows_to_csv_bytes(MAPPING_COLUMNS, mapping.itertuples(index=False)))
+    print(f"Shranjeno: {mapping_file} ({len(mapping)} postaj)")
+
+    daily = daily_by_source(rows)
+    joined = join_sources(daily)
+    diff = differences(joined)
+    diff_file = output.with_name("reconciliation_differences.csv")
+    write_if_changed(diff_file, rows_to_csv_bytes(list(diff.columns), diff.round(3).itertuples(index=False)))
+    print(f"Shranjeno: {diff_file} ({len(diff)} dni s podatki obeh virov)")
+
+    result = reconcile(daily, args.priority, args.mode)
+    write_if_changed(output, rows_to_csv_bytes(UNIFIED_COLUMNS, result.fillna("").itertuples(index=False)))
+    print(f"Shranjeno: {output} ({len(rows)} -> {len(result)} vrstic)")
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "priority": args.priority,
+        "mode": args.mode,
+        "rows_in": {source: int(count) for source, count in rows["source"].value_counts().items()},
+        "rows_out": int(len(result)),
+        "series": summarize_differences(diff, joined),
+    }
+    report_file = output.with_name("reconciliation_report.json")
+    write_json(report_file, report)
+    print(f"Shranjeno: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Skripta za preverjanje kakovosti podatkov iz ARSO ekstraktorjev in EEA.
+Celotno zgodovino naloži v stolpčno tabelo in z vektorskimi operacijami
+poišče nemogoče vrednosti, podvojene ključe (datum, postaja), vrstice z
+zamaknjenimi stolpci in vrzeli v koledarju. Zapiše kratko poročilo in
+vrne izhodno kodo 1, če je preseženo katero od nastavljivih dovoljenj.
+Znane ugotovitve iz osnovnice (data/validation_baseline.json) se v poročilu
+navedejo posebej in se ne štejejo v dovoljenja.
+"""
+
+import sys
+import json
+import argparse
+import warnings
+from datetime import datetime, timezone
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from eea_branje import read_columns
+from serializacija import read_json, write_json
+
+# Razumen razpon dnevnih in urnih koncentracij v μg/m³ (CO v mg/m³)
+PLAUSIBLE_RANGES = {
+    "PM10": (0, 1000),
+    "PM2.5": (0, 800),
+    "O3": (0, 600),
+    "NO2": (0, 1000),
+    "NOx": (0, 2000),
+    "SO2": (0, 2000),
+    "CO": (0, 100),
+    "C6H6": (0, 100),
+}
+
+# Šifre onesnaževal v podatkih EEA
+EEA_POLLUTANT_CODES = {1: "SO2", 5: "PM10", 7: "O3", 8: "NO2", 9: "NOx", 10: "CO", 20: "C6H6", 6001: "PM2.5"}
+
+ARSO_POLLUTANTS = {"PM10": "PM10", "PM25": "PM2.5"}
+MAX_EXAMPLES = 20
+
+# Stolpci, po katerih se ugotovitev ujema z zapisom v osnovnici
+BASELINE_KEYS = {
+    "impossible_values": ["source", "pollutant", "station", "date"],
+    "conflicting_duplicates": ["source", "pollutant", "station", "date"],
+    "column_shifts": ["file", "date"],
+}
+
+
+def station_order(records):
+    """Vrstni red stolpcev tabele iz zaporedja postaj v vrsticah (postaje z '-' manjkajo)"""
+    sorter = TopologicalSorter()
+    for _, row in records.groupby("date", sort=False):
+        stations = row["station"].tolist()
+        for station in stations:
+            sorter.add(station)
+        for before, after in zip(stations, stations[1:]):
+            sorter.add(after, before)
+    return list(sorter.static_order())
+
+
+def load_arso(arso_dir):
+    """Naloži izhode ARSO ekstraktorjev (*_all_*.json) z vrstnim redom stolpcev"""
+    frames = []
+    for folder, pollutant in ARSO_POLLUTANTS.items():
+        for all_file in sorted(Path(arso_dir, folder).glob("*/*_all_*.json")):
+            data = read_json(all_file).get("data", [])
+            if not data:
+                continue
+            records = pd.DataFrame(data)[["date", "location", "value"]].rename(columns={"location": "station"})
+            order = station_order(records)
+            records["column"] = records["station"].map({station: i for i, station in enumerate(order)})
+            records["file"] = all_file.name
+            records["pollutant"] = pollutant
+            frames.append(records)
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df["source"] = "arso"
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def load_eea(eea_dirs):
+    """Naloži podatke EEA (seznam zapisov ali {"data": [...]}); ohrani dnevne in urne zapise"""
+    frames = []
+    for eea_dir in eea_dirs:
+        for json_file in sorted(Path(eea_dir).glob("*.json")):
+            records = read_columns(json_file)
+            if len(records["Value"]) == 0:
+                continue
+            pollutant = pd.Series(records["Pollutant"])
+            frames.append(pd.DataFrame({
+                "date": records["Start"],
+                "station": records["Samplingpoint"],
+                "value": records["Value"],
+                "pollutant": pollutant.map(EEA_POLLUTANT_CODES).fillna(pollutant.astype(str)),
+                "agg": records["AggType"],
+                "valid": np.nan_to_num(records["Validity"], nan=1) >= 1,
+                "file": json_file.name,
+            }))
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["valid"]].drop(columns="valid")
+    df["source"] = "eea"
+    return df
+
+
+def check_impossible(df):
+    """Vrednosti, ki niso končne ali so zunaj razumnega razpona za onesnaževalo"""
+    bounds = df["pollutant"].map(PLAUSIBLE_RANGES)
+    low = bounds.map(lambda b: b[0] if isinstance(b, tuple) else 0)
+    high = bounds.map(lambda b: b[1] if isinstance(b, tuple) else np.inf)
+    mask = ~np.isfinite(df["value"]) | (df["value"] < low) | (df["value"] > high)
+    return df[mask]
+
+
+def check_duplicates(df):
+    """Podvojeni ključi (vir, onesnaževalo, postaja, datum); conflicting = različne vrednosti"""
+    keys = ["source", "pollutant", "station", "date"] + (["agg"] if "agg" in df else [])
+    grouped = df.groupby(keys, dropna=False)["value"].agg(["count", "nunique"])
+    duplicates = grouped[grouped["count"] > 1].reset_index()
+    duplicates["conflicting"] = duplicates["nunique"] > 1
+    return duplicates.drop(columns="nunique")
+
+
+def check_column_shifts(df, z_threshold=4.0, min_run=3):
+    """Vrstice, kjer zaporedne postaje odstopajo tako, kot da so vrednosti zamaknjene za en stolpec.
+
+    Vrednosti vrstice se normalizirajo z mediano vrstice (izloči epizode onesnaženja),
+    nato se za vsako postajo primerjajo z njenim običajnim odmikom. Vrednost je sumljiva,
+    če močno odstopa in bolje ustreza naslednji postaji v tabeli; vrstica je označena,
+    če ima vsaj min_run zaporednih sumljivih stolpcev."""
+    findings = []
+    for (file, pollutant), group in df.groupby(["file", "pollutant"]):
+        wide = group.pivot_table(index="date", columns="column", values="value", aggfunc="first").sort_index(axis=1)
+        if wide.shape[1] < 3:
+            continue
+
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            values = np.log1p(wide.to_numpy(dtype=float))
+            enough = (np.isfinite(values).sum(axis=1) >= 3)[:, None]
+            relative = values - np.nanmedian(values, axis=1, keepdims=True)
+            offset = np.nanmedian(relative, axis=0)
+            spread = 1.4826 * np.nanmedian(np.abs(relative - offset), axis=0)
+            spread = np.where(spread > 0, spread, np.nan)
+
+            score_self = np.abs(relative - offset) / spread
+            score_next = np.full_like(score_self, np.inf)
+            score_next[:, :-1] = np.abs(relative[:, :-1] - offset[1:]) / spread[1:]
+            suspect = enough & (score_self > z_threshold) & (score_next < score_self)
+
+        run = suspect.copy()
+        for k in range(1, min_run):
+            run[:, :-k] &= suspect[:, k:]
+            run[:, -k:] = False
+        rows, columns = np.nonzero(run)
+        stations = group.drop_duplicates("column").set_index("column")["station"]
+        for row, column in zip(rows, columns):
+            findings.append({
+                "file": file,
+                "pollutant": pollutant,
+                "date": wide.index[row],
+                "first_station": stations.get(wide.columns[column]),
+                "score": float(score_self[row, column]),
+            })
+
+    result = pd.DataFrame(findings, columns=["file", "pollutant", "date", "first_station", "score"])
+    return result.drop_duplicates(["file", "date"])
+
+
+def check_calendar_gaps(df, min_gap_days=7):
+    """Vrzeli v koledarju posamezne serije, daljše od min_gap_days dni"""
+    days = df.assign(day=df["date"].dt.normalize())[["source", "pollutant", "station", "day"]].drop_duplicates()
+    days = days.sort_values(["source", "pollutant", "station", "day"])
+    series = ["source", "pollutant", "station"]
+    gap = days.groupby(series)["day"].diff().dt.days - 1
+    gaps = days.assign(gap_days=gap, gap_start=days.groupby(series)["day"].shift(1) + pd.Timedelta(days=1))
+    gaps = gaps[gaps["gap_days"] >= min_gap_days]
+    gaps = gaps.assign(gap_end=gaps["day"] - pd.Timedelta(days=1))
+    return gaps[series + ["gap_start", "gap_end", "gap_days"]]
+
+
+def format_dates(frame):
+    """Datumske stolpce zapiše kot besedilo (ura le, če ni polnoč)"""
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].dt.strftime("%Y-%m-%d %H:%M").str.replace(" 00:00", "")
+    return frame
+
+
+def summarize(findings, known=0):
+    """Povzetek ugotovitev: število, število znanih iz osnovnice in nekaj primerov za poročilo"""
+    examples = format_dates(findings.head(MAX_EXAMPLES))
+    return {"count": int(len(findings)), "known": int(known),
+            "examples": json.loads(examples.to_json(orient="records"))}
+
+
+def load_baseline(path):
+    """Prebere osnovnico znanih ugotovitev; vrne {preverba: tabela ključev}"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    baseline = read_json(path)
+    return {name: pd.DataFrame(baseline[name], dtype=str) for name in BASELINE_KEYS if baseline.get(name)}
+
+
+def split_known(findings, known):
+    """Razdeli ugotovitve na nove in tiste, ki so že v osnovnici; vrne (nove, število znanih)"""
+    if known is None or findings.empty:
+        return findings, 0
+    keys = list(known.columns)
+    matched = format_dates(findings[keys]).astype(str).merge(
+        known.drop_duplicates(), how="left", on=keys, indicator=True
+    )["_merge"].to_numpy() == "both"
+    return findings[~matched], int(matched.sum())
+
+
+def write_baseline(path, findings, note=None):
+    """Zapiše trenutne ugotovitve kot osnovnico; obstoječa opomba se ohrani"""
+    path = Path(path)
+    if note is None and path.exists():
+        note = read_json(path).get("note")
+    baseline = {"note": note or ""}
+    for name, keys in BASELINE_KEYS.items():
+        if not findings[name].empty:
+            rows = format_dates(findings[name][keys]).astype(str).drop_duplicates()
+            baseline[name] = rows.sort_values(keys).to_dict("records")
+    write_json(path, baseline)
+    return baseline
+
+
+def validate(df, z_threshold=4.0, min_run=3, min_gap_days=7):
+    """Izvede vse preverbe nad tabelo in vrne slovar ugotovitev"""
+    duplicates = check_duplicates(df)
+    arso = df[df["source"] == "arso"]
+    return {
+        "impossible_values": check_impossible(df),
+        "duplicate_keys": duplicates,
+        "conflicting_duplicates": duplicates[duplicates["conflicting"]],
+        "column_shifts": check_column_shifts(arso, z_threshold, min_run) if not arso.empty else pd.DataFrame(),
+        "calendar_gaps": check_calendar_gaps(df, min_gap_days),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Preveri kakovost podatkov ARSO in EEA ter zapiše poročilo"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s podatki (privzeto: data)")
+    parser.add_argument(
+        "-o", "--output",
+        default="data/validation_report.json",
+        help="Datoteka s poročilom (privzeto: data/validation_report.json)"
+    )
+    parser.add_argument("--z-threshold", type=float, default=4.0,
+                        help="Prag robustne z-vrednosti za zamaknjene stolpce (privzeto: 4)")
+    parser.add_argument("--min-run", type=int, default=3,
+                        help="Najmanjše število zaporednih sumljivih stolpcev v vrstici (privzeto: 3)")
+    parser.add_argument("--gap-days", type=int, default=7,
+                        help="Najkrajša vrzel v dneh, ki se poroča (privzeto: 7)")
+    parser.add_argument("--max-impossible", type=int, default=0,
+                        help="Dovoljeno število nemogočih vrednosti (privzeto: 0)")
+    parser.add_argument("--max-conflicts", type=int, default=0,
+                        help="Dovoljeno število podvojenih ključev z različnimi vrednostmi (privzeto: 0)")
+    parser.add_argument("--max-shifts", type=int, default=10,
+                        help="Dovoljeno število vrstic z zamaknjenimi stolpci (privzeto: 10)")
+    parser.add_argument("--max-gaps", type=int, default=-1,
+                        help="Dovoljeno število vrzeli v koledarju (privzeto: -1 = brez omejitve)")
+    parser.add_argument("-b", "--baseline", default="data/validation_baseline.json",
+                        help="Osnovnica znanih ugotovitev, ki se ne štejejo v dovoljenja "
+                             "(privzeto: data/validation_baseline.json)")
+    parser.add_argument("--no-baseline", action="store_true", help="Ne upoštevaj osnovnice")
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Trenutne ugotovitve zapiši kot novo osnovnico")
+
+    args = parser.parse_args()
+    data_dir = Path(args.data)
+
+    frames = [
+        load_arso(data_dir / "ARSO"),
+        load_eea([data_dir / "EEA_historical_data", data_dir / "EEA_podatki" / "po_postajah"]),
+    ]
+    df = pd.concat([frame for frame in frames if not frame.empty], ignore_index=True)
+    findings = validate(df, args.z_threshold, args.min_run, args.gap_days)
+
+    if args.write_baseline:
+        baseline = write_baseline(args.baseline, findings)
+        print(f"Osnovnica shranjena: {args.baseline} "
+              f"({sum(len(baseline.get(name, [])) for name in BASELINE_KEYS)} zapisov)")
+
+    baseline = {} if args.no_baseline else load_baseline(args.baseline)
+    known = {}
+    for name in findings:
+        findings[name], known[name] = split_known(findings[name], baseline.get(name))
+
+    limits = {
+        "impossible_values": args.max_impossible,
+        "conflicting_duplicates": args.max_conflicts,
+        "column_shifts": args.max_shifts,
+        "calendar_gaps": args.max_gaps,
+    }
+    failed = [name for name, limit in limits.items() if limit >= 0 and len(findings[name]) > limit]
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": {source: int(count) for source, count in df["source"].value_counts().items()},
+        "limits": limits,
+        "passed": not failed,
+        "failed_checks": failed,
+        "baseline": None if args.no_baseline else args.baseline,
+        "checks": {name: summarize(result, known[name]) for name, result in findings.items()},
+    }
+    output = Path(args.output)
+    write_json(output, report)
+
+    for name, result in findings.items():
+        print(f"{name}: {len(result)}" + (f" (znanih iz osnovnice: {known[name]})" if known[name] else ""))
+    print(f"Shranjeno: {output}")
+
+    if failed:
+        print(f"Napaka: Preseženo dovoljenje za: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Lokalni nadomestni strežnik WAQI API-ja s pripravljenimi odgovori za
+/map/bounds/ in /feed/@<uid>/. Namenjen je preizkusu waqi_zbiralnik.py brez
+žetona in omrežja; izbrane poti lahko prvih N zahtevkov vrnejo napako (npr. 503)
+ali pa stalno vrnejo podan odgovor (npr. seznam ali null namesto objekta).
+
+Primer:
+    python Scripts/waqi_testni_streznik.py --port 8765 --fail /map/bounds/=1
+    python Scripts/waqi_zbiralnik.py --token test --base-url http://127.0.0.1:8765
+"""
+
+import json
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Dve slovenski postaji in ena hrvaška, ki jo /map/bounds vrne zaradi pravokotnega območja
+BOUNDS = [
+    {"lat": 46.065497, "lon": 14.512793, "uid": 9240, "aqi": "42",
+     "station": {"name": "Ljubljana Bežigrad, Slovenia", "time": "2026-10-19T10:00:00+02:00"}},
+    {"lat": 46.559, "lon": 15.6455, "uid": 9244, "aqi": "-",
+     "station": {"name": "Maribor center, Slovenia", "time": "2026-10-19T10:00:00+02:00"}},
+    {"lat": 45.8006, "lon": 15.9713, "uid": 5389, "aqi": "37",
+     "station": {"name": "Zagreb-1, Croatia", "time": "2026-10-19T10:00:00+02:00"}},
+]
+
+FEEDS = {
+    9240: {"aqi": 42, "idx": 9240, "dominentpol": "pm10",
+           "iaqi": {"pm10": {"v": 42}, "pm25": {"v": 31}, "no2": {"v": 12.5}, "o3": {"v": 8},
+                    "t": {"v": 14.2}, "h": {"v": 81}, "p": {"v": 1021}, "w": {"v": 1.5}},
+           "time": {"iso": "2026-10-19T10:00:00+02:00"}},
+    9244: {"aqi": "-", "idx": 9244, "dominentpol": "",
+           "iaqi": {"pm10": {"v": 18}, "t": {"v": 12}},
+           "time": {"iso": "2026-10-19T10:00:00+02:00"}},
+    5389: {"aqi": 37, "idx": 5389, "dominentpol": "pm25",
+           "iaqi": {"pm25": {"v": 37}},
+           "time": {"iso": "2026-10-19T10:00:00+02:00"}},
+}
+
+
+class WaqiStandIn(ThreadingHTTPServer):
+    """HTTP strežnik s pripravljenimi odgovori; fail = {pot: (število napak, status)},
+    responses = {pot: telo JSON}, ki nadomesti pripravljen odgovor za pot"""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), fail=None, responses=None):
+        super().__init__(address, _Handler)
+        self.fail = dict(fail or {})
+        self.responses = dict(responses or {})
+        self.requests = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, path):
+        """Vrne (status, telo) za pot; šteje zahtevke in porabi nastavljene napake"""
+        with self._lock:
+            self.requests[path] += 1
+            failures, status = self.fail.get(path, (0, 503))
+            if failures:
+                self.fail[path] = (failures - 1, status)
+                return status, {"status": "error", "data": "Service Unavailable"}
+
+        if path in self.responses:
+            return 200, self.responses[path]
+        if path == "/map/bounds/":
+            return 200, {"status": "ok", "data": BOUNDS}
+        if path.startswith("/feed/@"):
+            uid = path[len("/feed/@"):].strip("/")
+            if uid.isdigit() and int(uid) in FEEDS:
+                return 200, {"status": "ok", "data": FEEDS[int(uid)]}
+            return 200, {"status": "error", "data": "Unknown station"}
+        return 404, {"status": "error", "data": "Not found"}
+
+    def start(self):
+        """Zažene strežnik v ozadni niti in vrne sebe"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, payload = self.server.respond(urlsplit(self.path).path)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_fail(value):
+    """Pretvori 'pot=N' ali 'pot=N:status' v (pot, (N, status))"""
+    path, _, spec = value.partition("=")
+    count, _, status = spec.partition(":")
+    return path, (int(count or 1), int(status or 503))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokalni nadomestni strežnik WAQI API-ja za preizkuse")
+    parser.add_argument("--host", default="127.0.0.1", help="Naslov (privzeto: 127.0.0.1)")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="Vrata (privzeto: 8765)")
+    parser.add_argument("--fail", action="append", type=parse_fail, default=[],
+                        help="Prvih N zahtevkov na pot vrne napako, npr. /map/bounds/=2 ali /feed/@9240/=1:429")
+
+    args = parser.parse_args()
+
+    server = WaqiStandIn((args.host, args.port), dict(args.fail))
+    print(f"WAQI nadomestni strežnik: {server.base_url} (Ctrl+C za izhod)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Skripta za zbiranje trenutnih podatkov WAQI za vse slovenske postaje.
+Postaje prebere sočasno (omejeno s semaforjem, z eno skupno HTTP sejo in
+ponovnimi poskusi) in vsak posnetek doda v Parquet arhiv, razdeljen po datumu.
+"""
+
+import os
+import asyncio
+import argparse
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+import pandas as pd
+
+DEFAULT_BASE_URL = "https://api.waqi.info"
+# Slovenija: lat1,lng1,lat2,lng2 (enako kot getSloveniaStations v get_current_data.ts)
+SLOVENIA_BOUNDS = "46.8766,13.2812,45.4215,16.5961"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Stolpci z vrednostmi so vedno float, da imajo vse particije arhiva enako shemo
+VALUE_COLUMNS = ["aqi", "pm10", "pm25", "no2", "o3", "temperature", "humidity", "pressure", "wind"]
+
+
+class WaqiError(Exception):
+    """Napaka, ki jo vrne WAQI API (status 'error') ali nepričakovana oblika odgovora"""
+
+
+def describe_error(e):
+    """Kratek opis napake za izpis; URL zahtevka vsebuje žeton, zato se nikoli ne izpiše"""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return f"HTTP {e.status}"
+    if isinstance(e, asyncio.TimeoutError):
+        return "časovna omejitev"
+    if isinstance(e, WaqiError):
+        return str(e)
+    return type(e).__name__
+
+
+async def fetch_json(session, url, params, retries=3, backoff=0.5):
+    """Prebere JSON z URL-ja; ob omrežnih napakah in 429/5xx poskusi znova z eksponentnim zamikom"""
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, params=params) as response:
+                response.raise_for_status()
+                try:
+                    payload = await response.json(content_type=None)
+                except ValueError:
+                    raise WaqiError("Odgovor ni veljaven JSON") from None
+        except aiohttp.ClientResponseError as e:
+            if e.status not in RETRY_STATUSES or attempt == retries:
+                raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        else:
+            if not isinstance(payload, dict):
+                raise WaqiError(f"Nepričakovan odgovor: {type(payload).__name__}")
+            if payload.get("status") != "ok" or isinstance(payload.get("data"), str):
+                raise WaqiError(payload.get("data") if isinstance(payload.get("data"), str) else "Unknown API error")
+            return payload["data"]
+
+        await asyncio.sleep(backoff * 2 ** attempt + random.uniform(0, backoff))
+
+
+async def get_slovenia_stations(session, base_url, token, retries=3):
+    """Vrne seznam slovenskih postaj iz /map/bounds"""
+    data = await fetch_json(
+        session, f"{base_url}/map/bounds/", {"token": token, "latlng": SLOVENIA_BOUNDS}, retries
+    )
+    if not isinstance(data, list):
+        raise WaqiError(f"Nepričakovan seznam postaj: {type(data).__name__}")
+    return [station for station in data if station["station"]["name"].endswith("Slovenia")]
+
+
+def station_snapshot(station, data, fetched_at):
+    """Pretvori odgovor /feed za eno postajo v vrstico posnetka"""
+    iaqi = data.get("iaqi", {})
+    aqi = data.get("aqi")
+    return {
+        "fetched_at": fetched_at,
+        "uid": int(station["uid"]),
+        "station": station["station"]["name"],
+        "lat": float(station["lat"]),
+        "lon": float(station["lon"]),
+        "aqi": aqi if isinstance(aqi, (int, float)) else None,
+        "dominant_pollutant": data.get("dominentpol"),
+        "pm10": iaqi.get("pm10", {}).get("v"),
+        "pm25": iaqi.get("pm25", {}).get("v"),
+        "no2": iaqi.get("no2", {}).get("v"),
+        "o3": iaqi.get("o3", {}).get("v"),
+        "temperature": iaqi.get("t", {}).get("v"),
+        "humidity": iaqi.get("h", {}).get("v"),
+        "pressure": iaqi.get("p", {}).get("v"),
+        "wind": iaqi.get("w", {}).get("v"),
+        "measured_at": data.get("time", {}).get("iso"),
+    }
+
+
+async def collect_snapshot(base_url, token, concurrency=8, retries=3, timeout=20):
+    """Sočasno prebere podatke vseh slovenskih postaj in vrne posnetek kot DataFrame"""
+    fetched_at = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        stations = await get_slovenia_stations(session, base_url, token, retries)
+
+        async def fetch_station(station):
+            async with semaphore:
+                path = f"/feed/@{station['uid']}/"
+                try:
+                    data = await fetch_json(session, f"{base_url}{path}", {"token": token}, retries)
+                    if not isinstance(data, dict):
+                        raise WaqiError(f"Nepričakovani podatki postaje: {type(data).__name__}")
+                except (aiohttp.ClientError, asyncio.TimeoutError, WaqiError) as e:
+                    print(f"Opozorilo: postaje {station['station']['name']} ni bilo mogoče prebrati "
+                          f"({path}): {describe_error(e)}")
+                    return None
+                return station_snapshot(station, data, fetched_at)
+
+        rows = await asyncio.gather(*(fetch_station(station) for station in stations))
+
+    snapshot = pd.DataFrame([row for row in rows if row is not None])
+    if not snapshot.empty:
+        snapshot[VALUE_COLUMNS] = snapshot[VALUE_COLUMNS].astype("float64")
+    return snapshot
+
+
+def append_to_archive(snapshot, archive_dir):
+    """Doda posnetek v arhiv: <arhiv>/date=YYYY-MM-DD/hour=HH.parquet"""
+    if snapshot.empty:
+        return None
+    fetched_at = snapshot["fetched_at"].iloc[0]
+    partition_dir = Path(archive_dir) / f"date={fetched_at:%Y-%m-%d}"
+    partition_dir.mkdir(parents=True, exist_ok=True)
+
+    # Ponovni zagon v isti uri prepiše posnetek te ure, zato je dodajanje idempotentno
+    output_file = partition_dir / f"hour={fetched_at:%H}.parquet"
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    snapshot.to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+async def run(args):
+    while True:
+        try:
+            snapshot = await collect_snapshot(args.base_url, args.token, args.concurrency, args.retries, args.timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError, WaqiError) as e:
+            # Neuspešen seznam postaj ne sme končati zanke --interval; poskusi znova v naslednjem ciklu
+            print(f"Napaka: seznama postaj ni bilo mogoče prebrati (/map/bounds/): {describe_error(e)}")
+        else:
+            output_file = append_to_archive(snapshot, args.output)
+            if output_file:
+                print(f"Shranjeno: {output_file} ({len(snapshot)} postaj)")
+            else:
+                print("Opozorilo: Ni bilo prebranih podatkov nobene postaje!")
+
+        if not args.interval:
+            return
+        await asyncio.sleep(args.interval * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sočasno zbere trenutne podatke WAQI za slovenske postaje in jih arhivira v Parquet"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="data/WAQI_arhiv",
+        help="Mapa Parquet arhiva (privzeto: data/WAQI_arhiv)"
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("AQODP_Token"),
+        help="WAQI žeton (privzeto: spremenljivka okolja AQODP_Token)"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("WAQI_BASE_URL", DEFAULT_BASE_URL),
+        help=f"Osnovni URL WAQI API-ja, npr. lokalni testni strežnik (privzeto: {DEFAULT_BASE_URL})"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=8,
+        help="Največje število sočasnih zahtevkov (privzeto: 8)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Število ponovnih poskusov ob napaki (privzeto: 3)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=20,
+        help="Časovna omejitev zahtevka v sekundah (privzeto: 20)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="Ponavljaj zbiranje vsakih N minut (privzeto: 0 = samo enkrat)"
+    )
+
+    args = parser.parse_args()
+
+    if not args.token:
+        print("Napaka: WAQI žeton ni nastavljen (AQODP_Token ali --token)!")
+        return
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Skripta za predizračun zdravstvenih kategorij dnevnih koncentracij.
+Vsako dnevno vrednost ARSO in EEA v enem vektoriziranem koraku razvrsti v
+kategorijo (good / moderate / unhealthy) z istimi pragovi, kot jih uporablja
+frontend (frontend/src/MapView/airQualityScale.json). Za vsako serijo
+mesto x onesnaževalo x vir prešteje dni po kategorijah za vsak mesec in leto
+ter poišče nize zaporednih dni v kategoriji "unhealthy". Rezultat je ena
+majhna indeksirana datoteka JSON, ki jo pogledi zdravja naložijo neposredno.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from enotni_podatki import load_unified_rows
+from prevzorcenje import to_dense
+from serializacija import read_json, write_json
+
+SCALE_CONFIG = Path(__file__).resolve().parents[2] / "frontend" / "src" / "MapView" / "airQualityScale.json"
+MIN_STREAK = 2
+
+
+def load_scale(path=SCALE_CONFIG):
+    """Prebere skupne pragove; vrne (imena kategorij, največje vrednosti lestvice, privzeti maksimum, meje)"""
+    config = read_json(path)
+    names = [band["badge"] for band in config["badges"]]
+    bounds = [band["below"] for band in config["badges"] if band["below"] is not None]
+    return names, config["scaleMax"], config["defaultScaleMax"], np.array(bounds, dtype=float)
+
+
+def scale_maxima(pollutants, scale_max, default_max):
+    """Največja vrednost lestvice za vsako serijo (kot getHeatMaxValue v airQualityScale.ts)"""
+    return np.array([scale_max.get(str(p).lower(), default_max) for p in pollutants], dtype=float)
+
+
+def categorize(matrix, maxima, bounds):
+    """Kategorija za vsako celico matrike (serije x dnevi); maxima so največje vrednosti lestvice po vrsticah.
+    Vrednost se normalizira kot v TS (t = vrednost / maksimum) in primerja z mejami, da se ujema tudi
+    na sami meji: t, enak meji, spada v višjo kategorijo (kot t < meja v TS). Manjkajoče vrednosti dobijo -1."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normalized = matrix / maxima[:, None]
+        category = (normalized[:, :, None] >= bounds[None, None, :]).sum(axis=2)
+    return np.where(np.isfinite(matrix), category, -1).astype(np.int8)
+
+
+def period_counts(category, period_index, periods, categories):
+    """Števila dni po kategorijah (serije x obdobja x kategorije) z enim bincount"""
+    series = category.shape[0]
+    valid = category >= 0
+    rows = np.broadcast_to(np.arange(series)[:, None], category.shape)[valid]
+    cells = (rows * periods + np.broadcast_to(period_index, category.shape)[valid]) * categories + category[valid]
+    return np.bincount(cells, minlength=series * periods * categories).reshape(series, periods, categories)
+
+
+def streaks(mask):
+    """Nizi zaporednih True po vrsticah; vrne (vrstica, začetni indeks, dolžina)"""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    # np.nonzero vrne po vrsticah urejene indekse, zato se začetki in konci ujemajo
+    return start_rows, starts, ends - starts
+
+
+def summarize(series, calendar, category, names, min_streak=MIN_STREAK):
+    """Sestavi indeksiran povzetek: seznam serij, obdobja in tabele števil po indeksih"""
+    months = calendar.astype("datetime64[M]")
+    years = calendar.astype("datetime64[Y]")
+    month_labels, month_index = np.unique(months, return_inverse=True)
+    year_labels, year_index = np.unique(years, return_inverse=True)
+
+    monthly = period_counts(category, month_index, len(month_labels), len(names))
+    yearly = period_counts(category, year_index, len(year_labels), len(names))
+
+    unhealthy = category == len(names) - 1
+    rows, starts, lengths = streaks(unhealthy)
+    longest = np.zeros((len(series), len(year_labels)), dtype=np.int64)
+    np.maximum.at(longest, (rows, year_index[starts]), lengths)
+
+    keep = lengths >= min_streak
+    order = np.lexsort((-lengths[keep], rows[keep]))
+    streak_rows = rows[keep][order]
+
+    return {
+        "categories": names,
+        "series": series.to_dict("records"),
+        "months": [str(m) for m in month_labels],
+        "years": [int(str(y)) for y in year_labels],
+        "monthly": monthly.tolist(),
+        "yearly": yearly.tolist(),
+        "longest_streak": longest.tolist(),
+        "streaks": [
+            [int(row), str(calendar[start]), int(length)]
+            for row, start, length in zip(streak_rows, starts[keep][order], lengths[keep][order])
+        ],
+        "min_streak": min_streak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prešteje dni po zdravstvenih kategorijah in nize nezdravih dni po mestih in onesnaževalih"
+    )
+    parser.add_argument("-d", "--data", default="data", help="Mapa s CSV podatki (privzeto: data)")
+    parser.add_argument("-o", "--output", default="data/health_categories.json",
+                        help="Izhodna datoteka (privzeto: data/health_categories.json)")
+    parser.add_argument("-c", "--config", default=str(SCALE_CONFIG),
+                        help="Skupni pragovi kategorij (privzeto: frontend/src/MapView/airQualityScale.json)")
+    parser.add_argument("--min-streak", type=int, default=MIN_STREAK,
+                        help="Najkrajši niz nezdravih dni, ki se zapiše (privzeto: 2)")
+
+    args = parser.parse_args()
+
+    rows, warnings = load_unified_rows(args.data, sources=["arso", "eea"])
+    for warning in warnings:
+        print(f"Opozorilo: {warning}")
+    if rows.empty:
+        print("Napaka: Ni dnevnih podatkov!")
+        return
+
+    names, scale_max, default_max, bounds = load_scale(args.config)
+    series, calendar, matrix = to_dense(rows)
+    category = categorize(matrix, scale_maxima(series["pollutant"], scale_max, default_max), bounds)
+    summary = summarize(series, calendar, category, names, args.min_streak)
+
+    size = write_json(args.output, summary, "compact")
+    totals = np.bincount(category[category >= 0], minlength=len(names))
+    print(f"Serije: {len(series)}, dni po kategorijah: "
+          + ", ".join(f"{name} {int(count)}" for name, count in zip(names, totals)))
+    print(f"Shranjeno: {args.output} ({len(summary['streaks'])} nizov, {size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
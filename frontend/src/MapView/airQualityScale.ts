@@ -1,4 +1,6 @@
 import type { PollutantType } from '@/store/useStore';
+// Thresholds are shared with the backend (backend/Scripts/zdravje.py reads the same file).
+import scale from './airQualityScale.json';
 
 export type AqiBadge = 'good' | 'moderate' | 'unhealthy';
 
@@ -13,18 +15,8 @@ export const STANDARD_HEAT_GRADIENT = {
 
 export const getHeatMaxValue = (pollutant: PollutantType): number => {
   // Absolute-ish scaling (not per-time-slice), tuned so moderate values show up.
-  switch (pollutant) {
-    case 'pm10':
-      return 100;
-    case 'pm2.5':
-      return 60;
-    case 'o3':
-      return 180;
-    case 'no2':
-      return 150;
-    default:
-      return 100;
-  }
+  const scaleMax: Record<string, number> = scale.scaleMax;
+  return scaleMax[pollutant] ?? scale.defaultScaleMax;
 };
 
 export const normalizeHeatIntensity = (rawValue: number, scaleMax: number): number => {
@@ -44,7 +36,6 @@ export const getColorForNormalizedIntensity = (t: number): string => {
 
 export const getBadgeForNormalizedIntensity = (t: number): AqiBadge => {
   if (!Number.isFinite(t) || t <= 0) return 'good';
-  if (t < 0.30) return 'good';
-  if (t < 0.80) return 'moderate';
-  return 'unhealthy';
+  const band = scale.badges.find((b) => b.below === null || t < b.below);
+  return (band?.badge ?? 'unhealthy') as AqiBadge;
 };